@@ -1,28 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
+from typing import Optional
 
-from db.session import get_db
+from core.config import get_settings
+from db.session import get_async_db
 from db.schemas import user_schema, psychs_schma
 from db.crud.user import user_create, user_read, user_update, user_delete
-from db.crud.psychs import psychs_create, psychs_read, psychs_update, psychs_delete
+from db.crud.user.user_loader import UserSummaryLoader, get_user_loader
+from db.crud.psychs import psychs_create, psychs_read, psychs_update, psychs_delete, psychs_search, psychs_tournament
 
 from utils import utils, jwt, hash
+from utils.responses import ORJSONResponse
+from utils.score_table import InvalidSubmission
+from utils.tournament import Bracket, InvalidBracket
+from utils.trending import trending_feed
 
 import traceback
 
-# OAuth2 Password Bearer
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
+settings = get_settings()
 
 router = APIRouter()
 
 @router.post("/article", status_code=status.HTTP_201_CREATED)
-async def create_article(article: psychs_schma.PsychArticleCreate, access_token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def create_article(article: psychs_schma.PsychArticleCreate, claims: dict = Depends(jwt.get_token_claims), db: AsyncSession = Depends(get_async_db)):
     try:
         # Verify the access token
-        user_id = await jwt.get_user_id_from_token(token=access_token)
-        db_user = user_read.find_user_by_userid(db, user_id)
+        user_id = int(claims["uid"])
+        db_user = await user_read.find_user_by_userid(db, user_id)
 
         if not db_user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -35,7 +40,7 @@ async def create_article(article: psychs_schma.PsychArticleCreate, access_token:
         }
 
     except HTTPException as http_ex:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -43,7 +48,7 @@ async def create_article(article: psychs_schma.PsychArticleCreate, access_token:
         raise http_ex
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -51,7 +56,7 @@ async def create_article(article: psychs_schma.PsychArticleCreate, access_token:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -59,40 +64,36 @@ async def create_article(article: psychs_schma.PsychArticleCreate, access_token:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
+        await db.close()
 
 @router.get("/articles", response_model=psychs_schma.PsychArticlesResponse, status_code=status.HTTP_200_OK)
-async def read_articles(page: int = 1, limit: int = 10, db: Session = Depends(get_db)):
+async def read_articles(page: int = 1, limit: int = 10, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db), user_loader: UserSummaryLoader = Depends(get_user_loader)):
     try:
-        # Get the post list
-        db_articles = psychs_read.get_psych_posts_with_authors(db, page, limit)
+        # Get the post list (cursor가 주어지면 keyset 페이지네이션, 아니면 page 기반)
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = utils.decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+            db_articles = await psychs_read.get_psych_posts_with_authors_after(db, cursor_created_at, cursor_id, limit)
+        else:
+            db_articles = await psychs_read.get_psych_posts_with_authors(db, page, limit)
         if not db_articles:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
         
-        articles_list = []
-
-        for article in db_articles:
-            author_profile = user_read.get_user_profile(db=db, user_id=article.author_id)
-            articles_list.append(psychs_schma.PsychArticleResponse(
-                href=f"/psychs/{article.id}",
-                id=article.id,
-                title=article.title,
-                type=article.type.value,
-                description=article.description,
-                author_id=article.author_id,
-                author_profile_url=author_profile,
-                author_nickname=article.author.nickname if article.author else 'Unknown',
-                thumbnail_url=article.thumbnail_url,
-                created_at=article.created_at.isoformat() if article.created_at else None,
-                updated_at=article.updated_at.isoformat() if article.updated_at else None,
-                view_count=article.view_count,
-                article_visibility=article.visibility
-            ))
-
-        return psychs_schma.PsychArticlesResponse(posts=articles_list)
+        articles_list = await psychs_read.build_article_responses(db_articles, user_loader)
+
+        # 페이지가 가득 찼다면 다음 페이지를 위한 커서를 함께 반환
+        next_cursor = None
+        if len(db_articles) == limit:
+            last_article = db_articles[-1]
+            next_cursor = utils.encode_cursor(last_article.created_at, last_article.id)
+
+        return ORJSONResponse({"posts": articles_list, "next_cursor": next_cursor})
 
     except HTTPException as http_ex:
-        db.rollback()
+        await db.rollback()
         
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -100,7 +101,7 @@ async def read_articles(page: int = 1, limit: int = 10, db: Session = Depends(ge
         raise http_ex
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -108,7 +109,7 @@ async def read_articles(page: int = 1, limit: int = 10, db: Session = Depends(ge
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -116,7 +117,67 @@ async def read_articles(page: int = 1, limit: int = 10, db: Session = Depends(ge
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
+        await db.close()
+
+
+# 게시글 검색 (제목, 설명)
+@router.get("/search", response_model=psychs_schma.PsychArticlesResponse, status_code=status.HTTP_200_OK)
+async def search_articles(q: str, limit: int = 10, cursor: Optional[str] = None, db: AsyncSession = Depends(get_async_db), user_loader: UserSummaryLoader = Depends(get_user_loader)):
+    try:
+        match_query = psychs_search.build_match_query(q)
+        if not match_query:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Empty query")
+
+        offset, after_id = 0, None
+        if cursor:
+            try:
+                offset, after_id = utils.decode_search_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+        next_offset, db_results = await psychs_search.search_articles(db, match_query, limit, offset, after_id)
+        db_articles = [db_article for db_article, _ in db_results]
+
+        articles_list = await psychs_read.build_article_responses(db_articles, user_loader)
+
+        next_cursor = None
+        if len(db_results) == limit:
+            next_cursor = utils.encode_search_cursor(next_offset, db_articles[-1].id)
+
+        return ORJSONResponse({"posts": articles_list, "next_cursor": next_cursor})
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
+
+
+# 인기 게시글 (시간 감쇠 점수순, 메모리의 응답)
+@router.get("/trending", response_model=psychs_schma.PsychArticlesResponse, status_code=status.HTTP_200_OK)
+async def read_trending(limit: int = 10):
+    return Response(content=trending_feed.response(limit), media_type="application/json")
 
 
 # 특성 게시글 수정
@@ -124,21 +185,29 @@ async def read_articles(page: int = 1, limit: int = 10, db: Session = Depends(ge
 async def update_article(
     id: int, 
     psych: psychs_schma.PsychArticleUpdate, 
-    access_token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    claims: dict = Depends(jwt.get_token_claims),
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        user_id = await jwt.get_user_id_from_token(token=access_token)
-        psychs_owner_id = psychs_read.get_psych_owner(db=db, article_id=id)
+        user_id = int(claims["uid"])
+        psychs_owner_id = await psychs_read.get_psych_owner(db=db, article_id=id)
 
         if user_id != psychs_owner_id:
-            if not await jwt.token_has_permission(db=db, token=access_token):
+            if not await jwt.token_has_permission(db=db, claims=claims):
                 raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
         await psychs_update.update_article(db=db, article_id=id, psychs=psych)
 
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -146,7 +215,7 @@ async def update_article(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -154,23 +223,25 @@ async def update_article(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
+        await db.close()
 
 # 특정 게시글 조회 (단일 게시글 조회)
 @router.get("/article/{id}", response_model=psychs_schma.PsychArticleResponse, status_code=status.HTTP_200_OK)
-async def read_article(id: int, db: Session = Depends(get_db)):
+async def read_article(id: int, db: AsyncSession = Depends(get_async_db), user_loader: UserSummaryLoader = Depends(get_user_loader)):
     try:
         # Get the post
-        db_post = psychs_read.get_psych_post(db, id)
+        db_post = await psychs_read.get_psych_post(db, id, user_loader=user_loader)
         if not db_post:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-        
+
+        trending_feed.record_view(id)
+
         return db_post
 
         return return_data
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -178,7 +249,7 @@ async def read_article(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -186,21 +257,21 @@ async def read_article(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
+        await db.close()
 
 # 테스트 진행(질문들 가져오기)
-@router.get("/psych/{id}", response_model=psychs_schma.PsychArticleQuestions, status_code=status.HTTP_200_OK)
-async def read_psych_test(id: int, db: Session = Depends(get_db)):
+@router.get("/psych/{id}", response_model=psychs_schma.PsychArticleQuestionsResponse, status_code=status.HTTP_200_OK)
+async def read_psych_test(id: int, db: AsyncSession = Depends(get_async_db)):
     try:
-        # Get the questions
-        db_questions = psychs_read.get_psych_questions_and_answer(db=db, article_id=id)
-        if not db_questions:
+        # Get the questions (캐시된 JSON을 그대로 반환)
+        questions_json = await psychs_read.get_psych_questions_json(db=db, article_id=id)
+        if not questions_json:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Questions not found")
-        
-        return db_questions
+
+        return ORJSONResponse(questions_json)
 
     except HTTPException as http_ex:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -208,7 +279,7 @@ async def read_psych_test(id: int, db: Session = Depends(get_db)):
         raise http_ex
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -216,7 +287,7 @@ async def read_psych_test(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -224,37 +295,448 @@ async def read_psych_test(id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
+        await db.close()
 
 
 @router.get("/psych/{id}/statistics", response_model=psychs_schma.PsychArticleQuestionStatistics, status_code=status.HTTP_200_OK)
 async def get_psych_question_statistics(
     id: int,
-    access_token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
+    claims: dict = Depends(jwt.get_token_claims), 
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user_id = await jwt.get_user_id_from_token(token=access_token)
-    psychs_owner_id = psychs_read.get_psych_owner(db=db, article_id=id)
+    user_id = int(claims["uid"])
+    psychs_owner_id = await psychs_read.get_psych_owner(db=db, article_id=id)
 
     if user_id != psychs_owner_id:
-        if not await jwt.token_has_permission(db=db, token=access_token):
+        if not await jwt.token_has_permission(db=db, claims=claims):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
 
-    return psychs_read.get_psych_question_statistics(db=db, article_id=id)
+    return await psychs_read.get_psych_question_statistics(db=db, article_id=id)
+
+
+# 테스트 제출 (선택한 답변 기록 후 채점 결과 반환)
+@router.post("/psych/{id}/submit", response_model=psychs_schma.PsychArticleSubmissionResponse, status_code=status.HTTP_201_CREATED)
+async def submit_psych_answers(
+    id: int,
+    submission: psychs_schma.PsychArticleSubmissionCreate,
+    claims: Optional[dict] = Depends(jwt.get_optional_token_claims),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        # 로그인하지 않은 사용자도 제출할 수 있습니다.
+        user_id = int(claims["uid"]) if claims else None
+
+        # 답변 점수는 클라이언트에 보내지 않고 서버의 채점표로 계산
+        score_table = await psychs_read.get_psych_score_table(db=db, article_id=id)
+        if score_table is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+        try:
+            total = score_table.score(submission.answers)
+        except InvalidSubmission as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        db_submission = await psychs_create.create_submission(
+            db=db,
+            article_id=id,
+            answer_ids=submission.answers,
+            user_id=user_id,
+            question_by_answer=score_table.question_by_answer
+        )
+        trending_feed.record_completion(id)
+
+        return {
+            "detail": db_submission.id,
+            "score": total,
+            "result": score_table.result_for(total)
+        }
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
+
+
+# 여러 제출을 기록하지 않고 한 번에 채점 (결과 구간 확인용, 작성자 전용)
+@router.post("/psych/{id}/score", response_model=psychs_schma.PsychArticleScores, status_code=status.HTTP_200_OK)
+async def score_psych_submissions(
+    id: int,
+    batch: psychs_schma.PsychArticleScoreBatch,
+    claims: dict = Depends(jwt.get_token_claims),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        user_id = int(claims["uid"])
+        psychs_owner_id = await psychs_read.get_psych_owner(db=db, article_id=id)
+
+        if psychs_owner_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+        if user_id != psychs_owner_id:
+            if not await jwt.token_has_permission(db=db, claims=claims):
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+        score_table = await psychs_read.get_psych_score_table(db=db, article_id=id)
+        if score_table is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+        try:
+            scored = score_table.score_many(batch.submissions)
+        except InvalidSubmission as e:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(e))
+
+        return ORJSONResponse({
+            "scores": [
+                {"score": total, "result_id": result["id"] if result else None}
+                for total, result in scored
+            ]
+        })
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
+
+
+# 결과 목록 교체 (점수 구간별 결과)
+@router.post("/psych/{id}/results", status_code=status.HTTP_204_NO_CONTENT)
+async def set_psych_results(
+    id: int,
+    results: psychs_schma.PsychArticleResults,
+    claims: dict = Depends(jwt.get_token_claims),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        user_id = int(claims["uid"])
+        psychs_owner_id = await psychs_read.get_psych_owner(db=db, article_id=id)
+
+        if psychs_owner_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+        if user_id != psychs_owner_id:
+            if not await jwt.token_has_permission(db=db, claims=claims):
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+        await psychs_update.replace_results(db=db, article_id=id, results=results.results)
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
 
 
 @router.post("/psych/{id}", status_code=status.HTTP_204_NO_CONTENT)
 async def add_psych_to_article(
     id: int, 
     psychs: psychs_schma.PsychArticleQuestions,
-    access_token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
+    claims: dict = Depends(jwt.get_token_claims), 
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user_id = await jwt.get_user_id_from_token(token=access_token)
-    psychs_owner_id = psychs_read.get_psych_owner(db=db, article_id=id)
+    try:
+        user_id = int(claims["uid"])
+        psychs_owner_id = await psychs_read.get_psych_owner(db=db, article_id=id)
 
-    if user_id != psychs_owner_id:
-        if not await jwt.token_has_permission(db=db, token=access_token):
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+        if psychs_owner_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+        if user_id != psychs_owner_id:
+            if not await jwt.token_has_permission(db=db, claims=claims):
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+        await psychs_create.add_psych_to_article(db=db, article_id=id, psychs=psychs.questions)
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
+
+
+# 대용량 문제 은행 업로드 (NDJSON: 한 줄에 질문 하나)
+@router.post("/psych/{id}/stream", status_code=status.HTTP_204_NO_CONTENT)
+async def add_psych_to_article_stream(
+    id: int,
+    request: Request,
+    claims: dict = Depends(jwt.get_token_claims),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        user_id = int(claims["uid"])
+        psychs_owner_id = await psychs_read.get_psych_owner(db=db, article_id=id)
+
+        if psychs_owner_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+        if user_id != psychs_owner_id:
+            if not await jwt.token_has_permission(db=db, claims=claims):
+                raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
+
+        try:
+            await psychs_create.add_psych_to_article_stream(
+                db=db,
+                article_id=id,
+                lines=utils.iter_lines(request.stream()),
+                chunk_size=settings.question_ingest_chunk_size
+            )
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Line too long")
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
+
+
+# 토너먼트 시작 (후보를 뽑아 첫 라운드 대진 반환)
+@router.post("/tournament/{id}/start", response_model=psychs_schma.PsychTournamentRound, status_code=status.HTTP_200_OK)
+async def start_tournament(
+    id: int,
+    start: psychs_schma.PsychTournamentStart,
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        version = await psychs_tournament.get_tournament_version(db=db, article_id=id)
+        candidates = await psychs_tournament.get_tournament_candidates(db=db, article_id=id)
+
+        try:
+            bracket = Bracket.start(id, version, list(candidates), min(start.size, get_settings().tournament_max_size))
+        except InvalidBracket as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        return ORJSONResponse(psychs_tournament.bracket_round_to_dict(bracket, candidates))
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
 
-    await add_psych_to_article(db=db, article_id=id, psychs=psychs.questions)
\ No newline at end of file
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
+
+
+# 토너먼트 라운드 진행 (경기마다 승자 제출, 마지막 라운드면 결과 집계)
+@router.post("/tournament/{id}/round", response_model=psychs_schma.PsychTournamentRound, status_code=status.HTTP_200_OK)
+async def play_tournament_round(
+    id: int,
+    submission: psychs_schma.PsychTournamentRoundSubmit,
+    claims: Optional[dict] = Depends(jwt.get_optional_token_claims),
+    db: AsyncSession = Depends(get_async_db)
+):
+    try:
+        # 로그인하지 않은 사용자도 참여할 수 있습니다.
+        user_id = int(claims["uid"]) if claims else None
+
+        version = await psychs_tournament.get_tournament_version(db=db, article_id=id)
+
+        try:
+            bracket = Bracket.decode(submission.bracket)
+            if bracket.article_id != id:
+                raise InvalidBracket("Invalid bracket")
+            bracket.advance(submission.winners)
+        except InvalidBracket as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        # 진행 중에 후보가 바뀐 대진표는 집계하지 않음
+        if bracket.version != version:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Tournament has changed")
+
+        candidates = await psychs_tournament.get_tournament_candidates(db=db, article_id=id)
+
+        if bracket.finished:
+            await psychs_tournament.record_bracket(db=db, bracket=bracket, user_id=user_id)
+            trending_feed.record_completion(id)
+
+        return ORJSONResponse(psychs_tournament.bracket_round_to_dict(bracket, candidates))
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
+
+
+# 토너먼트 후보 순위 (Elo 레이팅순)
+@router.get("/tournament/{id}/ranking", response_model=psychs_schma.PsychTournamentRankings, status_code=status.HTTP_200_OK)
+async def read_tournament_ranking(id: int, limit: int = 100, offset: int = 0, db: AsyncSession = Depends(get_async_db)):
+    try:
+        await psychs_tournament.get_tournament_version(db=db, article_id=id)
+
+        plays, rankings = await psychs_tournament.get_tournament_ranking(db=db, article_id=id, limit=min(max(limit, 1), 100), offset=max(offset, 0))
+
+        return ORJSONResponse({"plays": plays, "rankings": rankings})
+
+    except HTTPException as http_ex:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise http_ex
+
+    except SQLAlchemyError as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    except Exception as e:
+        await db.rollback()
+
+        err_msg = traceback.format_exc()
+        print(err_msg)
+
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+    finally:
+        await db.close()
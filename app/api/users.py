@@ -1,44 +1,44 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
-from db.session import get_db
+from db.session import get_async_db
 from db.schemas import user_schema
 from db.crud.user import user_create, user_read, user_update, user_delete
+from db.crud.user.user_loader import UserSummaryLoader, get_user_loader
 
 from utils import utils, jwt, hash
+from utils.rate_limit import limit_login, limit_register
 
 import traceback
 
-# OAuth2 Password Bearer
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
-
 router = APIRouter()
 
-@router.post("/register", response_model=user_schema.JwtToken, status_code=status.HTTP_201_CREATED)
-async def register_user(user: user_schema.UserCreate, db: Session = Depends(get_db)):
+# 요청 제한은 의존성으로 먼저 확인하므로 제한된 요청은 Argon2 연산까지 가지 않습니다.
+@router.post("/register", response_model=user_schema.JwtToken, status_code=status.HTTP_201_CREATED, dependencies=[Depends(limit_register)])
+async def register_user(user: user_schema.UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
         # Check if the email is valid
         if not utils.is_valid_email(user.email):
             raise HTTPException(status_code=400, detail="Invalid email format")
         
         # Check if the email or username or nickname is already registered
-        if user_read.find_user_for_register(db, user.email, user.username, user.nickname):
+        if await user_read.find_user_for_register(db, user.email, user.username, user.nickname):
             raise HTTPException(status_code=400, detail="Email or username or nickname already registered")
 
         # Create a new user
         db_user = await user_create.create_user(db, user)
         
         # Create JWT tokens
-        access_token = await jwt.create_access_token("access", db_user.id)
-        refresh_token = await jwt.create_refresh_token("refresh", db_user.id)
+        access_token = await jwt.create_access_token("access", db_user.id, [db_user.role])
+        refresh_token = await jwt.create_refresh_token("refresh", db_user.id, [db_user.role])
         await user_create.create_jwt(db, db_user.id, access_token, refresh_token, user.public_ip)
 
         return user_schema.JwtToken(access_token=access_token, refresh_token=refresh_token)
 
     except HTTPException as http_ex:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -46,7 +46,7 @@ async def register_user(user: user_schema.UserCreate, db: Session = Depends(get_
         raise http_ex
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -54,7 +54,7 @@ async def register_user(user: user_schema.UserCreate, db: Session = Depends(get_
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -62,31 +62,35 @@ async def register_user(user: user_schema.UserCreate, db: Session = Depends(get_
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
+        await db.close()
 
-@router.post("/login", response_model=user_schema.JwtToken, status_code=status.HTTP_200_OK)
-async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+@router.post("/login", response_model=user_schema.JwtToken, status_code=status.HTTP_200_OK, dependencies=[Depends(limit_login)])
+async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     try:
         # Check if the email is valid
-        db_user = user_read.find_user_for_login(db, form_data.username)
+        db_user = await user_read.find_user_for_login(db, form_data.username)
         if not db_user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-        # Check if the password is valid
-        if not hash.verify_hashed_text(form_data.password, db_user.hashed_password):
+        # Check if the password is valid (이전 Argon2 파라미터로 저장된 해시는 새 파라미터로 다시 해시)
+        valid, new_hashed_password = await hash.verify_and_update_hashed_text(form_data.password, db_user.hashed_password)
+        if not valid:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect password")
-        
+
+        if new_hashed_password:
+            db_user.hashed_password = new_hashed_password # update_user_for_login에서 함께 커밋
+
         # Update the last public IP and last login time
         await user_update.update_user_for_login(db, db_user, "0.0.0.0")
         
         # Create JWT tokens
-        access_token = await jwt.create_access_token("access", db_user.id)
-        refresh_token = await jwt.create_refresh_token("refresh", db_user.id)
+        access_token = await jwt.create_access_token("access", db_user.id, [db_user.role])
+        refresh_token = await jwt.create_refresh_token("refresh", db_user.id, [db_user.role])
         await user_create.create_jwt(db, db_user.id, access_token, refresh_token, "0.0.0.0")
         return user_schema.JwtToken(access_token=access_token, refresh_token=refresh_token)
     
     except HTTPException as http_ex:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -94,7 +98,7 @@ async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Sessi
         raise http_ex
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -102,7 +106,7 @@ async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Sessi
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -110,19 +114,25 @@ async def login_user(form_data: OAuth2PasswordRequestForm = Depends(), db: Sessi
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
+        await db.close()
 
 @router.post("/refresh", response_model=user_schema.JwtToken, status_code=status.HTTP_200_OK)
-async def refresh_token(refresh_token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def refresh_token(refresh_token: str = Depends(jwt.oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     try:
         # Verify the refresh token
-        user_id = await jwt.get_user_id_from_token(token=token)
+        refresh_claims = await jwt.get_token_body(token=refresh_token)
+        user_id = int(refresh_claims["uid"])
+
+        # 토큰 재발급 시에는 항상 DB의 최신 역할을 반영
+        permissions = await user_read.get_user_permission(db=db, user_id=user_id)
+        if not permissions:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
         
-        access_token = await jwt.create_access_token("access", user_id)
+        access_token = await jwt.create_access_token("access", user_id, permissions)
         return user_schema.JwtToken(access_token=access_token, refresh_token=refresh_token)
     
     except HTTPException as http_ex:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -130,7 +140,7 @@ async def refresh_token(refresh_token: str = Depends(oauth2_scheme), db: Session
         raise http_ex
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -138,7 +148,7 @@ async def refresh_token(refresh_token: str = Depends(oauth2_scheme), db: Session
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -146,14 +156,14 @@ async def refresh_token(refresh_token: str = Depends(oauth2_scheme), db: Session
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
+        await db.close()
 
 @router.get("/me", response_model=user_schema.User, status_code=status.HTTP_200_OK)
-async def read_user_me(access_token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def read_user_me(claims: dict = Depends(jwt.get_token_claims), db: AsyncSession = Depends(get_async_db), user_loader: UserSummaryLoader = Depends(get_user_loader)):
     try:
         # Verify the access token
-        user_id = await jwt.get_user_id_from_token(token=access_token)
-        db_user = user_read.find_user_by_userid(db, user_id)
+        user_id = int(claims["uid"])
+        db_user = await user_read.find_user_by_userid(db, user_id, user_loader=user_loader)
         
         if not db_user:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -161,7 +171,7 @@ async def read_user_me(access_token: str = Depends(oauth2_scheme), db: Session =
         return db_user
     
     except HTTPException as http_ex:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -169,7 +179,7 @@ async def read_user_me(access_token: str = Depends(oauth2_scheme), db: Session =
         raise http_ex
 
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -177,7 +187,7 @@ async def read_user_me(access_token: str = Depends(oauth2_scheme), db: Session =
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
 
         err_msg = traceback.format_exc()
         print(err_msg)
@@ -185,4 +195,4 @@ async def read_user_me(access_token: str = Depends(oauth2_scheme), db: Session =
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
     finally:
-        db.close()
\ No newline at end of file
+        await db.close()
\ No newline at end of file
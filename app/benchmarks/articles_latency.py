@@ -0,0 +1,68 @@
+"""
+/psychs/articles 동시 부하 지연시간 벤치마크
+
+benchmarks.seed 로 임시 SQLite 파일에 사용자/게시글을 채운 뒤, FastAPI 앱을 프로세스 내에서 구동해
+고정된 동시성으로 `GET /psychs/articles` 를 호출하고 p50/p95/p99 지연시간을 출력합니다.
+
+사용법 (app 디렉터리에서 실행):
+    python -m benchmarks.articles_latency --articles 1000 --concurrency 32 --requests 2000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from benchmarks.seed import configure_database, seed
+from benchmarks.suite import percentile
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="GET /psychs/articles latency benchmark")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=20, help="요청마다 1..pages 범위의 페이지를 순환합니다.")
+    return parser.parse_args()
+
+
+async def run(concurrency: int, total: int, limit: int, pages: int):
+    import httpx
+    from main import app
+
+    latencies = []
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker():
+            for i in counter:
+                page = (i % pages) + 1
+                started = time.perf_counter()
+                response = await client.get("/psychs/articles", params={"page": page, "limit": limit})
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return latencies, elapsed
+
+
+def main():
+    args = parse_args()
+    configure_database()
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    seed(args.users, args.articles)
+    latencies, elapsed = asyncio.run(run(args.concurrency, args.requests, args.limit, args.pages))
+
+    print(f"requests={len(latencies)} concurrency={args.concurrency} elapsed={elapsed:.2f}s rps={len(latencies) / elapsed:.1f}")
+    for pct in (50, 95, 99):
+        print(f"p{pct}={percentile(latencies, pct) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
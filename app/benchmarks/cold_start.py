@@ -0,0 +1,88 @@
+"""
+콜드 스타트 시간 측정
+
+시드된 SQLite 파일로 uvicorn 프로세스를 띄우고, 프로세스 실행부터 첫 요청(GET /psychs/articles)이
+성공할 때까지 걸린 시간을 여러 번 측정해 JSON으로 출력합니다.
+
+사용법 (app 디렉터리에서 실행):
+    python -m benchmarks.cold_start --runs 5
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.seed import configure_database, seed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Cold start time from process launch to first served request")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    return parser.parse_args()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def measure(app_dir: str, timeout: float):
+    port = free_port()
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=app_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with code {process.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("server did not respond in time")
+            # 폴링 비용이 측정을 흐리지 않도록 가벼운 http.client 사용 (httpx는 클라이언트 생성에 수십 ms가 듦)
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1.0)
+            try:
+                connection.request("GET", "/psychs/articles")
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                pass
+            finally:
+                connection.close()
+            time.sleep(0.005)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    args = parse_args()
+    app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    configure_database()
+    sys.path.insert(0, app_dir)
+
+    seed(args.users, args.articles)
+
+    samples = [measure(app_dir, args.timeout) for _ in range(args.runs)]
+
+    print(json.dumps({
+        "runs": args.runs,
+        "samples_ms": [round(s * 1000, 1) for s in samples],
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+벤치마크 결과 비교
+
+benchmarks.suite 가 저장한 두 JSON 파일을 시나리오별로 비교해 변화율을 출력합니다.
+
+사용법 (app 디렉터리에서 실행):
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "errors")
+
+
+def load(path: str):
+    with open(path) as f:
+        return json.load(f)
+
+
+def change(before, after):
+    if before is None or after is None:
+        return "n/a"
+    if before == 0:
+        return "n/a" if after == 0 else "+inf"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark suite results")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    before = load(args.before)
+    after = load(args.after)
+
+    print(f"before={before['meta'].get('commit')} after={after['meta'].get('commit')}")
+    if before["meta"].get("params") != after["meta"].get("params"):
+        print("warning: benchmark parameters differ")
+
+    print(f"{'scenario':<12} {'metric':<16} {'before':>12} {'after':>12} {'change':>10}")
+    for name in after["results"]:
+        if name not in before["results"]:
+            continue
+        for metric in METRICS:
+            b = before["results"][name].get(metric)
+            a = after["results"][name].get(metric)
+            print(f"{name:<12} {metric:<16} {str(b):>12} {str(a):>12} {change(b, a):>10}")
+
+
+if __name__ == "__main__":
+    main()
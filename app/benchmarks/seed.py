@@ -0,0 +1,116 @@
+"""
+벤치마크용 SQLite 데이터셋 생성
+
+사용자 / 게시글 / 질문 / 답변 수를 지정해 데이터베이스를 채웁니다.
+모든 사용자의 비밀번호는 동일하며(기본값 "benchmark"), 해시는 한 번만 계산해 재사용합니다.
+
+사용법 (app 디렉터리에서 실행):
+    python -m benchmarks.seed --db /tmp/bench.db --users 100 --articles 1000 --questions 20 --answers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_PASSWORD = "benchmark"
+
+
+def configure_database(db_path: str = None):
+    """
+        앱 모듈을 import 하기 전에 벤치마크용 데이터베이스를 가리키도록 환경 변수를 설정합니다.
+        db_path가 없으면 임시 디렉터리에 새 파일을 만듭니다.
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.db")
+
+    os.environ["DatabaseUrl"] = f"sqlite:///{db_path}"
+    os.environ["AsyncDatabaseUrl"] = f"sqlite+aiosqlite:///{db_path}"
+    return db_path
+
+
+def seed(users: int, articles: int, questions: int = 0, answers: int = 0, password: str = DEFAULT_PASSWORD, random_seed: int = 42):
+    """
+        데이터베이스 스키마를 만들고 데이터를 채웁니다.
+        모든 게시글의 작성자는 사용자들에게 순서대로 배정되며, 게시글 1번의 작성자는 사용자 1번입니다.
+    """
+    from db.session import engine
+    from db.models import user_model, psych_model
+    from db.migrations import migrate
+    from db.schemas import psychs_schma
+    from utils import hash
+
+    rng = random.Random(random_seed)
+    now = datetime.now(timezone.utc)
+
+    migrate(engine)
+
+    hashed_password = hash.pwd_context.hash(password)
+
+    user_rows = [
+        {
+            "id": i,
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "nickname": f"nick{i}",
+            "hashed_password": hashed_password,
+            "created_at": now,
+        }
+        for i in range(1, users + 1)
+    ]
+    article_rows = [
+        {
+            "id": i,
+            "title": f"article {i}",
+            "description": "benchmark article",
+            "type": psychs_schma.PsychType.PSYCH,
+            "visibility": psychs_schma.PsychVisibility.PUBLIC,
+            "created_at": now - timedelta(seconds=i),
+            "view_count": 0,
+            "content_version": 0,
+            "author_id": ((i - 1) % users) + 1,
+        }
+        for i in range(1, articles + 1)
+    ]
+
+    with engine.begin() as connection:
+        connection.execute(user_model.User.__table__.insert(), user_rows)
+        connection.execute(psych_model.PsychArticle.__table__.insert(), article_rows)
+
+        question_id = 0
+        answer_id = 0
+        for article_id in range(1, articles + 1):
+            question_rows, answer_rows, count_rows = [], [], []
+
+            for _ in range(questions):
+                question_id += 1
+                question_rows.append({"id": question_id, "article_id": article_id, "question": f"question {question_id}", "description": None})
+
+                for score in range(answers):
+                    answer_id += 1
+                    answer_rows.append({"id": answer_id, "article_id": article_id, "question_id": question_id, "answer": f"answer {answer_id}", "score": score})
+                    count_rows.append({"answer_id": answer_id, "article_id": article_id, "count": rng.randint(0, 1000)})
+
+            if question_rows:
+                connection.execute(psych_model.PsychArticleQuestions.__table__.insert(), question_rows)
+            if answer_rows:
+                connection.execute(psych_model.PsychArticleAnswer.__table__.insert(), answer_rows)
+                connection.execute(psych_model.PsychArticleAnswerCount.__table__.insert(), count_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a SQLite database for benchmarks")
+    parser.add_argument("--db", default=None, help="생성할 SQLite 파일 경로 (기본값: 임시 파일)")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=20, help="게시글당 질문 수")
+    parser.add_argument("--answers", type=int, default=4, help="질문당 답변 수")
+    args = parser.parse_args()
+
+    db_path = configure_database(args.db)
+    seed(args.users, args.articles, args.questions, args.answers)
+    print(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+응답 직렬화 마이크로 벤치마크
+
+100개 게시글 페이지(/psychs/articles?limit=100)와 100문항 테스트(/psychs/psych/{id})를
+    model  pydantic 모델 검증 후 model_dump_json (이전 방식)
+    dict   행(Row) -> dict 변환 후 orjson.dumps (현재 방식)
+두 가지로 직렬화해 회당 평균 시간을 비교합니다. DB 조회는 한 번만 하고 측정에서 제외합니다.
+
+사용법 (app 디렉터리에서 실행):
+    python -m benchmarks.serialization --questions 100 --answers 4 --limit 100
+
+HTTP 단위 비교는 `python -m benchmarks.suite --scenarios articles,psych --limit 100 --questions 100` 로 측정합니다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Response serialization micro benchmark")
+    parser.add_argument("--limit", type=int, default=100, help="게시글 페이지 크기")
+    parser.add_argument("--questions", type=int, default=100, help="게시글당 질문 수")
+    parser.add_argument("--answers", type=int, default=4, help="질문당 답변 수")
+    parser.add_argument("--iterations", type=int, default=500)
+    return parser.parse_args()
+
+
+def timeit(fn, iterations: int):
+    fn()  # warmup
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations
+
+
+async def load(limit: int):
+    from db.session import AsyncSessionLocal
+    from db.crud.psychs import psychs_read
+    from db.crud.user.user_loader import UserSummaryLoader
+
+    async with AsyncSessionLocal() as db:
+        rows = await psychs_read.get_psych_posts_with_authors(db=db, limit=limit)
+        authors = await UserSummaryLoader(db).load_many([row.author_id for row in rows])
+        question_tree = await psychs_read.get_psych_question_tree(db=db, article_id=1)
+        question_rows = await psychs_read.get_psych_question_rows(db=db, article_id=1)
+
+    return rows, authors, question_tree, question_rows
+
+
+def main():
+    args = parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    from benchmarks.seed import configure_database, seed
+    configure_database()
+    seed(users=10, articles=args.limit, questions=args.questions, answers=args.answers)
+
+    import orjson
+    from db.schemas import psychs_schma
+    from db.crud.psychs import psychs_read
+
+    rows, authors, question_tree, question_rows = asyncio.run(load(args.limit))
+
+    def page_model():
+        posts = [psychs_schma.PsychArticleResponse(**psychs_read.article_to_dict(row, author)) for row, author in zip(rows, authors)]
+        return psychs_schma.PsychArticlesResponse(posts=posts, next_cursor=None).model_dump_json()
+
+    def page_dict():
+        return orjson.dumps({"posts": [psychs_read.article_to_dict(row, author) for row, author in zip(rows, authors)], "next_cursor": None}, option=orjson.OPT_UTC_Z)
+
+    def questions_model():
+        questions = [
+            psychs_schma.PsychArticleQuestionResponse(
+                index=index,
+                question=question.question,
+                description=question.description,
+                attachment=psychs_schma.PsychArticleQuestionAttachment.model_validate(question.attachments[0], from_attributes=True) if question.attachments else None,
+                answers=[psychs_schma.PsychArticleAnswerResponse.model_validate(answer, from_attributes=True) for answer in question.answers]
+            )
+            for index, question in enumerate(question_tree)
+        ]
+        return psychs_schma.PsychArticleQuestionsResponse(questions=questions).model_dump_json()
+
+    def questions_dict():
+        return orjson.dumps(psychs_read.question_tree_to_dict(*question_rows))
+
+    print(f"page of {len(rows)} articles, test of {len(question_tree)} questions x {args.answers} answers, {args.iterations} iterations")
+    for name, model_fn, dict_fn in (("articles", page_model, page_dict), ("questions", questions_model, questions_dict)):
+        model_seconds = timeit(model_fn, args.iterations)
+        dict_seconds = timeit(dict_fn, args.iterations)
+        print(f"{name:<10} model={model_seconds * 1e6:8.1f}us  dict={dict_seconds * 1e6:8.1f}us  speedup={model_seconds / dict_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
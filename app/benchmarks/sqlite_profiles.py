@@ -0,0 +1,174 @@
+"""
+SQLite 저장 프로필별 읽기/쓰기 혼합 처리량 벤치마크
+
+프로필(SqliteProfile)마다 별도 프로세스에서 새 데이터베이스를 시드한 뒤,
+고정된 동시성으로 읽기(GET /psychs/articles)와 쓰기(POST /psychs/psych/{id}/submit)를 섞어 호출합니다.
+이어서 앱을 거치지 않고 동기 엔진에 스레드로 읽기 SELECT와 쓰기 UPDATE 트랜잭션을 섞어 실행해
+저장 계층만의 차이를 측정합니다. 프로필별 처리량과 읽기 / 쓰기 지연시간을 JSON으로 출력합니다.
+
+사용법 (app 디렉터리에서 실행):
+    python -m benchmarks.sqlite_profiles --profiles default,wal --write-ratio 0.2 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.seed import configure_database, seed
+from benchmarks.suite import summarize
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Mixed read/write throughput per SQLite storage profile")
+    parser.add_argument("--profiles", default="default,wal", help="쉼표로 구분한 프로필 목록")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--questions", type=int, default=10, help="게시글당 질문 수")
+    parser.add_argument("--answers", type=int, default=4, help="질문당 답변 수")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="전체 요청 중 쓰기 비율")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--profile", default=None, help=argparse.SUPPRESS) # 자식 프로세스용
+    return parser.parse_args()
+
+
+async def run(args):
+    import httpx
+    from main import app
+
+    pages = max(1, args.articles // args.limit)
+    write_every = round(1 / args.write_ratio) if args.write_ratio > 0 else 0
+
+    latencies = {"read": [], "write": []}
+    statuses = {"read": Counter(), "write": Counter()}
+    counter = iter(range(args.requests))
+
+    def submission(i: int):
+        # seed는 게시글 a의 질문 q(전역 번호)에 (q - 1) * answers + 1 부터 답변 ID를 부여합니다.
+        article_id = (i % args.articles) + 1
+        first_question = (article_id - 1) * args.questions + 1
+        answers = [
+            (question_id - 1) * args.answers + 1 + (i % args.answers)
+            for question_id in range(first_question, first_question + args.questions)
+        ]
+        return article_id, answers
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            async def worker():
+                for i in counter:
+                    if write_every and i % write_every == 0:
+                        kind = "write"
+                        article_id, answers = submission(i)
+                        request = client.post(f"/psychs/psych/{article_id}/submit", json={"answers": answers})
+                    else:
+                        kind = "read"
+                        request = client.get("/psychs/articles", params={"page": (i % pages) + 1, "limit": args.limit})
+
+                    started = time.perf_counter()
+                    response = await request
+                    latencies[kind].append(time.perf_counter() - started)
+                    statuses[kind][response.status_code] += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+
+    return {
+        "profile": args.profile,
+        "requests": args.requests,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(args.requests / elapsed, 2),
+        "read": summarize(latencies["read"], statuses["read"], elapsed),
+        "write": summarize(latencies["write"], statuses["write"], elapsed),
+    }
+
+
+def run_engine(args):
+    """동기 엔진에서 스레드별로 읽기 / 쓰기 트랜잭션을 실행합니다. (Python 오버헤드를 뺀 저장 계층 처리량)"""
+    from sqlalchemy import text
+    from db.session import engine
+
+    write_every = round(1 / args.write_ratio) if args.write_ratio > 0 else 0
+    read = text("SELECT id, title, view_count FROM psych_articles ORDER BY created_at DESC, id DESC LIMIT :limit OFFSET :offset")
+    write = text("UPDATE psych_articles SET view_count = view_count + 1 WHERE id = :id")
+
+    def operation(i: int):
+        started = time.perf_counter()
+        try:
+            if write_every and i % write_every == 0:
+                kind = "write"
+                with engine.begin() as connection:
+                    connection.execute(write, {"id": (i % args.articles) + 1})
+            else:
+                kind = "read"
+                with engine.connect() as connection:
+                    connection.execute(read, {"limit": args.limit, "offset": (i * args.limit) % args.articles}).all()
+            status = 200
+        except Exception:
+            status = 500
+        return kind, time.perf_counter() - started, status
+
+    latencies = {"read": [], "write": []}
+    statuses = {"read": Counter(), "write": Counter()}
+
+    # 스레드 수는 연결 풀 크기를 넘지 않게 제한
+    threads = min(args.concurrency, engine.pool.size() + engine.pool._max_overflow)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for kind, latency, status in executor.map(operation, range(args.requests)):
+            latencies[kind].append(latency)
+            statuses[kind][status] += 1
+    elapsed = time.perf_counter() - started
+
+    return {
+        "threads": threads,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(args.requests / elapsed, 2),
+        "read": summarize(latencies["read"], statuses["read"], elapsed),
+        "write": summarize(latencies["write"], statuses["write"], elapsed),
+    }
+
+
+def run_profile(args):
+    """자식 프로세스: 엔진이 import 시점에 만들어지므로 프로필마다 새 프로세스에서 실행합니다."""
+    os.environ["SqliteProfile"] = args.profile
+    configure_database()
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    seed(args.users, args.articles, args.questions, args.answers)
+    result = asyncio.run(run(args))
+    result["engine"] = run_engine(args)
+    print(json.dumps(result))
+
+
+def main():
+    args = parse_args()
+    if args.profile:
+        run_profile(args)
+        return
+
+    results = []
+    for profile in [name.strip() for name in args.profiles.split(",") if name.strip()]:
+        command = [sys.executable, "-m", "benchmarks.sqlite_profiles", "--profile", profile] + [
+            arg for arg in sys.argv[1:] if not arg.startswith("--profiles")
+        ]
+        # --profiles 값 인자 제거
+        if "--profiles" in sys.argv:
+            value = sys.argv[sys.argv.index("--profiles") + 1]
+            command.remove(value)
+
+        output = subprocess.run(command, capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    print(json.dumps({"params": {k: v for k, v in vars(args).items() if k not in ("profile", "profiles")}, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
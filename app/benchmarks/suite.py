@@ -0,0 +1,224 @@
+"""
+엔드포인트 벤치마크 모음
+
+benchmarks.seed 로 임시 SQLite 파일을 채운 뒤 FastAPI 앱을 프로세스 내에서 구동해
+시나리오별로 고정된 동시성 부하를 주고, p50/p95/p99 지연시간과 처리량을 JSON으로 출력합니다.
+커밋마다 결과 파일을 저장해 두고 benchmarks.compare 로 비교할 수 있습니다.
+
+시나리오:
+    register    POST /users/register
+    login       POST /users/login
+    articles    GET  /psychs/articles
+    article     GET  /psychs/article/{id}
+    psych       GET  /psychs/psych/{id}
+    statistics  GET  /psychs/psych/{id}/statistics (게시글 작성자 토큰 사용)
+
+register / login 은 Argon2 해시 비용이 크므로 --auth-requests 로 요청 수를 따로 지정합니다.
+
+사용법 (app 디렉터리에서 실행):
+    python -m benchmarks.suite --articles 1000 --questions 20 --concurrency 32 --output before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+from benchmarks.seed import DEFAULT_PASSWORD, configure_database, seed
+
+SCENARIOS = ("register", "login", "articles", "article", "psych", "statistics")
+AUTH_SCENARIOS = ("register", "login")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Endpoint benchmark suite")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--articles", type=int, default=1000)
+    parser.add_argument("--questions", type=int, default=20, help="게시글당 질문 수")
+    parser.add_argument("--answers", type=int, default=4, help="질문당 답변 수")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000, help="시나리오별 요청 수")
+    parser.add_argument("--auth-requests", type=int, default=20, help="register / login 시나리오의 요청 수")
+    parser.add_argument("--warmup", type=int, default=50, help="측정 전에 버리는 요청 수 (register / login 제외)")
+    parser.add_argument("--limit", type=int, default=10, help="/psychs/articles 페이지 크기")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="쉼표로 구분한 시나리오 목록")
+    parser.add_argument("--db", default=None, help="SQLite 파일 경로 (기본값: 임시 파일)")
+    parser.add_argument("--output", default=None, help="결과 JSON 파일 경로 (기본값: 표준 출력)")
+    args = parser.parse_args()
+
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    return args
+
+
+def percentile(samples, pct: float):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, statuses: Counter, elapsed: float):
+    """지연시간 표본을 요약합니다. 지연시간은 ms 단위입니다."""
+
+    total = len(latencies)
+    errors = sum(count for code, count in statuses.items() if code >= 400)
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(latencies) / total * 1000, 3) if total else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3) if total else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3) if total else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3) if total else None,
+        "max_ms": round(max(latencies) * 1000, 3) if total else None,
+    }
+
+
+async def drive(send, total: int, concurrency: int):
+    """
+        고정된 수의 워커가 공유 카운터에서 요청 번호를 꺼내 send(i)를 호출합니다.
+        (latencies, statuses, elapsed)를 반환합니다.
+    """
+
+    latencies = []
+    statuses = Counter()
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            response = await send(i)
+            latencies.append(time.perf_counter() - started)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return latencies, statuses, elapsed
+
+
+def build_senders(client, args, owner_token: str):
+    run_id = uuid.uuid4().hex[:8]
+    owner_headers = {"Authorization": f"Bearer {owner_token}"}
+    pages = max(1, args.articles // args.limit)
+
+    # 통계는 작성자만 볼 수 있으므로 사용자 1번이 작성한 게시글만 순환합니다.
+    owned_articles = list(range(1, args.articles + 1, args.users)) or [1]
+
+    def article_id(i: int):
+        return (i % args.articles) + 1
+
+    return {
+        "register": lambda i: client.post("/users/register", json={
+            "username": f"bench{run_id}{i}",
+            "email": f"bench{run_id}{i}@example.com",
+            "nickname": f"bench{run_id}{i}",
+            "password": DEFAULT_PASSWORD,
+            "public_ip": "127.0.0.1",
+        }),
+        "login": lambda i: client.post("/users/login", data={
+            "username": f"user{(i % args.users) + 1}",
+            "password": DEFAULT_PASSWORD,
+        }),
+        "articles": lambda i: client.get("/psychs/articles", params={"page": (i % pages) + 1, "limit": args.limit}),
+        "article": lambda i: client.get(f"/psychs/article/{article_id(i)}"),
+        "psych": lambda i: client.get(f"/psychs/psych/{article_id(i)}"),
+        "statistics": lambda i: client.get(f"/psychs/psych/{owned_articles[i % len(owned_articles)]}/statistics", headers=owner_headers),
+    }
+
+
+async def run(args):
+    import httpx
+    from main import app
+    from db.schemas import user_schema
+    from utils import jwt
+
+    owner_token = await jwt.create_access_token("access", 1, [user_schema.Permission.USER])
+    results = {}
+
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None) as client:
+            senders = build_senders(client, args, owner_token)
+
+            for name in args.scenarios:
+                total = args.auth_requests if name in AUTH_SCENARIOS else args.requests
+
+                if name not in AUTH_SCENARIOS and args.warmup:
+                    await drive(senders[name], args.warmup, args.concurrency)
+
+                latencies, statuses, elapsed = await drive(senders[name], total, args.concurrency)
+                results[name] = summarize(latencies, statuses, elapsed)
+
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    args = parse_args()
+    db_path = configure_database(args.db)
+    # 모든 요청이 같은 클라이언트에서 오므로 로그인 / 회원가입 요청 제한은 끄고 측정 (명시적으로 지정하면 그 값을 사용)
+    os.environ.setdefault("RateLimitBackend", "off")
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    seed_started = time.perf_counter()
+    seed(args.users, args.articles, args.questions, args.answers)
+    seed_elapsed = time.perf_counter() - seed_started
+
+    results = asyncio.run(run(args))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": db_path,
+            "seed_s": round(seed_elapsed, 3),
+            "params": {
+                "users": args.users,
+                "articles": args.articles,
+                "questions": args.questions,
+                "answers": args.answers,
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "auth_requests": args.auth_requests,
+                "warmup": args.warmup,
+                "limit": args.limit,
+            },
+        },
+        "results": results,
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,92 @@ class Settings():
     access_secret_key: str = os.getenv("AccessTokenSecretKey")
     refresh_secret_key: str = os.getenv("RefreshTokenSecretKey")
     algorithm: str = os.getenv("Algorithm")
+    token_cache_max_entries: int = int(os.getenv("TokenCacheMaxEntries", "10000"))
+    permission_cache_ttl: float = float(os.getenv("PermissionCacheTtl", "60"))
+    trust_token_permissions: bool = os.getenv("TrustTokenPermissions", "false").lower() == "true"
+
+    # Expired jwt_tokens sweeper
+    token_sweep_interval: float = float(os.getenv("TokenSweepInterval", "600"))
+    token_sweep_batch_size: int = int(os.getenv("TokenSweepBatchSize", "500"))
+
+    # Database
+    database_url: str = os.getenv("DatabaseUrl", "sqlite:///./sql_app.db")
+    async_database_url: str = os.getenv("AsyncDatabaseUrl", "sqlite+aiosqlite:///./sql_app.db")
+    database_pool_size: int = int(os.getenv("DatabasePoolSize", "5"))
+    database_max_overflow: int = int(os.getenv("DatabaseMaxOverflow", "10"))
+    database_pool_timeout: float = float(os.getenv("DatabasePoolTimeout", "30"))
+    database_pool_recycle: int = int(os.getenv("DatabasePoolRecycle", "-1"))
+
+    # SQLite storage profile (default | wal) and its tunables
+    sqlite_profile: str = os.getenv("SqliteProfile", "wal").lower()
+    sqlite_mmap_size: int = int(os.getenv("SqliteMmapSize", str(256 * 1024 * 1024)))
+    sqlite_cache_size_kb: int = int(os.getenv("SqliteCacheSizeKb", str(64 * 1024)))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SqliteBusyTimeoutMs", "5000"))
+
+    # Password hashing (Argon2 parameters; changing them re-hashes passwords on next login)
+    argon2_memory_cost_kb: int = int(os.getenv("Argon2MemoryCostKb", "512000"))
+    argon2_time_cost: int = int(os.getenv("Argon2TimeCost", "2"))
+    argon2_parallelism: int = int(os.getenv("Argon2Parallelism", "2"))
+
+    # Password hashing (Argon2 process pool, budget / max workers are per host and split across serve.py workers)
+    hash_memory_budget_mb: int = int(os.getenv("HashMemoryBudgetMb", "1024"))
+    hash_max_workers: int = int(os.getenv("HashMaxWorkers", "0")) or None
+    hash_max_queue: int = int(os.getenv("HashMaxQueue", "32"))
+    hash_queue_timeout: float = float(os.getenv("HashQueueTimeout", "5"))
+
+    # Login / register rate limiting (token bucket, "count/seconds", 0 disables a limit)
+    rate_limit_backend: str = os.getenv("RateLimitBackend", "memory").lower()  # memory | sqlite | off
+    rate_limit_max_keys: int = int(os.getenv("RateLimitMaxKeys", "100000"))
+    rate_limit_login_ip: str = os.getenv("RateLimitLoginIp", "20/60")
+    rate_limit_login_account: str = os.getenv("RateLimitLoginAccount", "5/60")
+    rate_limit_register_ip: str = os.getenv("RateLimitRegisterIp", "5/600")
+    rate_limit_register_account: str = os.getenv("RateLimitRegisterAccount", "3/600")
+
+    # Article view count write-behind buffer
+    view_count_flush_interval: float = float(os.getenv("ViewCountFlushInterval", "5"))
+    view_count_flush_threshold: int = int(os.getenv("ViewCountFlushThreshold", "1000"))
+
+    # Published article response cache
+    response_cache_max_bytes: int = int(os.getenv("ResponseCacheMaxBytes", str(32 * 1024 * 1024)))
+
+    # In-memory per-article score tables (submission scoring)
+    score_table_cache_size: int = int(os.getenv("ScoreTableCacheSize", "1024"))
+
+    # Tournament brackets / Elo rankings
+    tournament_bracket_ttl: int = int(os.getenv("TournamentBracketTtl", "3600"))    # seconds
+    tournament_max_size: int = int(os.getenv("TournamentMaxSize", "256"))
+    tournament_elo_k: float = float(os.getenv("TournamentEloK", "32"))
+    tournament_initial_rating: float = float(os.getenv("TournamentInitialRating", "1500"))
+
+    # Trending feed (time-decayed top-K)
+    trending_size: int = int(os.getenv("TrendingSize", "100"))
+    trending_half_life: float = float(os.getenv("TrendingHalfLifeHours", "6")) * 3600
+    trending_view_weight: float = float(os.getenv("TrendingViewWeight", "1"))
+    trending_completion_weight: float = float(os.getenv("TrendingCompletionWeight", "5"))
+    trending_refresh_interval: float = float(os.getenv("TrendingRefreshInterval", "10"))
+    trending_max_tracked: int = int(os.getenv("TrendingMaxTracked", "100000"))
+
+    # Question ingest
+    question_ingest_chunk_size: int = int(os.getenv("QuestionIngestChunkSize", "500"))
+
+    # N+1 query guard (development / test): off | log | raise
+    query_guard_mode: str = os.getenv("QueryGuardMode", "off").lower()
+    query_guard_repeat_threshold: int = int(os.getenv("QueryGuardRepeatThreshold", "3"))
+    query_guard_max_statements: int = int(os.getenv("QueryGuardMaxStatements", "0")) or None
+
+    # Production server (serve.py)
+    web_host: str = os.getenv("WebHost", "0.0.0.0")
+    web_port: int = int(os.getenv("WebPort", "8000"))
+    web_workers: int = int(os.getenv("WebWorkers", "0")) or (os.cpu_count() or 1)
+    web_loop: str = os.getenv("WebLoop", "auto")            # auto | uvloop | asyncio
+    web_http: str = os.getenv("WebHttp", "auto")            # auto | httptools | h11
+    web_preload: bool = os.getenv("WebPreload", "true").lower() == "true"
+    web_graceful_timeout: int = int(os.getenv("WebGracefulTimeout", "30"))
+    web_timeout: int = int(os.getenv("WebTimeout", "60"))
+    web_keepalive: int = int(os.getenv("WebKeepAlive", "5"))
+    web_forwarded_allow_ips: str = os.getenv("WebForwardedAllowIps", "127.0.0.1") # X-Forwarded-For를 신뢰할 프록시 주소 (쉼표 구분, * = 모두)
+    web_max_requests: int = int(os.getenv("WebMaxRequests", "0"))   # 0 = 재시작하지 않음
+    web_max_requests_jitter: int = int(os.getenv("WebMaxRequestsJitter", "0"))
 
 def get_settings():
     return Settings()
@@ -1,16 +1,22 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
 from db.schemas import psychs_schma, user_schema
 from db.models import user_model, psych_model
 from utils import hash
 from db.crud.user import user_read
+from db.crud.psychs import psychs_search
+from utils.response_cache import response_cache
 from datetime import datetime, timezone
+from typing import List, AsyncIterator
+from pydantic import ValidationError
 
 import traceback
 
-async def create_article(db: Session, article: psychs_schma.PsychArticleCreate, user_id: int):
+async def create_article(db: AsyncSession, article: psychs_schma.PsychArticleCreate, user_id: int):
     """새로운 검사 글을 생성합니다."""
 
     db_article = psych_model.PsychArticle(
@@ -23,8 +29,13 @@ async def create_article(db: Session, article: psychs_schma.PsychArticleCreate,
         author_id=user_id
     )
     db.add(db_article)
-    db.commit()
-    db.refresh(db_article)
+    await db.flush()
+
+    # 검색 색인 추가
+    await psychs_search.index_article(db=db, article_id=db_article.id, title=db_article.title, description=db_article.description)
+
+    await db.commit()
+    await db.refresh(db_article)
 
     # 일부 공개일 때의 처리
     if article.article_visibility == psychs_schma.PsychVisibility.LIMITED:
@@ -32,7 +43,7 @@ async def create_article(db: Session, article: psychs_schma.PsychArticleCreate,
         if article.password is None or article.password == "":
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Password is required")
         db_password = psych_model.PsychArticlePassword(
-            password=hash.hash_text(article.password),
+            password=await hash.hash_text(article.password),
             article_id=db_article.id
         )
         db.add(db_password)
@@ -67,47 +78,168 @@ async def create_article(db: Session, article: psychs_schma.PsychArticleCreate,
     #         db.add_all(results)
 
     # 모든 변경 사항을 한 번에 데이터베이스에 커밋
-    db.commit()
+    await db.commit()
 
     return db_article.id
 
 
-async def add_psych_to_article(db: Session, article_id: int, psychs: psychs_schma.PsychArticleQuestions):
+async def insert_question_chunk(db: AsyncSession, article_id: int, psychs: List[psychs_schma.PsychArticleQuestion]):
+    """
+        질문 묶음을 커밋 없이 삽입합니다.
+
+        질문 / 답변 / 첨부파일을 각각 한 번의 executemany로 넣으므로 묶음 크기와 관계없이 3개의 문장만 실행됩니다.
+        질문 ID는 RETURNING으로 받아 입력 순서대로 답변과 첨부파일에 연결합니다.
+    """
+
+    if not psychs:
+        return 0
+
+    questions = psych_model.PsychArticleQuestions.__table__
+    answers = psych_model.PsychArticleAnswer.__table__
+    attachments = psych_model.PsychArticleQuestionAttachment.__table__
+
+    result = await db.execute(
+        questions.insert().returning(questions.c.id),
+        [
+            {"article_id": article_id, "question": psych.question, "description": psych.description}
+            for psych in psychs
+        ]
+    )
+    # SQLite는 한 INSERT 안의 행에 rowid를 입력 순서대로 증가시키며 부여하므로, 정렬하면 입력 순서와 일치합니다.
+    # (sort_by_parameter_order를 쓰면 SQLite에서는 행마다 INSERT가 실행됩니다.)
+    question_ids = sorted(result.scalars().all())
+
+    answer_rows = [
+        {"article_id": article_id, "question_id": question_id, "answer": answer.answer, "score": answer.score}
+        for psych, question_id in zip(psychs, question_ids)
+        for answer in psych.answers
+    ]
+    if answer_rows:
+        await db.execute(answers.insert(), answer_rows)
+
+    attachment_rows = [
+        {"question_id": question_id, "image": psych.attachment.image, "video": psych.attachment.video, "audio": psych.attachment.audio}
+        for psych, question_id in zip(psychs, question_ids)
+        if psych.attachment
+    ]
+    if attachment_rows:
+        await db.execute(attachments.insert(), attachment_rows)
+
+    return len(question_ids)
+
+
+async def finish_question_ingest(db: AsyncSession, article_id: int):
+    """질문 추가를 마무리합니다. 게시글 버전을 올리고 한 번에 커밋한 뒤 캐시된 응답을 무효화합니다."""
+
+    await db.execute(
+        update(psych_model.PsychArticle)
+        .where(psych_model.PsychArticle.id == article_id)
+        .values(content_version=psych_model.PsychArticle.content_version + 1)
+    )
+    await db.commit()
+
+    response_cache.invalidate(article_id)
+
+
+async def add_psych_to_article(db: AsyncSession, article_id: int, psychs: List[psychs_schma.PsychArticleQuestion]):
     """
         검사를 테스트에 추가합니다.
+        모든 질문, 답변, 첨부파일을 하나의 트랜잭션으로 기록합니다.
     """
 
-    try:
-        for psych in psychs:
-            question = psych_model.PsychArticleQuestions(
-                article_id=article_id,
-                question=psych.title,
-                description=psych.description,
-                score=psych.score or 0,
-            )
+    count = await insert_question_chunk(db=db, article_id=article_id, psychs=psychs)
+    await finish_question_ingest(db=db, article_id=article_id)
+
+    return count
+
 
-            db.add(question)
-            db.commit()
+async def add_psych_to_article_stream(db: AsyncSession, article_id: int, lines: AsyncIterator[bytes], chunk_size: int = 500):
+    """
+        NDJSON(한 줄에 질문 하나) 스트림으로 검사를 테스트에 추가합니다.
+
+        chunk_size개씩 파싱해 삽입하므로 업로드 크기와 관계없이 메모리 사용량이 일정하며,
+        전체가 하나의 트랜잭션이므로 중간에 잘못된 줄이 있으면 아무것도 기록되지 않습니다.
+    """
+
+    count = 0
+    chunk = []
+    line_number = 0
+
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
 
-            question_id = question.id
+        try:
+            chunk.append(psychs_schma.PsychArticleQuestion.model_validate_json(line))
+        except ValidationError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid question at line {line_number}")
 
-            if psych.attachment:
-                attachment = psych_model.PsychArticleQuestionAttachment()
+        if len(chunk) >= chunk_size:
+            count += await insert_question_chunk(db=db, article_id=article_id, psychs=chunk)
+            chunk = []
 
-                if psych.attachment.image:
-                    attachment.image = psych.attachment.image
+    count += await insert_question_chunk(db=db, article_id=article_id, psychs=chunk)
+    await finish_question_ingest(db=db, article_id=article_id)
 
-                if psych.attachment.video:
-                    attachment.video = psych.attachment.video
+    return count
 
-                if psych.attachment.audio:
-                    attachment.audio = psych.attachment.audio
 
-                db.add(attachment)
-                db.commit()
+async def create_submission(db: AsyncSession, article_id: int, answer_ids: List[int], user_id: int = None, question_by_answer: dict = None):
+    """
+        사용자가 선택한 답변들을 기록하고, 같은 트랜잭션에서 답변별 선택 횟수를 증가시킵니다.
+
+        question_by_answer({답변 ID: 질문 ID}, 채점표의 것)가 주어지면 답변 검증 쿼리 없이 그것으로 검증합니다.
+    """
+
+    answer_ids = list(dict.fromkeys(answer_ids)) # 중복 제거 (순서 유지)
 
-    except SQLAlchemyError as e:
-        err_msg = traceback.format_exc()
-        print(err_msg)
+    if not answer_ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No answers submitted")
 
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
\ No newline at end of file
+    if question_by_answer is None:
+        # 제출된 답변이 모두 이 게시글의 질문에 속하는지 확인
+        result = await db.execute(
+            select(psych_model.PsychArticleAnswer.id, psych_model.PsychArticleAnswer.question_id)
+            .join(psych_model.PsychArticleQuestions, psych_model.PsychArticleAnswer.question_id == psych_model.PsychArticleQuestions.id)
+            .filter(psych_model.PsychArticleAnswer.id.in_(answer_ids), psych_model.PsychArticleQuestions.article_id == article_id)
+        )
+        question_by_answer = {row.id: row.question_id for row in result.all()}
+    else:
+        question_by_answer = {answer_id: question_by_answer[answer_id] for answer_id in answer_ids if answer_id in question_by_answer}
+
+    if len(question_by_answer) != len(answer_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid answer")
+
+    if len(set(question_by_answer.values())) != len(answer_ids):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Only one answer per question")
+
+    db_submission = psych_model.PsychArticleSubmission(
+        article_id=article_id,
+        user_id=user_id,
+        created_at=datetime.now(timezone.utc),
+        selections=[
+            psych_model.PsychArticleSelection(
+                article_id=article_id,
+                question_id=question_by_answer[answer_id],
+                answer_id=answer_id
+            )
+            for answer_id in answer_ids
+        ]
+    )
+    db.add(db_submission)
+
+    # 답변별 카운터 증가 (없으면 1로 생성)
+    counts = psych_model.PsychArticleAnswerCount.__table__
+    upsert = sqlite_insert(counts).values([
+        {"answer_id": answer_id, "article_id": article_id, "count": 1}
+        for answer_id in answer_ids
+    ])
+    await db.execute(upsert.on_conflict_do_update(
+        index_elements=[counts.c.answer_id],
+        set_={"count": counts.c.count + 1}
+    ))
+
+    await db.commit()
+
+    return db_submission
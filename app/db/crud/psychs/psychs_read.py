@@ -1,117 +1,332 @@
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.schemas import psychs_schma, user_schema
 from db.models import user_model, psych_model
 from db.crud.user import user_read
+from db.crud.user.user_loader import UserSummaryLoader
+from utils.view_counter import view_counter
+from utils.response_cache import response_cache
+from utils.score_table import ScoreTable, score_tables
 from datetime import datetime, timezone
 
 from typing import List
 
-def get_psych_posts_with_authors(db: Session, page_number: int = 1, limit: int = 10):
+import orjson
+
+async def get_psych_posts_with_authors(db: AsyncSession, page_number: int = 1, limit: int = 10):
     """페이지마다 지정된 수의 게시글을 조회합니다.
     
     Args:
-        db (Session): 데이터베이스 세션 객체.
+        db (AsyncSession): 데이터베이스 세션 객체.
         page_number (int): 현재 페이지 번호, 기본값은 1.
         limit (int): 페이지당 게시글 수, 기본값은 10.
         
     Returns:
-        list: 요청된 페이지에 해당하는 게시글 객체 리스트.
+        list: 요청된 페이지에 해당하는 게시글 행(Row) 리스트. ORM 객체를 만들지 않습니다.
     """
     skip = (page_number - 1) * limit  # (현재 페이지 번호 - 1) * 페이지당 게시글 수
 
 
-    # 게시글과 관련된 작성자 정보를 함께 로드합니다.
-    return db.query(psych_model.PsychArticle).options(joinedload(psych_model.PsychArticle.author)).order_by(psych_model.PsychArticle.created_at.desc()).offset(skip).limit(limit).all()
+    # 작성자 정보는 UserSummaryLoader로 한 번에 조회합니다.
+    articles = psych_model.PsychArticle.__table__
+    result = await db.execute(select(articles).order_by(articles.c.created_at.desc(), articles.c.id.desc()).offset(skip).limit(limit))
+    return result.all()
+
+
+async def get_psych_posts_with_authors_after(db: AsyncSession, created_at: datetime, article_id: int, limit: int = 10):
+    """커서 (created_at, id) 이후의 게시글을 최신순으로 조회합니다. (Keyset pagination)
+
+    OFFSET 없이 (created_at, id) 복합 인덱스를 타므로 페이지 깊이와 관계없이 비용이 일정합니다.
+
+    Args:
+        db (AsyncSession): 데이터베이스 세션 객체.
+        created_at (datetime): 이전 페이지 마지막 게시글의 작성 시각.
+        article_id (int): 이전 페이지 마지막 게시글의 ID.
+        limit (int): 페이지당 게시글 수, 기본값은 10.
+
+    Returns:
+        list: 커서 다음에 오는 게시글 행(Row) 리스트.
+    """
+
+    articles = psych_model.PsychArticle.__table__
+    result = await db.execute(
+        select(articles)
+        .filter(tuple_(articles.c.created_at, articles.c.id) < tuple_(created_at, article_id))
+        .order_by(articles.c.created_at.desc(), articles.c.id.desc())
+        .limit(limit)
+    )
+    return result.all()
+
+
+def article_to_dict(article, author: user_schema.UserSummary = None):
+    """게시글 행(Row 또는 ORM 객체)을 PsychArticleResponse 형태의 dict로 변환합니다. (검증 없이 바로 직렬화하는 목록 응답용)"""
+    return {
+        "title": article.title,
+        "description": article.description,
+        "type": article.type,
+        "href": f"/psychs/{article.id}",
+        "id": article.id,
+        "author_id": article.author_id,
+        "author_profile_url": author.profile_url if author else None,
+        "author_nickname": author.nickname if author else 'Unknown',
+        "created_at": article.created_at,
+        "updated_at": article.updated_at,
+        "thumbnail_url": article.thumbnail_url,
+        "article_visibility": article.visibility,
+        "view_count": article.view_count + view_counter.pending(article.id),
+    }
+
+
+async def build_article_responses(db_articles: list, user_loader: UserSummaryLoader) -> List[dict]:
+    """
+        게시글 목록을 응답용 dict 목록으로 변환합니다. 작성자 정보는 IN (...) 쿼리 한 번으로 조회합니다.
+        pydantic 모델을 거치지 않으므로 ORJSONResponse로 바로 직렬화합니다.
+    """
 
+    authors = await user_loader.load_many([article.author_id for article in db_articles])
 
-def get_psych_post(db: Session, article_id: int) -> psychs_schma.PsychArticleResponse:
+    return [article_to_dict(article, author) for article, author in zip(db_articles, authors)]
+
+
+async def get_psych_post(db: AsyncSession, article_id: int, user_loader: UserSummaryLoader = None) -> psychs_schma.PsychArticleResponse:
     """특정 게시글을 조회합니다.
     
     Args:
-        db (Session): 데이터베이스 세션 객체.
+        db (AsyncSession): 데이터베이스 세션 객체.
         post_id (int): 조회할 게시글의 ID.
+        user_loader (UserSummaryLoader): 작성자 정보 조회에 사용할 요청 단위 로더. 없으면 새로 만듭니다.
         
     Returns:
         PsychTestPost: 조회된 게시글과 작성자 정보를 포함한 객체.
     """
 
-    db_article = db.query(psych_model.PsychArticle).filter(psych_model.PsychArticle.id == article_id).first()
+    db_version = await get_psych_version(db=db, article_id=article_id)
+
+    if not db_version:
+        return None
+
+    # 조회수 업데이트 (메모리에 모았다가 배치로 기록)
+    view_counter.increment(article_id)
+    view_count = db_version.view_count + view_counter.pending(article_id)
 
-    # 조회수 업데이트
-    db_article.view_count += 1
-    db.commit()
+    # 같은 버전의 본문이 캐시되어 있으면 조회수만 바꿔서 반환
+    cached = response_cache.get("article", article_id, db_version.content_version)
+    if cached:
+        return cached.model_copy(update={"view_count": view_count})
+
+    result = await db.execute(select(psych_model.PsychArticle).filter(psych_model.PsychArticle.id == article_id))
+    db_article = result.scalars().first()
 
     if db_article:
-        author_profile = user_read.get_user_profile(db=db, user_id=db_article.author_id)
+        author = await (user_loader or UserSummaryLoader(db)).load(db_article.author_id)
         
-        return psychs_schma.PsychArticleResponse(
+        response = psychs_schma.PsychArticleResponse(
             href=f"/psychs/{db_article.id}",
             id=db_article.id,
             title=db_article.title,
             description=db_article.description,
             type=db_article.type.value,
             author_id=db_article.author_id,
-            author_nickname=db_article.author.nickname,
-            author_profile_url=author_profile,
+            author_nickname=author.nickname if author else 'Unknown',
+            author_profile_url=author.profile_url if author else None,
             created_at=db_article.created_at,
             updated_at=db_article.updated_at,
             thumbnail_url=db_article.thumbnail_url,
-            view_count=db_article.view_count+1,
+            view_count=view_count,
             article_visibility=db_article.visibility
         )
+        response_cache.set("article", article_id, db_version.content_version, response)
+
+        return response
 
     return None
 
-def get_psych_questions_and_answer(db: Session, article_id: int) -> psychs_schma.PsychArticleResponse:
-    """특정 게시글의 질문과 답변을 조회합니다.
-    
+async def get_psych_version(db: AsyncSession, article_id: int):
+    """게시글의 content_version과 저장된 조회수를 조회합니다. 게시글이 없으면 None을 반환합니다."""
+    result = await db.execute(
+        select(psych_model.PsychArticle.content_version, psych_model.PsychArticle.view_count)
+        .filter(psych_model.PsychArticle.id == article_id)
+    )
+    return result.first()
+
+
+async def get_psych_question_tree(db: AsyncSession, article_id: int) -> List[psych_model.PsychArticleQuestions]:
+    """게시글의 질문 목록을 답변, 첨부파일과 함께 조회합니다.
+
+    질문 수와 관계없이 질문 / 답변 / 첨부파일 3개의 쿼리로 전체 트리를 불러옵니다.
+
     :param db: 데이터베이스 세션 객체.
     :param article_id: 조회할 게시글의 ID.
     ###
-    :return: PsychTestPost: 조회된 게시글과 작성자 정보를 포함한 객체.
+    :return: 답변(answers)과 첨부파일(attachments)이 로드된 질문 객체 리스트.
     ###
     """
 
-    db_article_questions = db.query(psych_model.PsychArticleQuestions).filter(psych_model.PsychArticleQuestions.article_id == article_id).all()
+    result = await db.execute(
+        select(psych_model.PsychArticleQuestions)
+        .options(
+            selectinload(psych_model.PsychArticleQuestions.answers),
+            selectinload(psych_model.PsychArticleQuestions.attachments)
+        )
+        .filter(psych_model.PsychArticleQuestions.article_id == article_id)
+        .order_by(psych_model.PsychArticleQuestions.id)
+    )
+    return result.scalars().all()
+
+
+async def get_psych_question_rows(db: AsyncSession, article_id: int):
+    """게시글의 질문 / 답변 / 첨부파일을 ORM 객체 없이 행(Row)으로 조회합니다. (3개의 쿼리)
+
+    :return: (질문 행 리스트, {question_id: [답변 행]}, {question_id: 첫 번째 첨부파일 행})
+    """
+
+    questions = psych_model.PsychArticleQuestions.__table__
+    answers = psych_model.PsychArticleAnswer.__table__
+    attachments = psych_model.PsychArticleQuestionAttachment.__table__
+
+    question_rows = (await db.execute(
+        select(questions.c.id, questions.c.question, questions.c.description)
+        .where(questions.c.article_id == article_id)
+        .order_by(questions.c.id)
+    )).all()
+
+    if not question_rows:
+        return [], {}, {}
+
+    question_ids = select(questions.c.id).where(questions.c.article_id == article_id).scalar_subquery()
+
+    answers_by_question = {}
+    for row in (await db.execute(
+        select(answers.c.id, answers.c.question_id, answers.c.answer)
+        .where(answers.c.question_id.in_(question_ids))
+        .order_by(answers.c.id)
+    )):
+        answers_by_question.setdefault(row.question_id, []).append(row)
 
+    attachment_by_question = {}
+    for row in (await db.execute(
+        select(attachments.c.question_id, attachments.c.image, attachments.c.video, attachments.c.audio)
+        .where(attachments.c.question_id.in_(question_ids))
+        .order_by(attachments.c.id)
+    )):
+        attachment_by_question.setdefault(row.question_id, row)
+
+    return question_rows, answers_by_question, attachment_by_question
+
+
+def question_tree_to_dict(question_rows, answers_by_question: dict, attachment_by_question: dict):
+    """get_psych_question_rows의 결과를 PsychArticleQuestionsResponse 형태의 dict로 변환합니다. (답변 점수는 포함하지 않음)"""
     questions_list = []
 
-    if db_article_questions:
-        for index, db_article_question in enumerate(db_article_questions):
+    for index, question in enumerate(question_rows):
+        attachment = attachment_by_question.get(question.id)
 
-            db_article_answers = db.query(psych_model.PsychArticleAnswer).filter(psych_model.PsychArticleAnswer.question_id == db_article_question.id).all()
-            question_attachment = db.query(psych_model.PsychArticleQuestionAttachment).filter(psych_model.PsychArticleQuestionAttachment.question_id == db_article_question.id).first()
+        questions_list.append({
+            "index": index,
+            "question": question.question,
+            "description": question.description,
+            "attachment": {
+                "image": attachment.image,
+                "video": attachment.video,
+                "audio": attachment.audio
+            } if attachment else None,
+            "answers": [
+                {"id": answer.id, "answer": answer.answer}
+                for answer in answers_by_question.get(question.id, ())
+            ]
+        })
 
-            questions_list.append(psychs_schma.PsychArticleQuestion(
-                index=index,
-                question=db_article_question.question,
-                description=db_article_question.description,
-                attachment=psychs_schma.PsychArticleQuestionAttachment(
-                    image=question_attachment.image,
-                    video=question_attachment.video,
-                    audio=question_attachment.audio
-                ) if question_attachment else None,
-                answers=[psychs_schma.PsychArticleAnswer(
-                    answer=db_article_answer.answer,
-                    score=db_article_answer.score
-                ) for db_article_answer in db_article_answers]
-            ))
-        
-        return psychs_schma.PsychArticleQuestions(questions=questions_list)
+    return {"questions": questions_list}
+
+
+async def get_psych_questions_json(db: AsyncSession, article_id: int) -> bytes:
+    """특정 게시글의 질문과 답변을 직렬화된 JSON(PsychArticleQuestionsResponse)으로 조회합니다.
+
+    응답 캐시에는 직렬화된 bytes를 저장하므로 캐시 적중 시 변환 비용이 없습니다.
+
+    :param db: 데이터베이스 세션 객체.
+    :param article_id: 조회할 게시글의 ID.
+    ###
+    :return: JSON bytes. 게시글이 없거나 질문이 없으면 None.
+    ###
+    """
+
+    db_version = await get_psych_version(db=db, article_id=article_id)
+
+    if not db_version:
+        return None
+
+    cached = response_cache.get("questions", article_id, db_version.content_version)
+    if cached:
+        return cached
+
+    question_rows, answers_by_question, attachment_by_question = await get_psych_question_rows(db=db, article_id=article_id)
+
+    if question_rows:
+        response = orjson.dumps(question_tree_to_dict(question_rows, answers_by_question, attachment_by_question))
+        response_cache.set("questions", article_id, db_version.content_version, response)
+
+        return response
 
     return None
 
 
-def get_psych_question_statistics(db: Session, article_id: int) -> psychs_schma.PsychArticleQuestionStatistics:
-    db_article_questions = db.query(psych_model.PsychArticleQuestions).filter(psych_model.PsychArticleQuestions.article_id == article_id).all()
+async def get_psych_score_table(db: AsyncSession, article_id: int) -> ScoreTable:
+    """
+        게시글의 채점표를 반환합니다. 게시글이 없으면 None을 반환합니다.
+        캐시된 채점표의 버전이 같으면 버전 확인 쿼리 하나로 끝나고, 아니면 답변 / 결과를 2개의 쿼리로 불러와 만듭니다.
+    """
+
+    db_version = await get_psych_version(db=db, article_id=article_id)
+    if db_version is None:
+        return None
+
+    table = score_tables.get(article_id, db_version.content_version)
+    if table is not None:
+        return table
+
+    questions = psych_model.PsychArticleQuestions.__table__
+    answers = psych_model.PsychArticleAnswer.__table__
+    results = psych_model.PsychArticleResult.__table__
+
+    answer_rows = (await db.execute(
+        select(answers.c.id, answers.c.question_id, answers.c.score)
+        .join(questions, answers.c.question_id == questions.c.id)
+        .where(questions.c.article_id == article_id)
+    )).all()
+
+    result_rows = (await db.execute(
+        select(results.c.id, results.c.title, results.c.description, results.c.min_score)
+        .where(results.c.article_id == article_id)
+        .order_by(results.c.min_score, results.c.id)
+    )).all()
+
+    table = ScoreTable(db_version.content_version, answer_rows, result_rows)
+    score_tables.set(article_id, table)
+
+    return table
+
+
+async def get_psych_answer_counts(db: AsyncSession, article_id: int):
+    """게시글의 답변별 선택 횟수를 {answer_id: count} 형태로 조회합니다."""
+    result = await db.execute(
+        select(psych_model.PsychArticleAnswerCount.answer_id, psych_model.PsychArticleAnswerCount.count)
+        .filter(psych_model.PsychArticleAnswerCount.article_id == article_id)
+    )
+    return {row.answer_id: row.count for row in result.all()}
+
+
+async def get_psych_question_statistics(db: AsyncSession, article_id: int) -> psychs_schma.PsychArticleQuestionStatistics:
+    db_article_questions = await get_psych_question_tree(db=db, article_id=article_id)
+    answer_counts = await get_psych_answer_counts(db=db, article_id=article_id)
 
     questions_list = []
 
     if db_article_questions:
         for index, db_article_question in enumerate(db_article_questions):
-
-            db_article_answers = db.query(psych_model.PsychArticleAnswer).filter(psych_model.PsychArticleAnswer.question_id == db_article_question.id).all()
-            question_attachment = db.query(psych_model.PsychArticleQuestionAttachment).filter(psych_model.PsychArticleQuestionAttachment.question_id == db_article_question.id).first()
+            db_article_answers = db_article_question.answers
+            question_attachment = db_article_question.attachments[0] if db_article_question.attachments else None
 
             questions_list.append(psychs_schma.PsychArticleQuestionStatistic(
                 index=index,
@@ -125,7 +340,7 @@ def get_psych_question_statistics(db: Session, article_id: int) -> psychs_schma.
                 answers=[psychs_schma.PsychArticleAnswerStatistics(
                     answer=db_article_answer.answer,
                     score=db_article_answer.score,
-                    count=10
+                    count=answer_counts.get(db_article_answer.id, 0)
                 ) for db_article_answer in db_article_answers]
             ))
         
@@ -134,8 +349,9 @@ def get_psych_question_statistics(db: Session, article_id: int) -> psychs_schma.
     return None
 
 
-def get_psych_owner(db: Session, article_id: int) -> int:
-    db_article = db.query(psych_model.PsychArticle).filter(psych_model.PsychArticle.id == article_id).first()
+async def get_psych_owner(db: AsyncSession, article_id: int) -> int:
+    result = await db.execute(select(psych_model.PsychArticle).filter(psych_model.PsychArticle.id == article_id))
+    db_article = result.scalars().first()
 
     if not db_article:
         return None
@@ -0,0 +1,100 @@
+from sqlalchemy import select, text, Integer, Float
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.schemas import psychs_schma
+from db.models import psych_model
+
+import re
+
+# 제목 매칭에 본문(description)보다 큰 가중치를 줍니다.
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def build_match_query(query: str):
+    """
+        사용자 검색어를 FTS5 MATCH 식으로 바꿉니다.
+        각 단어를 따옴표로 감싸 FTS5 문법 문자를 무력화하고, 접두어 검색(*)으로 이어 붙입니다. (AND 검색)
+        검색할 단어가 없으면 None을 반환합니다.
+    """
+    terms = [term.replace('"', '') for term in re.split(r"\s+", query.strip())]
+    terms = [term for term in terms if term]
+
+    if not terms:
+        return None
+
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+async def index_article(db: AsyncSession, article_id: int, title: str, description: str):
+    """게시글의 검색 색인을 추가하거나 갱신합니다. 호출한 쪽의 트랜잭션에서 함께 커밋됩니다."""
+    await db.execute(text(f"DELETE FROM {psych_model.PSYCH_ARTICLES_FTS} WHERE rowid = :id"), {"id": article_id})
+    await db.execute(
+        text(f"INSERT INTO {psych_model.PSYCH_ARTICLES_FTS} (rowid, title, description) VALUES (:id, :title, :description)"),
+        {"id": article_id, "title": title, "description": description or ""}
+    )
+
+
+async def search_articles(db: AsyncSession, query: str, limit: int = 10, offset: int = 0, after_id: int = None):
+    """
+        공개 게시글을 제목/설명으로 검색해 BM25 점수순으로 반환합니다.
+
+        BM25 점수는 색인 전체의 통계로 계산되어 게시글이 추가 / 수정될 때마다 모든 결과의 값이 바뀌므로
+        이전 페이지의 점수와 비교하는 커서 대신 순위(offset)로 이어갑니다. (점수순 정렬은 어차피 모든 일치 결과를 계산함)
+        그 사이 앞쪽 결과가 추가 / 삭제되어 순위가 밀리면, offset 앞뒤 limit개 안에서 이전 페이지의 마지막 게시글(after_id)을 찾아 그 다음부터 반환합니다.
+
+        :param query: build_match_query로 만든 FTS5 MATCH 식
+        :param offset: 커서 페이지네이션 - 이전 페이지까지 반환한 결과 수
+        :param after_id: 커서 페이지네이션 - 이전 페이지 마지막 결과의 게시글 ID
+        ###
+        :return: (다음 페이지의 offset, (게시글 객체, 점수) 튜플 리스트). 점수는 낮을수록 관련도가 높습니다.
+        ###
+    """
+    matches = (
+        text(
+            f"SELECT rowid AS id, bm25({psych_model.PSYCH_ARTICLES_FTS}, {TITLE_WEIGHT}, {DESCRIPTION_WEIGHT}) AS score "
+            f"FROM {psych_model.PSYCH_ARTICLES_FTS} WHERE {psych_model.PSYCH_ARTICLES_FTS} MATCH :query"
+        )
+        .bindparams(query=query)
+        .columns(id=Integer, score=Float)
+        .subquery()
+    )
+
+    window = limit if after_id is not None else 0
+    start = max(0, offset - window)
+
+    statement = (
+        select(psych_model.PsychArticle, matches.c.score)
+        .join(matches, matches.c.id == psych_model.PsychArticle.id)
+        .filter(psych_model.PsychArticle.visibility == psychs_schma.PsychVisibility.PUBLIC)
+        .order_by(matches.c.score, matches.c.id)
+        .offset(start)
+        .limit(offset - start + limit + window)
+    )
+
+    result = await db.execute(statement)
+    rows = result.all()
+
+    position = offset - start
+    for index, (db_article, _) in enumerate(rows):
+        if db_article.id == after_id:
+            position = index + 1
+            break
+
+    page = rows[position:position + limit]
+    return start + position + len(page), page
+
+
+async def rebuild_index(db: AsyncSession):
+    """검색 색인을 비우고 모든 게시글로 다시 만듭니다. :return: 색인된 게시글 수"""
+    articles = psych_model.PsychArticle.__table__
+
+    await db.execute(text(psych_model.PSYCH_ARTICLES_FTS_DDL))
+    await db.execute(text(f"DELETE FROM {psych_model.PSYCH_ARTICLES_FTS}"))
+    result = await db.execute(text(
+        f"INSERT INTO {psych_model.PSYCH_ARTICLES_FTS} (rowid, title, description) "
+        f"SELECT id, title, coalesce(description, '') FROM {articles.name}"
+    ))
+    await db.commit()
+
+    return result.rowcount
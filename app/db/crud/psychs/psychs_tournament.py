@@ -0,0 +1,186 @@
+from fastapi import HTTPException, status
+from sqlalchemy import select, func
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.schemas import psychs_schma
+from db.models import psych_model
+from core.config import get_settings
+from utils.tournament import Bracket, elo_deltas
+from datetime import datetime, timezone
+
+
+async def get_tournament_version(db: AsyncSession, article_id: int):
+    """
+        토너먼트 게시글의 content_version을 조회합니다.
+        게시글이 없으면 404, 토너먼트가 아니면 400 예외를 발생시킵니다.
+    """
+
+    result = await db.execute(
+        select(psych_model.PsychArticle.type, psych_model.PsychArticle.content_version)
+        .filter(psych_model.PsychArticle.id == article_id)
+    )
+    db_article = result.first()
+
+    if db_article is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+    if db_article.type != psychs_schma.PsychType.TOURNAMENT:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Not a tournament")
+
+    return db_article.content_version
+
+
+async def get_tournament_candidates(db: AsyncSession, article_id: int):
+    """
+        첨부파일이 있는 질문을 토너먼트 후보로 조회합니다. (쿼리 1개)
+        :return: {질문 ID: 후보 dict} (질문 순서)
+    """
+
+    questions = psych_model.PsychArticleQuestions.__table__
+    attachments = psych_model.PsychArticleQuestionAttachment.__table__
+
+    result = await db.execute(
+        select(questions.c.id, questions.c.question, questions.c.description, attachments.c.image, attachments.c.video, attachments.c.audio)
+        .join(attachments, attachments.c.question_id == questions.c.id)
+        .where(questions.c.article_id == article_id)
+        .order_by(questions.c.id, attachments.c.id)
+    )
+
+    candidates = {}
+    for row in result:
+        # 첨부파일이 여러 개면 첫 번째만 사용
+        if row.id not in candidates:
+            candidates[row.id] = {
+                "id": row.id,
+                "name": row.question,
+                "description": row.description,
+                "attachment": {"image": row.image, "video": row.video, "audio": row.audio},
+            }
+
+    return candidates
+
+
+def bracket_round_to_dict(bracket: Bracket, candidates: dict):
+    """대진표의 현재 라운드를 PsychTournamentRound 형태의 dict로 변환합니다."""
+
+    if bracket.finished:
+        return {"bracket": None, "size": 1, "matches": [], "champion": candidates[bracket.champion]}
+
+    return {
+        "bracket": bracket.encode(),
+        "size": len(bracket.remaining),
+        "matches": [[candidates[candidate_id] for candidate_id in pair] for pair in bracket.pairs()],
+        "champion": None,
+    }
+
+
+async def record_bracket(db: AsyncSession, bracket: Bracket, user_id: int = None):
+    """
+        끝난 대진표를 집계합니다.
+
+        대진표에 나온 후보들의 레이팅만 한 번에 읽어 경기 순서대로 Elo를 계산한 뒤,
+        전적 / 우승 횟수 / 레이팅 변화량을 후보별 upsert 한 번(executemany)으로 더합니다.
+        비용은 대진표 크기에만 비례하고 누적 플레이 수와는 무관합니다.
+    """
+
+    settings = get_settings()
+    stats = psych_model.PsychTournamentStat.__table__
+
+    candidate_ids = {candidate_id for match in bracket.matches for candidate_id in match}
+
+    db.add(psych_model.PsychTournamentPlay(
+        bracket_id=bracket.bracket_id,
+        article_id=bracket.article_id,
+        user_id=user_id,
+        champion_id=bracket.champion,
+        size=len(candidate_ids),
+        created_at=datetime.now(timezone.utc)
+    ))
+
+    try:
+        await db.flush()
+    except IntegrityError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Bracket already submitted")
+
+    result = await db.execute(select(stats.c.question_id, stats.c.rating).where(stats.c.question_id.in_(candidate_ids)))
+    ratings = {candidate_id: settings.tournament_initial_rating for candidate_id in candidate_ids}
+    ratings.update({row.question_id: row.rating for row in result})
+
+    deltas = elo_deltas(bracket.matches, ratings, settings.tournament_elo_k)
+
+    matches = dict.fromkeys(candidate_ids, 0)
+    wins = dict.fromkeys(candidate_ids, 0)
+    for winner, loser in bracket.matches:
+        matches[winner] += 1
+        matches[loser] += 1
+        wins[winner] += 1
+
+    upsert = sqlite_insert(stats)
+    await db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[stats.c.question_id],
+            set_={
+                "matches": stats.c.matches + upsert.excluded.matches,
+                "wins": stats.c.wins + upsert.excluded.wins,
+                "champions": stats.c.champions + upsert.excluded.champions,
+                # 새 행은 초기값 + 변화량으로 들어가므로 기존 행에는 변화량만 더함
+                "rating": stats.c.rating + (upsert.excluded.rating - settings.tournament_initial_rating),
+            }
+        ),
+        [
+            {
+                "question_id": candidate_id,
+                "article_id": bracket.article_id,
+                "matches": matches[candidate_id],
+                "wins": wins[candidate_id],
+                "champions": 1 if candidate_id == bracket.champion else 0,
+                "rating": settings.tournament_initial_rating + deltas[candidate_id],
+            }
+            for candidate_id in candidate_ids
+        ]
+    )
+
+    await db.commit()
+
+
+async def get_tournament_ranking(db: AsyncSession, article_id: int, limit: int = 100, offset: int = 0):
+    """
+        레이팅 순위를 조회합니다. (article_id, rating) 인덱스를 역순으로 읽으므로 집계 없이 limit개만 읽습니다.
+        :return: (전체 플레이 수, 순위 dict 리스트)
+    """
+
+    stats = psych_model.PsychTournamentStat.__table__
+
+    # 대진표마다 우승자는 하나이므로 우승 횟수의 합이 플레이 수 (후보 수만큼만 읽음)
+    plays = (await db.execute(select(func.coalesce(func.sum(stats.c.champions), 0)).where(stats.c.article_id == article_id))).scalar()
+
+    result = await db.execute(
+        select(stats)
+        .where(stats.c.article_id == article_id)
+        .order_by(stats.c.rating.desc(), stats.c.question_id.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    rows = result.all()
+
+    candidates = await get_tournament_candidates(db=db, article_id=article_id) if rows else {}
+
+    rankings = []
+    for index, row in enumerate(rows):
+        candidate = candidates.get(row.question_id)
+        if candidate is None: # 삭제된 후보
+            continue
+
+        rankings.append({
+            **candidate,
+            "rank": offset + index + 1,
+            "rating": row.rating,
+            "matches": row.matches,
+            "wins": row.wins,
+            "win_rate": row.wins / row.matches if row.matches else 0.0,
+            "champions": row.champions,
+        })
+
+    return plays, rankings
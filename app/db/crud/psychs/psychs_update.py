@@ -1,23 +1,28 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
 from db.schemas import psychs_schma, user_schema
 from db.models import user_model, psych_model
 from utils import hash
 from db.crud.user import user_read
+from db.crud.psychs import psychs_search
+from utils.response_cache import response_cache
 from datetime import datetime, timezone
+from typing import List
 
 import traceback
 
 
-async def update_article(db: Session, article_id: int, psychs: psychs_schma.PsychArticleUpdate):
+async def update_article(db: AsyncSession, article_id: int, psychs: psychs_schma.PsychArticleUpdate):
     """
         articleをアップデートする。
     """
 
     try:
-        db_post = db.query(psych_model.PsychArticle).filter(psych_model.PsychArticle.id == article_id).first()
+        result = await db.execute(select(psych_model.PsychArticle).filter(psych_model.PsychArticle.id == article_id))
+        db_post = result.scalars().first()
 
         if not db_post:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
@@ -30,11 +35,78 @@ async def update_article(db: Session, article_id: int, psychs: psychs_schma.Psyc
         db_post.visibility = psychs.article_visibility
         db_post.thumbnail_url = psychs.thumbnail_url
         db_post.updated_at = datetime.now(timezone.utc)
+        db_post.content_version = psych_model.PsychArticle.content_version + 1
 
-        db.commit()
+        # 검색 색인 갱신
+        await psychs_search.index_article(db=db, article_id=article_id, title=psychs.title, description=psychs.description)
+
+        await db.commit()
+
+        response_cache.invalidate(article_id)
 
     except SQLAlchemyError as e:
         err_msg = traceback.format_exc()
         print(err_msg)
 
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+async def replace_results(db: AsyncSession, article_id: int, results: List[psychs_schma.PsychArticleResultCreate]):
+    """
+        게시글의 결과 목록을 통째로 교체합니다.
+        게시글 버전을 올리므로 메모리에 있는 채점표도 다음 제출 때 다시 만들어집니다.
+
+        :return: 저장된 결과 수
+    """
+
+    min_scores = [result.min_score for result in results]
+    if len(set(min_scores)) != len(min_scores):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate min_score")
+
+    table = psych_model.PsychArticleResult.__table__
+
+    await db.execute(delete(table).where(table.c.article_id == article_id))
+    if results:
+        await db.execute(table.insert(), [
+            {"article_id": article_id, "title": result.title, "description": result.description, "min_score": result.min_score}
+            for result in results
+        ])
+
+    await db.execute(
+        update(psych_model.PsychArticle)
+        .where(psych_model.PsychArticle.id == article_id)
+        .values(content_version=psych_model.PsychArticle.content_version + 1)
+    )
+    await db.commit()
+
+    response_cache.invalidate(article_id)
+
+    return len(results)
+
+
+async def rebuild_answer_counts(db: AsyncSession, article_id: int = None):
+    """
+        제출 기록(psych_article_selections)으로부터 답변별 선택 횟수를 다시 계산합니다.
+        article_id가 주어지면 해당 게시글만 재계산합니다.
+
+        :return: 재계산된 카운터 행 수
+    """
+
+    counts = psych_model.PsychArticleAnswerCount.__table__
+    selections = psych_model.PsychArticleSelection.__table__
+
+    clear = delete(counts)
+    aggregate = (
+        select(selections.c.answer_id, selections.c.article_id, func.count().label("count"))
+        .group_by(selections.c.answer_id, selections.c.article_id)
+    )
+
+    if article_id is not None:
+        clear = clear.where(counts.c.article_id == article_id)
+        aggregate = aggregate.where(selections.c.article_id == article_id)
+
+    await db.execute(clear)
+    result = await db.execute(counts.insert().from_select(["answer_id", "article_id", "count"], aggregate))
+    await db.commit()
+
+    return result.rowcount
@@ -1,33 +1,35 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.schemas.user_schema import *
 from db.models import user_model
 from utils import hash
+from utils.jwt import REFRESH_TOKEN_EXPIRES
 from db.crud.user import user_read
 from datetime import datetime, timezone
 
-async def create_user(db: Session, user: UserCreate):
+async def create_user(db: AsyncSession, user: UserCreate):
     """새로운 사용자를 생성합니다."""
     db_user = user_model.User(
         username=user.username,
         email=user.email,
         nickname=user.nickname,
-        hashed_password=hash.hash_text(user.password),
+        hashed_password=await hash.hash_text(user.password),
         created_at=datetime.now(timezone.utc)
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-async def create_jwt(db: Session, user_id: int, access_token: str, refresh_token: str, public_ip: str):
+async def create_jwt(db: AsyncSession, user_id: int, access_token: str, refresh_token: str, public_ip: str):
     """새로운 JWT 토큰을 생성합니다."""
     db_token = user_model.JwtToken(
         user_id=user_id,
         access_token=access_token,
         refresh_token=refresh_token,
-        public_ip=public_ip
+        public_ip=public_ip,
+        expires_at=datetime.now(timezone.utc) + REFRESH_TOKEN_EXPIRES
     )
     db.add(db_token)
-    db.commit()
-    db.refresh(db_token)
+    await db.commit()
+    await db.refresh(db_token)
     return db_token
\ No newline at end of file
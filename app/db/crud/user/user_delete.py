@@ -1,6 +1,27 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.schemas import user_schema
 from db.models import user_model
 from db.crud.user import user_read
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, select, delete
 from fastapi import HTTPException
+from datetime import datetime, timezone
+
+
+async def delete_expired_jwt(db: AsyncSession, batch_size: int = 500, include_legacy: bool = False):
+    """
+        만료된 JWT 토큰 행을 최대 batch_size개 삭제하고 바로 커밋합니다.
+        쓰기 잠금을 짧게 유지하기 위해 한 번에 조금씩만 지웁니다.
+
+        :param include_legacy: expires_at이 없는(만료 시각 기록 이전에 만들어진) 행도 삭제할지 여부
+        :return: 삭제된 행 수
+    """
+    condition = user_model.JwtToken.expires_at < datetime.now(timezone.utc)
+    if include_legacy:
+        condition = or_(condition, user_model.JwtToken.expires_at.is_(None))
+
+    expired_ids = select(user_model.JwtToken.id).filter(condition).limit(batch_size).scalar_subquery()
+
+    result = await db.execute(delete(user_model.JwtToken).where(user_model.JwtToken.id.in_(expired_ids)))
+    await db.commit()
+
+    return result.rowcount
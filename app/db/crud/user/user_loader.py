@@ -0,0 +1,18 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.session import get_async_db
+from db.crud.user import user_read
+from utils.dataloader import DataLoader
+
+
+class UserSummaryLoader(DataLoader):
+    """사용자 ID로 닉네임과 프로필 URL을 일괄 조회하는 요청 단위 로더입니다."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(lambda user_ids: user_read.get_user_summaries(db=db, user_ids=user_ids))
+
+
+async def get_user_loader(db: AsyncSession = Depends(get_async_db)):
+    """요청마다 새 UserSummaryLoader를 만들어 주입합니다. (핸들러와 같은 세션을 공유)"""
+    return UserSummaryLoader(db)
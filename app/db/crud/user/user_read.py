@@ -1,35 +1,45 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.models import user_model
 from db.schemas import user_schema
-from sqlalchemy import or_, and_, union_all
+from sqlalchemy import select, or_, and_, union_all
 
-from utils.jwt import Permission
+from typing import List
 
-def find_user_by_email(db: Session, email: str):
-    return db.query(user_model.User).filter(user_model.User.email == email).first()
+async def find_user_by_email(db: AsyncSession, email: str):
+    result = await db.execute(select(user_model.User).filter(user_model.User.email == email))
+    return result.scalars().first()
 
 
-def find_user_by_username(db: Session, username: str):
-    return db.query(user_model.User).filter(user_model.User.username == username).first()
+async def find_user_by_username(db: AsyncSession, username: str):
+    result = await db.execute(select(user_model.User).filter(user_model.User.username == username))
+    return result.scalars().first()
 
 
-def find_user_by_nickname(db: Session, nickname: str):
-    return db.query(user_model.User).filter(user_model.User.nickname == nickname).first()
+async def find_user_by_nickname(db: AsyncSession, nickname: str):
+    result = await db.execute(select(user_model.User).filter(user_model.User.nickname == nickname))
+    return result.scalars().first()
 
 
-def find_user_for_login(db: Session, account: str):
-    return db.query(user_model.User).filter(or_(user_model.User.email == account, user_model.User.username == account)).first()
+async def find_user_for_login(db: AsyncSession, account: str):
+    result = await db.execute(select(user_model.User).filter(or_(user_model.User.email == account, user_model.User.username == account)))
+    return result.scalars().first()
 
 
-def find_user_for_register(db: Session, email: str, username: str, nickname: str):
-    return db.query(user_model.User).filter(or_(user_model.User.email == email, user_model.User.username == username, user_model.User.nickname == nickname)).first()
+async def find_user_for_register(db: AsyncSession, email: str, username: str, nickname: str):
+    result = await db.execute(select(user_model.User).filter(or_(user_model.User.email == email, user_model.User.username == username, user_model.User.nickname == nickname)))
+    return result.scalars().first()
 
 
-def find_user_by_userid(db: Session, user_id: int):
-    user = db.query(user_model.User).filter(user_model.User.id == user_id).first()
+async def find_user_by_userid(db: AsyncSession, user_id: int, user_loader = None):
+    result = await db.execute(select(user_model.User).filter(user_model.User.id == user_id))
+    user = result.scalars().first()
 
     if user:    
-        profile = get_user_profile(db=db, user_id=user.id)
+        if user_loader:
+            summary = await user_loader.load(user.id)
+            profile = summary.profile_url if summary else None
+        else:
+            profile = await get_user_profile(db=db, user_id=user.id)
 
         return user_schema.User(
             id=user.id,
@@ -44,8 +54,9 @@ def find_user_by_userid(db: Session, user_id: int):
     return None
 
 
-def get_user_profile(db: Session, user_id: int):
-    profile = db.query(user_model.UserProfile).filter(user_model.UserProfile.user_id == user_id).first()
+async def get_user_profile(db: AsyncSession, user_id: int):
+    result = await db.execute(select(user_model.UserProfile).filter(user_model.UserProfile.user_id == user_id))
+    profile = result.scalars().first()
 
     if profile:
         return profile.profile_url
@@ -53,26 +64,38 @@ def get_user_profile(db: Session, user_id: int):
     return None
 
 
-def get_user_name(db: Session, user_id: int):
-    user = db.query(user_model.User).filter(user_model.User.id == user_id).first()
+async def get_user_summaries(db: AsyncSession, user_ids: List[int]):
+    """여러 사용자의 닉네임과 프로필 URL을 IN (...) 쿼리 한 번으로 조회합니다."""
+    if not user_ids:
+        return {}
 
-    if user:
-        return user.nickname
+    result = await db.execute(
+        select(user_model.User.id, user_model.User.nickname, user_model.UserProfile.profile_url)
+        .outerjoin(user_model.UserProfile, user_model.UserProfile.user_id == user_model.User.id)
+        .filter(user_model.User.id.in_(set(user_ids)))
+    )
 
-    return None
+    return {
+        row.id: user_schema.UserSummary(id=row.id, nickname=row.nickname, profile_url=row.profile_url)
+        for row in result.all()
+    }
 
 
-def get_user_permission(db: Session, user_id: int):
-    user = db.query(user_model.User).filter(user_model.User.id == user_id).first()
+async def get_user_name(db: AsyncSession, user_id: int):
+    result = await db.execute(select(user_model.User).filter(user_model.User.id == user_id))
+    user = result.scalars().first()
 
     if user:
-        permissions = ["-"]
+        return user.nickname
+
+    return None
 
-        result = [
-            Permission(perm)
-            for perm in permissions
-        ] 
 
-        return result
+async def get_user_permission(db: AsyncSession, user_id: int):
+    result = await db.execute(select(user_model.User.role).filter(user_model.User.id == user_id))
+    role = result.scalar()
 
-    return None
\ No newline at end of file
+    if role:
+        return [role]
+
+    return None
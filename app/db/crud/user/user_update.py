@@ -1,27 +1,39 @@
 from datetime import datetime, timedelta, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import update
 from db.crud.user import user_read
+from db.models import user_model
+from db.schemas.user_schema import Permission
+from utils.jwt import permission_cache
 
-async def update_user_for_login(db: Session, db_user, public_ip: str, last_login: datetime = datetime.now(timezone.utc)):
+async def update_user_for_login(db: AsyncSession, db_user, public_ip: str, last_login: datetime = datetime.now(timezone.utc)):
     """사용자의 로그인 정보를 업데이트합니다."""
     db_user.last_login = last_login
     db_user.public_ip = public_ip
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-async def update_user_last_login(db: Session, user_id: int):
+async def update_user_last_login(db: AsyncSession, user_id: int):
     """사용자의 마지막 로그인 시간을 업데이트합니다."""
-    db_user = user_read.get_user_by_id(db, user_id)
+    db_user = await user_read.get_user_by_id(db, user_id)
     db_user.last_login = datetime.now()
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
-async def update_user_public_ip(db: Session, user_id: int):
+async def update_user_public_ip(db: AsyncSession, user_id: int):
     """사용자의 마지막 로그인 시간을 업데이트합니다."""
-    db_user = user_read.get_user_by_id(db, user_id)
+    db_user = await user_read.get_user_by_id(db, user_id)
     db_user.last_login = datetime.now()
-    db.commit()
-    db.refresh(db_user)
-    return db_user
\ No newline at end of file
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_user_role(db: AsyncSession, user_id: int, role: Permission):
+    """사용자의 역할을 변경하고 권한 캐시를 무효화합니다."""
+    result = await db.execute(update(user_model.User).where(user_model.User.id == user_id).values(role=role))
+    await db.commit()
+
+    permission_cache.invalidate(user_id)
+    return result.rowcount
@@ -0,0 +1,123 @@
+"""
+스키마 생성 / 마이그레이션
+
+스키마 버전은 SQLite의 PRAGMA user_version에 기록합니다.
+`python manage.py migrate` 가 아직 적용되지 않은 단계를 순서대로 실행하고,
+앱은 시작할 때 버전만 확인하므로 워커마다 DDL을 검사하거나 같은 파일에서 경쟁하지 않습니다.
+
+새 단계는 MIGRATIONS 끝에 (버전, 설명, 함수) 로 추가합니다.
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from db.session import Base
+from db.models import user_model, psych_model
+
+
+def _table_columns(connection: Connection, table: str):
+    return {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+
+def _add_column(connection: Connection, table: str, column: str, ddl: str):
+    if column not in _table_columns(connection, table):
+        connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def _initial_schema(connection: Connection):
+    """
+        전체 스키마를 만듭니다.
+        버전 기록 이전(import 시 create_all)에 만들어진 데이터베이스는 없는 테이블만 생기므로,
+        이후 추가된 컬럼 / 인덱스를 보충하고 검색 색인을 채웁니다.
+    """
+
+    Base.metadata.create_all(bind=connection)
+
+    _add_column(connection, psych_model.PsychArticle.__tablename__, "content_version", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(connection, user_model.User.__tablename__, "role", f"VARCHAR(9) NOT NULL DEFAULT '{user_model.user_schema.Permission.USER.name}'")
+    _add_column(connection, user_model.JwtToken.__tablename__, "expires_at", "DATETIME")
+
+    # create_all은 이미 있는 테이블의 인덱스를 만들지 않음
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+    articles = psych_model.PsychArticle.__tablename__
+    if not connection.execute(text(f"SELECT 1 FROM {psych_model.PSYCH_ARTICLES_FTS} LIMIT 1")).first():
+        connection.execute(text(
+            f"INSERT INTO {psych_model.PSYCH_ARTICLES_FTS} (rowid, title, description) "
+            f"SELECT id, title, coalesce(description, '') FROM {articles}"
+        ))
+
+
+def _result_score_ranges(connection: Connection):
+    """결과마다 점수 구간의 하한(min_score)을 추가합니다. 기존 결과는 구간이 없으므로 채점에 쓰이지 않습니다."""
+
+    results = psych_model.PsychArticleResult.__table__
+    _add_column(connection, results.name, "min_score", "INTEGER")
+
+    for index in results.indexes:
+        index.create(connection, checkfirst=True)
+
+
+def _tournament_tables(connection: Connection):
+    """토너먼트 플레이 기록과 후보별 전적 / 레이팅 테이블을 만듭니다."""
+
+    Base.metadata.create_all(bind=connection, tables=[
+        psych_model.PsychTournamentPlay.__table__,
+        psych_model.PsychTournamentStat.__table__,
+    ])
+
+
+def _rate_limit_buckets(connection: Connection):
+    """워커 사이에 공유하는 요청 제한 버킷 테이블을 만듭니다."""
+
+    Base.metadata.create_all(bind=connection, tables=[user_model.RateLimitBucket.__table__])
+
+
+MIGRATIONS = [
+    (1, "initial schema", _initial_schema),
+    (2, "result score ranges", _result_score_ranges),
+    (3, "tournament tables", _tournament_tables),
+    (4, "rate limit buckets", _rate_limit_buckets),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection: Connection):
+    return connection.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def migrate(engine):
+    """
+        적용되지 않은 마이그레이션을 순서대로 실행합니다.
+        :return: 적용된 (버전, 설명) 목록
+    """
+
+    applied = []
+
+    with engine.begin() as connection:
+        current = get_schema_version(connection)
+
+        for version, description, upgrade in MIGRATIONS:
+            if version <= current:
+                continue
+
+            upgrade(connection)
+            connection.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+            applied.append((version, description))
+
+    return applied
+
+
+async def check_schema_version(async_engine):
+    """앱 시작 시 호출합니다. PRAGMA 한 번으로 스키마가 최신인지 확인하고, 아니면 시작을 중단합니다."""
+
+    async with async_engine.connect() as connection:
+        current = (await connection.exec_driver_sql("PRAGMA user_version")).scalar()
+
+    if current < SCHEMA_VERSION:
+        raise RuntimeError(f"Database schema is at version {current}, expected {SCHEMA_VERSION}. Run `python manage.py migrate` first.")
+
+    if current > SCHEMA_VERSION:
+        print(f"Warning: database schema version {current} is newer than this build ({SCHEMA_VERSION})")
@@ -1,5 +1,6 @@
 from db.session import Base
-from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, BigInteger, SmallInteger, DateTime, Text, Enum
+from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, BigInteger, SmallInteger, DateTime, Text, Enum, Index, Float
+from sqlalchemy import event, DDL
 from sqlalchemy.orm import relationship
 from db.schemas import psychs_schma
 # from sqlalchemy.dialects.postgresql import ENUM
@@ -21,14 +22,20 @@ class PsychArticle(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.now(timezone.utc))
     updated_at = Column(DateTime)
     view_count = Column(Integer, nullable=False, default=0)
+    content_version = Column(Integer, nullable=False, default=0) # 본문/질문이 바뀔 때마다 증가 (응답 캐시 키)
 
     author_id = Column(Integer, ForeignKey('users.id'))
 
     author = relationship("User", back_populates="articles")
     questions = relationship("PsychArticleQuestions", back_populates="article")
     results = relationship("PsychArticleResult", back_populates="article")
+    submissions = relationship("PsychArticleSubmission", back_populates="article")
     password = relationship("PsychArticlePassword", back_populates="article", uselist=False) # 일대일 관계 설정
 
+    __table_args__ = (
+        Index("ix_psych_articles_created_at_id", "created_at", "id"), # 최신순 커서 페이지네이션용 복합 인덱스
+    )
+
 
 class PsychArticleQuestions(Base):
     __tablename__ = "psych_article_questions"
@@ -70,19 +77,85 @@ class PsychArticleAnswer(Base):
     
     question = relationship("PsychArticleQuestions", back_populates="answers")
 
+class PsychArticleSubmission(Base):
+    __tablename__ = "psych_article_submissions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    article_id = Column(Integer, ForeignKey('psych_articles.id'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=True) # 비로그인 제출은 None
+    created_at = Column(DateTime, nullable=False)
+
+    article = relationship("PsychArticle", back_populates="submissions")
+    selections = relationship("PsychArticleSelection", back_populates="submission", cascade="all, delete-orphan")
+
+
+class PsychArticleSelection(Base):
+    __tablename__ = "psych_article_selections"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    submission_id = Column(Integer, ForeignKey('psych_article_submissions.id'), nullable=False, index=True)
+    article_id = Column(Integer, ForeignKey('psych_articles.id'), nullable=False, index=True)
+    question_id = Column(Integer, ForeignKey('psych_article_questions.id'), nullable=False)
+    answer_id = Column(Integer, ForeignKey('psych_article_answers.id'), nullable=False)
+
+    submission = relationship("PsychArticleSubmission", back_populates="selections")
+
+
+class PsychArticleAnswerCount(Base):
+    """답변별 선택 횟수. 제출과 같은 트랜잭션에서 증가시켜 통계 조회 시 집계 쿼리가 필요 없도록 합니다."""
+    __tablename__ = "psych_article_answer_counts"
+
+    answer_id = Column(Integer, ForeignKey('psych_article_answers.id'), primary_key=True)
+    article_id = Column(Integer, ForeignKey('psych_articles.id'), nullable=False, index=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
 class PsychArticleResult(Base):
     __tablename__ = "psych_article_results"
 
     id = Column(Integer, primary_key=True)
     title = Column(Text, nullable=False)
     description = Column(Text)
+    min_score = Column(Integer) # 총점이 이 값 이상이면 이 결과 (다음 결과의 min_score 미만까지)
 
-    article_id = Column(Integer, ForeignKey('psych_articles.id'))
+    article_id = Column(Integer, ForeignKey('psych_articles.id'), index=True)
 
     article = relationship("PsychArticle", back_populates="results")
 
 
 
+class PsychTournamentPlay(Base):
+    """끝난 토너먼트 대진표 하나. bracket_id가 유일하므로 같은 대진표를 두 번 집계하지 않습니다."""
+    __tablename__ = "psych_tournament_plays"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    bracket_id = Column(String(32), nullable=False, unique=True)
+    article_id = Column(Integer, ForeignKey('psych_articles.id'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=True) # 비로그인 플레이는 None
+    champion_id = Column(Integer, ForeignKey('psych_article_questions.id'), nullable=False)
+    size = Column(Integer, nullable=False)
+    created_at = Column(DateTime, nullable=False)
+
+
+class PsychTournamentStat(Base):
+    """
+        후보(질문)별 누적 전적과 Elo 레이팅.
+        대진표가 끝날 때 같은 트랜잭션에서 증가시키므로 순위 조회 시 전체 재계산이 필요 없습니다.
+    """
+    __tablename__ = "psych_tournament_stats"
+
+    question_id = Column(Integer, ForeignKey('psych_article_questions.id'), primary_key=True)
+    article_id = Column(Integer, ForeignKey('psych_articles.id'), nullable=False)
+    matches = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    champions = Column(Integer, nullable=False, default=0) # 우승 횟수
+    rating = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_psych_tournament_stats_article_rating", "article_id", "rating"), # 레이팅 순위 조회용
+    )
+
+
 class PsychArticlePassword(Base):
     __tablename__ = "psych_article_passwords"
 
@@ -91,4 +164,12 @@ class PsychArticlePassword(Base):
 
     article_id = Column(Integer, ForeignKey('psych_articles.id'))
 
-    article = relationship("PsychArticle", back_populates="password")
\ No newline at end of file
+    article = relationship("PsychArticle", back_populates="password")
+
+
+# 게시글 제목/설명 전문 검색용 FTS5 가상 테이블 (rowid = psych_articles.id)
+# psychs_create.create_article / psychs_update.update_article에서 함께 갱신합니다.
+PSYCH_ARTICLES_FTS = "psych_articles_fts"
+PSYCH_ARTICLES_FTS_DDL = f"CREATE VIRTUAL TABLE IF NOT EXISTS {PSYCH_ARTICLES_FTS} USING fts5(title, description, tokenize='unicode61')"
+
+event.listen(Base.metadata, "after_create", DDL(PSYCH_ARTICLES_FTS_DDL).execute_if(dialect="sqlite"))
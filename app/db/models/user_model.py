@@ -1,7 +1,8 @@
 from db.session import Base
-from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, BigInteger, SmallInteger, DateTime
+from sqlalchemy import Boolean, Column, Integer, String, ForeignKey, BigInteger, SmallInteger, DateTime, Enum, Float
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import ENUM
+from db.schemas import user_schema
 
 from datetime import datetime, timezone
 
@@ -15,6 +16,7 @@ class User(Base):
     nickname = Column(String(50), unique=True, nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.now(timezone.utc))
     last_login = Column(DateTime)
+    role = Column(Enum(user_schema.Permission), nullable=False, default=user_schema.Permission.USER)
 
     articles = relationship("PsychArticle", back_populates="author")
     tokens = relationship("JwtToken", back_populates="user")
@@ -34,7 +36,18 @@ class JwtToken(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     access_token = Column(String(255), nullable=False, index=True)
-    refresh_token = Column(String(255), nullable=False)
+    refresh_token = Column(String(255), nullable=False, index=True)
     public_ip = Column(String(50), nullable=False)
+    expires_at = Column(DateTime, index=True) # 리프레시 토큰 만료 시각 (이후 행은 정리 대상)
 
-    user = relationship("User", back_populates="tokens")
\ No newline at end of file
+    user = relationship("User", back_populates="tokens")
+
+
+class RateLimitBucket(Base):
+    """요청 제한 토큰 버킷 (RateLimitBackend=sqlite 일 때 워커 사이에 공유). 시각은 유닉스 초"""
+    __tablename__ = "rate_limit_buckets"
+
+    key = Column(String(255), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)
+    full_at = Column(Float, nullable=False, index=True) # 이 시각이 지나면 가득 찬 버킷이므로 삭제 가능
@@ -39,6 +39,17 @@ class PsychArticleQuestion(BaseModel):
     attachment: Optional[PsychArticleQuestionAttachment] = None
     answers: List[PsychArticleAnswer]
 
+class PsychArticleAnswerResponse(BaseModel):
+    id: int # 제출 시 보내는 답변 ID
+    answer: str
+
+class PsychArticleQuestionResponse(BaseModel):
+    index: int
+    question: str
+    description: Optional[str]
+    attachment: Optional[PsychArticleQuestionAttachment] = None
+    answers: List[PsychArticleAnswerResponse] # 점수는 결과를 드러내므로 응답에 포함하지 않음
+
 class PsychArticleQuestionStatistic(BaseModel):
     index: int
     question: str
@@ -49,9 +60,43 @@ class PsychArticleQuestionStatistic(BaseModel):
 class PsychArticleQuestions(BaseModel):
     questions: List[PsychArticleQuestion] = Field(default_factory=list)
 
+class PsychArticleQuestionsResponse(BaseModel):
+    questions: List[PsychArticleQuestionResponse] = Field(default_factory=list)
+
 class PsychArticleQuestionStatistics(BaseModel):
     questions: List[PsychArticleQuestionStatistic] = Field(default_factory=list)
 
+class PsychArticleSubmissionCreate(BaseModel):
+    answers: List[int] = Field(default_factory=list) # 선택한 답변 ID 목록 (질문당 하나)
+
+class PsychArticleResultCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    min_score: int # 총점이 이 값 이상이면 이 결과 (다음 결과의 min_score 미만까지)
+
+class PsychArticleResults(BaseModel):
+    results: List[PsychArticleResultCreate] = Field(default_factory=list)
+
+class PsychArticleResult(BaseModel):
+    id: int
+    title: str
+    description: Optional[str] = None
+
+class PsychArticleSubmissionResponse(BaseModel):
+    detail: int # 제출 ID
+    score: int
+    result: Optional[PsychArticleResult] = None
+
+class PsychArticleScoreBatch(BaseModel):
+    submissions: List[List[int]] = Field(default_factory=list, max_length=10000) # 제출마다 선택한 답변 ID 목록 (모든 질문에 하나씩)
+
+class PsychArticleScore(BaseModel):
+    score: int
+    result_id: Optional[int] = None
+
+class PsychArticleScores(BaseModel):
+    scores: List[PsychArticleScore] = Field(default_factory=list)
+
 class PsychArticleCreate(PsychArticleBase):
     article_visibility : PsychVisibility
     password : Optional[str] = None
@@ -77,3 +122,36 @@ class PsychArticleResponse(PsychArticleBase):
 
 class PsychArticlesResponse(BaseModel):
     posts: List[PsychArticleResponse] = Field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+class PsychTournamentCandidate(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    attachment: Optional[PsychArticleQuestionAttachment] = None
+
+class PsychTournamentStart(BaseModel):
+    size: int = 16 # 2의 거듭제곱으로 내림 (후보 수 이하)
+
+class PsychTournamentRoundSubmit(BaseModel):
+    bracket: str
+    winners: List[int] = Field(default_factory=list) # 경기 순서대로 승자 ID
+
+class PsychTournamentRound(BaseModel):
+    bracket: Optional[str] = None # 끝난 대진표는 None
+    size: int # 이번 라운드에 남은 후보 수 (16강 = 16)
+    matches: List[List[PsychTournamentCandidate]] = Field(default_factory=list)
+    champion: Optional[PsychTournamentCandidate] = None
+
+class PsychTournamentRanking(PsychTournamentCandidate):
+    rank: int
+    rating: float
+    matches: int
+    wins: int
+    win_rate: float
+    champions: int
+
+class PsychTournamentRankings(BaseModel):
+    plays: int
+    rankings: List[PsychTournamentRanking] = Field(default_factory=list)
@@ -1,6 +1,12 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+from enum import Enum
+
+class Permission(Enum):
+    ADMIN = "*"
+    MODERATOR = "mod"
+    USER = "-"
 
 class UserBase(BaseModel):
     username: str
@@ -23,6 +29,12 @@ class User(UserBase):
         from_attributes = True
 
 
+class UserSummary(BaseModel):
+    id: int
+    nickname: str
+    profile_url: Optional[str] = None
+
+
 class JwtToken(BaseModel):
     access_token: str
     refresh_token: str
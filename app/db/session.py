@@ -1,15 +1,76 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 
-DATABASE_URL = "sqlite:///./sql_app.db"
+from core.config import get_settings
 
-engine = create_engine(DATABASE_URL)
-connection = engine.connect()
-connection.close()
+settings = get_settings()
+
+DATABASE_URL = settings.database_url
+ASYNC_DATABASE_URL = settings.async_database_url
+
+# SQLite 저장 프로필 - 연결마다 적용할 PRAGMA
+#   default : SQLite 기본값 (rollback journal, synchronous=FULL). 쓰기 중에는 모든 읽기가 막힙니다.
+#   wal     : WAL 저널링으로 읽기와 쓰기가 서로를 막지 않으며, synchronous=NORMAL로 커밋마다 fsync하지 않습니다.
+#             (전원 장애 시 마지막 커밋이 유실될 수 있으나 DB가 손상되지는 않습니다.)
+SQLITE_PROFILES = {
+    "default": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+    },
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "cache_size": -settings.sqlite_cache_size_kb, # 음수는 KiB 단위
+        "mmap_size": settings.sqlite_mmap_size,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def apply_sqlite_profile(engine, profile: str):
+    """엔진이 새 연결을 만들 때마다 프로필의 PRAGMA를 실행합니다. SQLite가 아니면 아무것도 하지 않습니다."""
+
+    if engine.dialect.name != "sqlite":
+        return
+
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    pragmas = SQLITE_PROFILES[profile]
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+# 연결 풀 설정 (동기 / 비동기 엔진 공통)
+POOL_OPTIONS = {
+    "pool_size": settings.database_pool_size,
+    "max_overflow": settings.database_max_overflow,
+    "pool_timeout": settings.database_pool_timeout,
+    "pool_recycle": settings.database_pool_recycle,
+}
+
+# 동기 엔진 (스키마 생성, 스크립트용)
+engine = create_engine(DATABASE_URL, **POOL_OPTIONS)
+apply_sqlite_profile(engine, settings.sqlite_profile)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 비동기 엔진 (API 핸들러용) - 쿼리가 이벤트 루프를 막지 않도록 합니다.
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **POOL_OPTIONS)
+apply_sqlite_profile(async_engine.sync_engine, settings.sqlite_profile)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -18,3 +79,7 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
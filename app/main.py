@@ -1,21 +1,64 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from contextlib import asynccontextmanager
 from api import router as api_router
-from db.session import SessionLocal, engine
-from db.models import user_model, psych_model
+from db.session import async_engine
+from db.migrations import check_schema_version
+from utils import hash
+from utils.view_counter import view_counter
+from utils.token_sweeper import token_sweeper
+from utils.trending import trending_feed
+from utils.rate_limit import rate_limiter
+from utils.response_cache import response_cache
+from utils.score_table import score_tables
+from utils.metrics import MetricsMiddleware, instrument_engine, request_metrics
+from utils.query_guard import QueryGuardMiddleware, query_guard
 
 import uvicorn
 
-user_model.Base.metadata.create_all(bind=engine)
-psych_model.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 스키마 생성은 `python manage.py migrate` 에서 하고, 시작 시에는 버전만 확인
+    await check_schema_version(async_engine)
 
-app = FastAPI()
+    view_counter.start()
+    token_sweeper.start()
+    # 최근 제출 기록으로 인기 목록을 채운 뒤 주기적으로 갱신
+    await trending_feed.start()
+    yield
+    await trending_feed.stop()
+    await token_sweeper.stop()
+    # 대기 중인 조회수 기록
+    await view_counter.stop()
+    # 해시 프로세스 풀 정리
+    hash.hash_pool.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+# 요청 / SQL 메트릭
+instrument_engine(async_engine.sync_engine, request_metrics)
+request_metrics.register_collector("hash_pool", hash.get_metrics)
+request_metrics.register_collector("rate_limit", rate_limiter.get_metrics)
+request_metrics.register_collector("response_cache", response_cache.get_metrics)
+request_metrics.register_collector("score_tables", score_tables.get_metrics)
+request_metrics.register_collector("view_counter", view_counter.get_metrics)
+request_metrics.register_collector("token_sweeper", token_sweeper.get_metrics)
+request_metrics.register_collector("trending", trending_feed.get_metrics)
+app.add_middleware(MetricsMiddleware, metrics=request_metrics)
+
+# N+1 쿼리 감지 (QueryGuardMode=log|raise 일 때만 요청마다 검사, 이벤트는 테스트 픽스처용으로 항상 등록)
+query_guard.install(async_engine.sync_engine)
+if query_guard.enabled:
+    app.add_middleware(QueryGuardMiddleware, guard=query_guard)
 
 app.include_router(api_router)
 
 
-if __name__ == "__main__":
-    # For Production Build
-    # uvicorn.run("main:app", host="0.0.0.0", port=8000)
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
+
 
-    # For Development Build
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+if __name__ == "__main__":
+    # For Development Build (운영 환경은 serve.py)
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
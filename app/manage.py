@@ -0,0 +1,127 @@
+"""
+관리용 명령어 모음
+
+사용법 (app 디렉터리에서 실행):
+    python manage.py migrate [--check]
+    python manage.py rebuild-answer-counts [--article-id ID]
+    python manage.py set-role --user-id ID --role {admin,moderator,user}
+    python manage.py compact-tokens [--batch-size N] [--include-legacy] [--vacuum]
+    python manage.py rebuild-search-index
+    python manage.py calibrate-hash [--target-ms MS] [--concurrency N] [--memory-budget-mb MB]
+"""
+import argparse
+import asyncio
+import os
+
+from db.session import AsyncSessionLocal, engine
+from db import migrations
+from db.crud.psychs import psychs_update, psychs_search
+from db.crud.user import user_update
+from db.schemas.user_schema import Permission
+from core.config import get_settings
+from utils import hash
+from utils.token_sweeper import TokenSweeper
+
+
+async def migrate(args):
+    if args.check:
+        with engine.connect() as connection:
+            current = migrations.get_schema_version(connection)
+        print(f"Schema version {current} (latest {migrations.SCHEMA_VERSION})")
+        return
+
+    applied = migrations.migrate(engine)
+    for version, description in applied:
+        print(f"Applied {version}: {description}")
+    print(f"Schema is at version {migrations.SCHEMA_VERSION}")
+
+
+async def rebuild_answer_counts(args):
+    async with AsyncSessionLocal() as db:
+        rows = await psychs_update.rebuild_answer_counts(db=db, article_id=args.article_id)
+    print(f"Rebuilt {rows} answer counters")
+
+
+async def set_role(args):
+    async with AsyncSessionLocal() as db:
+        rows = await user_update.update_user_role(db=db, user_id=args.user_id, role=Permission[args.role.upper()])
+
+    if not rows:
+        print(f"User {args.user_id} not found")
+    else:
+        print(f"User {args.user_id} is now {args.role}")
+
+
+async def compact_tokens(args):
+    sweeper = TokenSweeper(batch_size=args.batch_size)
+    rows = await sweeper.sweep(include_legacy=args.include_legacy)
+    print(f"Reclaimed {rows} expired token rows")
+
+    if args.vacuum:
+        # 삭제로 비워진 페이지를 파일에서 회수 (트랜잭션 밖에서 실행해야 함)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.exec_driver_sql("VACUUM")
+        print("Database vacuumed")
+
+
+async def rebuild_search_index(args):
+    async with AsyncSessionLocal() as db:
+        rows = await psychs_search.rebuild_index(db=db)
+    print(f"Indexed {rows} articles")
+
+
+async def calibrate_hash(args):
+    print(f"Calibrating Argon2 for {args.target_ms}ms at {args.concurrency} concurrent hashes within {args.memory_budget_mb}MB ...")
+    memory_cost_kb, time_cost, seconds = hash.calibrate(
+        target_seconds=args.target_ms / 1000,
+        concurrency=args.concurrency,
+        memory_budget_mb=args.memory_budget_mb,
+        parallelism=args.parallelism
+    )
+    print(f"Measured {seconds * 1000:.0f}ms per hash")
+    print(f"Argon2MemoryCostKb={memory_cost_kb}")
+    print(f"Argon2TimeCost={time_cost}")
+    print(f"Argon2Parallelism={args.parallelism}")
+    print(f"HashMemoryBudgetMb={args.memory_budget_mb}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="take-one-minute management commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    parser_migrate = subparsers.add_parser("migrate", help="데이터베이스 스키마를 만들거나 최신 버전으로 올립니다.")
+    parser_migrate.add_argument("--check", action="store_true", help="적용하지 않고 현재 버전만 출력합니다.")
+    parser_migrate.set_defaults(func=migrate)
+
+    parser_counts = subparsers.add_parser("rebuild-answer-counts", help="제출 기록으로부터 답변별 선택 횟수를 다시 계산합니다.")
+    parser_counts.add_argument("--article-id", type=int, default=None)
+    parser_counts.set_defaults(func=rebuild_answer_counts)
+
+    parser_role = subparsers.add_parser("set-role", help="사용자의 역할(권한)을 변경합니다.")
+    parser_role.add_argument("--user-id", type=int, required=True)
+    parser_role.add_argument("--role", choices=[permission.name.lower() for permission in Permission], required=True)
+    parser_role.set_defaults(func=set_role)
+
+    parser_tokens = subparsers.add_parser("compact-tokens", help="만료된 JWT 토큰 행을 정리합니다.")
+    parser_tokens.add_argument("--batch-size", type=int, default=500)
+    parser_tokens.add_argument("--include-legacy", action="store_true", help="만료 시각이 기록되지 않은 이전 행도 삭제합니다.")
+    parser_tokens.add_argument("--vacuum", action="store_true", help="정리 후 VACUUM으로 파일 크기를 줄입니다.")
+    parser_tokens.set_defaults(func=compact_tokens)
+
+    parser_search = subparsers.add_parser("rebuild-search-index", help="게시글 전문 검색 색인을 다시 만듭니다.")
+    parser_search.set_defaults(func=rebuild_search_index)
+
+    settings = get_settings()
+    parser_hash = subparsers.add_parser("calibrate-hash", help="목표 지연시간 / 동시 실행 수에 맞는 Argon2 파라미터를 측정해 출력합니다.")
+    parser_hash.add_argument("--target-ms", type=float, default=500, help="해시 하나의 목표 시간 (동시 실행 중)")
+    parser_hash.add_argument("--concurrency", type=int, default=os.cpu_count() or 1, help="동시에 실행할 해시 수")
+    parser_hash.add_argument("--memory-budget-mb", type=int, default=settings.hash_memory_budget_mb, help="동시 해시 전체가 쓸 메모리")
+    parser_hash.add_argument("--parallelism", type=int, default=settings.argon2_parallelism)
+    parser_hash.set_defaults(func=calibrate_hash)
+
+    args = parser.parse_args()
+    asyncio.run(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+운영용 서버 실행
+
+gunicorn 마스터가 uvicorn 워커 프로세스 여러 개를 관리합니다. (개발용 자동 재시작 서버는 `python main.py`)
+    - WebWorkers 개의 워커, WebLoop / WebHttp 로 이벤트 루프(uvloop)와 HTTP 파서(httptools) 선택
+    - WebPreload: 포크 전에 마스터에서 앱을 import 해 워커 시작 시간과 메모리(copy-on-write)를 줄임
+    - SIGTERM: 새 연결을 받지 않고 처리 중인 요청을 WebGracefulTimeout 초까지 기다린 뒤 종료
+    - WebMaxRequests: 워커가 N개의 요청을 처리하면 새 워커로 교체 (WebMaxRequestsJitter 로 동시 재시작 방지)
+    - WebForwardedAllowIps: 이 주소에서 온 연결만 X-Forwarded-For / X-Forwarded-Proto 를 반영해 request.client를 실제 클라이언트로 바꿈
+    - 시작 / 종료 훅(lifespan: 조회수 버퍼, 토큰 정리, 해시 풀)은 워커마다 한 번씩 실행
+    - 해시 풀의 메모리 예산(HashMemoryBudgetMb)과 HashMaxWorkers는 호스트 전체 기준이며 워커 수로 나눠 적용
+
+사용법 (app 디렉터리에서 실행):
+    python serve.py
+"""
+from gunicorn.app.base import BaseApplication
+from uvicorn_worker import UvicornWorker
+from core.config import get_settings
+
+settings = get_settings()
+
+
+class ProductionWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": settings.web_loop,
+        "http": settings.web_http,
+        "lifespan": "on",
+        "proxy_headers": True,
+        "timeout_graceful_shutdown": settings.web_graceful_timeout,
+    }
+
+
+def post_fork(server, worker):
+    # 프리로드된 마스터의 연결 풀을 워커가 물려받아 같은 SQLite 연결을 공유하지 않도록 버립니다.
+    # (close=False: 부모 프로세스의 연결은 닫지 않고 참조만 끊음)
+    from db.session import engine, async_engine
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+
+    # 워커마다 해시 풀이 따로 있으므로 호스트 전체 예산을 워커 수로 나눔
+    from utils.hash import hash_pool
+
+    hash_pool.set_processes(server.cfg.workers)
+
+
+def worker_exit(server, worker):
+    server.log.info("Worker exited (pid: %s)", worker.pid)
+
+
+class ProductionServer(BaseApplication):
+    def __init__(self, options: dict):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from main import app
+        return app
+
+
+def main():
+    options = {
+        "bind": f"{settings.web_host}:{settings.web_port}",
+        "workers": settings.web_workers,
+        "worker_class": ProductionWorker,
+        "preload_app": settings.web_preload,
+        # uvicorn의 종료 대기 후 lifespan 종료 훅(조회수 기록 등)이 끝날 여유를 둡니다.
+        "graceful_timeout": settings.web_graceful_timeout + 5,
+        "timeout": settings.web_timeout,
+        "keepalive": settings.web_keepalive,
+        "forwarded_allow_ips": settings.web_forwarded_allow_ips,
+        "max_requests": settings.web_max_requests,
+        "max_requests_jitter": settings.web_max_requests_jitter,
+        "post_fork": post_fork,
+        "worker_exit": worker_exit,
+        "accesslog": "-",
+        "errorlog": "-",
+    }
+    ProductionServer(options).run()
+
+
+if __name__ == "__main__":
+    main()
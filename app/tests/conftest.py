@@ -0,0 +1,42 @@
+"""
+테스트 설정
+
+설정은 모듈을 import할 때 환경 변수에서 읽으므로, 앱 모듈을 불러오기 전에 임시 데이터베이스를 지정하고 스키마를 만듭니다.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_database_dir = tempfile.mkdtemp()
+os.environ["DatabaseUrl"] = f"sqlite:///{_database_dir}/test.db"
+os.environ["AsyncDatabaseUrl"] = f"sqlite+aiosqlite:///{_database_dir}/test.db"
+os.environ.setdefault("RateLimitBackend", "off")
+
+import pytest
+from fastapi.testclient import TestClient
+from db.session import engine, SessionLocal
+from db.migrations import migrate
+
+# query_budget 픽스처
+pytest_plugins = ["utils.query_guard"]
+
+migrate(engine)
+
+
+@pytest.fixture(scope="session")
+def client():
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.fixture
+def db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
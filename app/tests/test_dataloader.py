@@ -0,0 +1,64 @@
+from utils.dataloader import DataLoader
+
+import asyncio
+import pytest
+
+
+def test_keys_in_one_tick_are_batched():
+    batches = []
+
+    async def batch_load(keys):
+        batches.append(list(keys))
+        return {key: key * 10 for key in keys if key != 3}
+
+    async def run():
+        loader = DataLoader(batch_load)
+        values = await loader.load_many([1, 2, 3, 1])
+        again = await loader.load(2)
+        return values, again
+
+    assert asyncio.run(run()) == ([10, 20, None, 10], 20)
+    assert batches == [[1, 2, 3]]
+
+
+def test_failed_batch_reaches_waiting_futures_and_is_retried():
+    calls = []
+
+    async def batch_load(keys):
+        calls.append(list(keys))
+        if len(calls) == 1:
+            raise RuntimeError("database is locked")
+        return {key: key for key in keys}
+
+    async def run():
+        loader = DataLoader(batch_load)
+        with pytest.raises(RuntimeError, match="database is locked"):
+            await loader.load_many([1, 2])
+        return await loader.load_many([1, 2])
+
+    assert asyncio.run(run()) == [1, 2]
+    assert calls == [[1, 2], [1, 2]]
+
+
+def test_cancelled_batch_does_not_leave_futures_pending():
+    started = []
+
+    async def batch_load(keys):
+        started.append(list(keys))
+        await asyncio.sleep(3600)
+
+    async def run():
+        loader = DataLoader(batch_load)
+        future = loader.load(1)
+        await asyncio.sleep(0)
+
+        for task in list(loader._dispatch_tasks):
+            task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(future, timeout=1)
+
+        return loader._dispatch_tasks
+
+    assert asyncio.run(run()) == set()
+    assert started == [[1]]
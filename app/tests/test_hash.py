@@ -0,0 +1,46 @@
+from utils.hash import HashPool
+
+import asyncio
+import os
+import pytest
+
+
+@pytest.mark.parametrize("ticks", [0, 1, 2])
+def test_cancel_while_admitted_returns_the_slot(ticks):
+    async def run():
+        pool = HashPool(memory_budget_mb=64, memory_cost_kb=19456, max_workers=1, queue_timeout=5)
+        semaphore = pool._get_semaphore()
+        await semaphore.acquire() # 슬롯을 모두 사용 중
+
+        task = asyncio.ensure_future(pool.run(os.getpid))
+        await asyncio.sleep(0.01)
+
+        # 슬롯이 비는 것과 요청 취소가 겹침
+        semaphore.release()
+        for _ in range(ticks):
+            await asyncio.sleep(0)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        pool.shutdown()
+        return semaphore._value, pool.metrics.waiting, pool.metrics.in_flight
+
+    assert asyncio.run(run()) == (1, 0, 0)
+
+
+def test_pool_runs_in_forkserver_children():
+    async def run():
+        pool = HashPool(memory_budget_mb=64, memory_cost_kb=19456, max_workers=1)
+        try:
+            child_pid = await pool.run(os.getpid)
+            return child_pid, pool._get_executor()._mp_context.get_start_method()
+        finally:
+            pool.shutdown()
+
+    child_pid, start_method = asyncio.run(run())
+
+    assert child_pid != os.getpid()
+    assert start_method == "forkserver"
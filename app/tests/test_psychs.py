@@ -0,0 +1,80 @@
+from db.models import psych_model, user_model
+from db.schemas import psychs_schma
+from utils import jwt
+
+import pytest
+
+
+@pytest.fixture
+def author(client, db):
+    user = db.query(user_model.User).filter_by(username="author").first()
+    if user is None:
+        user = user_model.User(username="author", email="author@example.com", nickname="author", hashed_password="x")
+        db.add(user)
+        db.commit()
+
+    token = client.portal.call(jwt.create_access_token, "access", user.id)
+    return user.id, {"Authorization": f"Bearer {token}"}
+
+
+def seed_test(db, author_id: int, questions: int):
+    article = psych_model.PsychArticle(title=f"{questions} questions", description="d", type=psychs_schma.PsychType.PSYCH, author_id=author_id)
+
+    for index in range(questions):
+        question = psych_model.PsychArticleQuestions(question=f"q{index}")
+        question.answers = [psych_model.PsychArticleAnswer(answer=answer, score=score) for score, answer in enumerate("abcd")]
+        question.attachments = [psych_model.PsychArticleQuestionAttachment(image=f"{index}.png")]
+        article.questions.append(question)
+
+    db.add(article)
+    db.commit()
+
+    return article.id
+
+
+def test_question_tree_statements_do_not_grow_with_questions(client, db, author, query_budget):
+    author_id, headers = author
+    statements = {}
+
+    for questions in (1, 10, 50):
+        article_id = seed_test(db, author_id, questions)
+
+        with query_budget() as test_log:
+            response = client.get(f"/psychs/psych/{article_id}")
+        assert response.status_code == 200
+        assert len(response.json()["questions"]) == questions
+
+        with query_budget() as statistics_log:
+            response = client.get(f"/psychs/psych/{article_id}/statistics", headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()["questions"]) == questions
+
+        statements[questions] = (test_log.statements, statistics_log.statements)
+
+    assert statements[1] == statements[10] == statements[50]
+
+
+def test_partial_submission_is_rejected_without_counting(client, db, author):
+    author_id, _ = author
+    article_id = seed_test(db, author_id, 2)
+
+    answer_ids = db.scalars(
+        psych_model.PsychArticleAnswer.__table__.select()
+        .with_only_columns(psych_model.PsychArticleAnswer.id)
+        .join(psych_model.PsychArticleQuestions)
+        .where(psych_model.PsychArticleQuestions.article_id == article_id)
+        .order_by(psych_model.PsychArticleAnswer.id)
+    ).all()
+
+    response = client.post(f"/psychs/psych/{article_id}/submit", json={"answers": [answer_ids[1]]})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Every question must be answered once"
+
+    assert db.query(psych_model.PsychArticleSubmission).filter_by(article_id=article_id).count() == 0
+    assert db.query(psych_model.PsychArticleSelection).filter_by(article_id=article_id).count() == 0
+    assert db.query(psych_model.PsychArticleAnswerCount).filter_by(article_id=article_id).count() == 0
+
+    response = client.post(f"/psychs/psych/{article_id}/submit", json={"answers": [answer_ids[1], answer_ids[4]]})
+    assert response.status_code == 201
+    assert response.json()["score"] == 1
+    assert db.query(psych_model.PsychArticleAnswerCount).filter_by(article_id=article_id).count() == 2
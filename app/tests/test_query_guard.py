@@ -0,0 +1,50 @@
+from sqlalchemy import select
+from db.session import AsyncSessionLocal
+from db.models import psych_model, user_model
+from db.schemas import psychs_schma
+from utils.query_guard import QueryBudgetExceeded
+
+import pytest
+
+
+def seed_articles(db, prefix: str, authors: int, articles: int):
+    for index in range(authors):
+        db.add(user_model.User(username=f"{prefix}{index}", email=f"{prefix}{index}@example.com", nickname=f"{prefix}{index}", hashed_password="x"))
+    db.flush()
+
+    author_ids = db.scalars(select(user_model.User.id).where(user_model.User.username.like(f"{prefix}%"))).all()
+    for index in range(articles):
+        db.add(psych_model.PsychArticle(
+            title=f"{prefix} article {index}",
+            description="d",
+            type=psychs_schma.PsychType.PSYCH,
+            author_id=author_ids[index % len(author_ids)]
+        ))
+    db.commit()
+
+    return author_ids
+
+
+def test_n_plus_one_loop_raises_with_location(client, db, query_budget):
+    author_ids = seed_articles(db, "loop", authors=5, articles=0)
+
+    async def load_authors_one_by_one():
+        async with AsyncSessionLocal() as session:
+            for author_id in author_ids:
+                await session.get(user_model.User, author_id)
+
+    with pytest.raises(QueryBudgetExceeded, match=r"repeated 3 times.*\(at .*test_query_guard\.py:\d+ in load_authors_one_by_one\)"):
+        with query_budget():
+            client.portal.call(load_authors_one_by_one)
+
+
+def test_articles_page_within_budget(client, db, query_budget):
+    seed_articles(db, "page", authors=5, articles=20)
+
+    # 작성자 프로필은 DataLoader로 한 번에 조회하므로 게시글 / 작성자 수와 무관
+    with query_budget(max_statements=2) as log:
+        response = client.get("/psychs/articles?limit=20")
+
+    assert response.status_code == 200
+    assert len({post["author_nickname"] for post in response.json()["posts"]}) == 5
+    assert log.statements > 0
@@ -0,0 +1,48 @@
+from db.models import user_model
+from utils import jwt
+
+import pytest
+
+
+@pytest.fixture
+def writer(client, db):
+    user = user_model.User(username="writer", email="writer@example.com", nickname="writer", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    token = client.portal.call(jwt.create_access_token, "access", user.id)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def create_article(client, headers, title: str, description: str):
+    response = client.post("/psychs/article", headers=headers, json={
+        "title": title, "description": description, "type": "psych", "article_visibility": "public"
+    })
+    assert response.status_code in (200, 201)
+
+
+def search_page(client, cursor=None):
+    params = {"q": "galaxy", "limit": 4, **({"cursor": cursor} if cursor else {})}
+    response = client.get("/psychs/search", params=params)
+    assert response.status_code == 200
+    body = response.json()
+    return [post["title"] for post in body["posts"]], body["next_cursor"]
+
+
+def test_search_pages_survive_index_changes(client, writer):
+    for index in range(12):
+        create_article(client, writer, f"quiz {index}", f"galaxy {'word ' * index}")
+
+    first, cursor = search_page(client)
+
+    # 기존 결과보다 점수가 높은(제목 일치) 게시글이 페이지 사이에 추가되어 전체 점수와 순위가 바뀜
+    for index in range(3):
+        create_article(client, writer, f"galaxy {index}", "new")
+
+    seen = list(first)
+    while cursor:
+        titles, cursor = search_page(client, cursor)
+        seen += titles
+
+    assert len(seen) == len(set(seen))
+    assert {f"quiz {index}" for index in range(12)} <= set(seen)
@@ -0,0 +1,41 @@
+from db.models import psych_model, user_model
+from db.schemas import psychs_schma
+from utils.view_counter import ViewCountBuffer
+
+import asyncio
+
+
+def test_cancelled_flush_keeps_pending_views(client, db):
+    user = user_model.User(username="viewer", email="viewer@example.com", nickname="viewer", hashed_password="x")
+    article = psych_model.PsychArticle(title="views", description="d", type=psychs_schma.PsychType.PSYCH, author=user)
+    db.add(article)
+    db.commit()
+
+    buffer = ViewCountBuffer(flush_interval=3600, flush_threshold=1000)
+
+    async def cancel_during_flush():
+        buffer.increment(article.id, 3)
+
+        flush = asyncio.ensure_future(buffer.flush())
+        await asyncio.sleep(0) # 증가분을 꺼내 UPDATE를 시작할 때까지 진행
+        in_flight = buffer.pending(article.id)
+
+        flush.cancel()
+        try:
+            await flush
+        except asyncio.CancelledError:
+            pass
+
+        restored = buffer.pending(article.id)
+        await buffer.stop()
+
+        return in_flight, restored
+
+    in_flight, restored = client.portal.call(cancel_during_flush)
+
+    assert in_flight == 3
+    assert restored == 3
+    assert buffer.pending(article.id) == 0
+
+    db.refresh(article)
+    assert article.view_count == 3
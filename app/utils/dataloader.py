@@ -0,0 +1,81 @@
+from functools import partial
+
+import asyncio
+
+
+class DataLoader():
+    """
+        요청 단위 배치 로더입니다.
+
+        같은 이벤트 루프 틱 안에서 요청된 키들을 모아 batch_load_fn 한 번으로 조회하고,
+        결과는 로더 인스턴스가 살아있는 동안(한 요청 동안) 캐시합니다.
+
+        :param batch_load_fn: 키 리스트를 받아 {키: 값} 딕셔너리를 반환하는 코루틴 함수.
+        조회되지 않은 키는 None으로 해석됩니다.
+    """
+
+    def __init__(self, batch_load_fn):
+        self._batch_load_fn = batch_load_fn
+        self._cache = {}
+        self._queue = []
+        self._dispatch_tasks = set() # 진행 중인 배치 조회 (이벤트 루프는 태스크를 약하게만 참조)
+
+    def load(self, key):
+        """키 하나를 요청합니다. 대기열에 쌓인 키들은 다음 틱에 한 번에 조회됩니다."""
+        if key in self._cache:
+            return self._cache[key]
+
+        future = asyncio.get_running_loop().create_future()
+        self._cache[key] = future
+        self._queue.append(key)
+
+        if len(self._queue) == 1:
+            task = asyncio.ensure_future(self._dispatch(self._queue))
+            task.add_done_callback(partial(self._dispatch_done, self._queue))
+            self._dispatch_tasks.add(task)
+
+        return future
+
+    async def load_many(self, keys):
+        """여러 키를 요청합니다. 이미 캐시된 키를 제외한 나머지를 한 번에 조회합니다."""
+        return await asyncio.gather(*[self.load(key) for key in keys])
+
+    def prime(self, key, value):
+        """이미 알고 있는 값을 캐시에 채워 넣습니다."""
+        if key not in self._cache:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(value)
+            self._cache[key] = future
+
+    async def _dispatch(self, keys):
+        # 이후에 요청된 키는 다음 배치로
+        self._queue = []
+
+        results = await self._batch_load_fn(keys)
+
+        for key in keys:
+            self._cache[key].set_result(results.get(key))
+
+    def _dispatch_done(self, keys, task):
+        """배치가 실패하거나 취소되면 아직 기다리는 future에 전달하고, 다음 load에서 다시 조회하도록 캐시에서 뺍니다."""
+        self._dispatch_tasks.discard(task)
+
+        if task.cancelled():
+            error = None
+        elif task.exception() is None:
+            return
+        else:
+            error = task.exception()
+
+        # 시작하기 전에 취소된 배치
+        if self._queue is keys:
+            self._queue = []
+
+        for key in keys:
+            future = self._cache.get(key)
+            if future is not None and not future.done():
+                del self._cache[key]
+                if error is None:
+                    future.cancel()
+                else:
+                    future.set_exception(error)
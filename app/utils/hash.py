@@ -1,19 +1,229 @@
 from passlib.context import CryptContext
+from passlib.hash import argon2
+from fastapi import HTTPException, status
+from concurrent.futures import ProcessPoolExecutor
+from core.config import get_settings
+
+import asyncio
+import multiprocessing
+import os
+import time
+
+settings = get_settings()
+
+# Argon2 파라미터는 설정에서 읽습니다. (`python manage.py calibrate-hash` 로 호스트에 맞는 값을 구할 수 있음)
+ARGON2_MEMORY_COST_KB = settings.argon2_memory_cost_kb
 
 # Argon2를 사용한 CryptContext 설정
+# 파라미터가 바뀌면 이전 파라미터로 저장된 해시는 needs_update()가 True가 되어 로그인 시 다시 해시됩니다.
 pwd_context = CryptContext(
     schemes=["argon2"],
     default="argon2",
-    argon2__memory_cost=512000,  # 메모리 사용량 설정 (512MB)
-    argon2__time_cost=2,         # 해시 생성에 필요한 시간 설정 (2초)
-    argon2__parallelism=2,       # 병렬 처리 단위 설정 
+    argon2__memory_cost=ARGON2_MEMORY_COST_KB,          # 메모리 사용량 (KB)
+    argon2__time_cost=settings.argon2_time_cost,        # 반복 횟수
+    argon2__parallelism=settings.argon2_parallelism,    # 병렬 처리 단위
     deprecated="auto"
 )
 
-def verify_hashed_text(plain_password: str, hashed_text: str):
-    """Verify the hashed text with the plain password."""
+
+class HashMetrics():
+    """해시 풀의 대기열 길이와 처리 시간을 집계합니다."""
+
+    def __init__(self):
+        self.waiting = 0          # 슬롯을 기다리는 요청 수 (queue depth)
+        self.in_flight = 0        # 현재 풀에서 실행 중인 해시 작업 수
+        self.completed = 0
+        self.rejected = 0         # 대기열 초과 또는 타임아웃으로 503 처리된 요청 수
+        self.hash_seconds_sum = 0.0
+        self.hash_seconds_max = 0.0
+        self.wait_seconds_sum = 0.0
+
+    def snapshot(self):
+        return {
+            "waiting": self.waiting,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "hash_seconds_sum": self.hash_seconds_sum,
+            "hash_seconds_max": self.hash_seconds_max,
+            "hash_seconds_avg": self.hash_seconds_sum / self.completed if self.completed else 0.0,
+            "wait_seconds_sum": self.wait_seconds_sum,
+        }
+
+
+class HashPool():
+    """
+        Argon2 연산 전용 프로세스 풀입니다.
+
+        해시 한 번에 memory_cost 만큼의 메모리를 사용하므로, 메모리 예산으로 동시 실행 수(슬롯)를 정하고
+        세마포어로 입장을 제한합니다. 슬롯을 얻지 못한 요청은 최대 queue_timeout 초까지 대기하며,
+        대기열이 가득 찼거나 시간이 초과되면 즉시 503을 반환합니다.
+
+        memory_budget_mb와 max_workers는 호스트 전체 기준입니다. gunicorn 워커마다 풀이 하나씩 있으므로
+        set_processes()로 워커 수를 알려 주면 워커당 예산으로 나눕니다. (워커당 최소 1슬롯)
+    """
+
+    def __init__(self, memory_budget_mb: int, memory_cost_kb: int, max_workers: int = None, max_queue: int = 32, queue_timeout: float = 5.0):
+        self.memory_budget_mb = memory_budget_mb
+        self.per_hash_mb = max(1, memory_cost_kb // 1024)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.metrics = HashMetrics()
+
+        self._executor = None
+        self._semaphore = None
+
+        self.set_processes(1)
+
+    def set_processes(self, processes: int):
+        """같은 호스트에서 예산을 나눠 쓰는 프로세스 수를 지정합니다. 풀을 처음 사용하기 전에 호출해야 합니다. (serve.py의 post_fork)"""
+
+        self.processes = max(1, processes)
+        slots = max(1, self.memory_budget_mb // self.processes // self.per_hash_mb)
+        self.slots = min(slots, max(1, self.max_workers // self.processes))
+
+    def _get_executor(self):
+        if self._executor is None:
+            # 풀은 스레드(aiosqlite 등)가 이미 도는 워커 안에서 만들어지므로 fork 대신 forkserver로 자식 프로세스를 띄움
+            # (포크 시점에 다른 스레드가 잡고 있던 락 때문에 자식이 멈추는 것을 방지, 서버는 이 모듈만 미리 import)
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload([__name__])
+            self._executor = ProcessPoolExecutor(max_workers=self.slots, mp_context=context)
+        return self._executor
+
+    def _get_semaphore(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.slots)
+        return self._semaphore
+
+    async def run(self, fn, *args):
+        metrics = self.metrics
+        semaphore = self._get_semaphore()
+
+        if semaphore.locked() and metrics.waiting >= self.max_queue:
+            metrics.rejected += 1
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server busy", headers={"Retry-After": "1"})
+
+        metrics.waiting += 1
+        wait_started = time.perf_counter()
+        acquire = asyncio.ensure_future(semaphore.acquire())
+        try:
+            await asyncio.wait_for(asyncio.shield(acquire), timeout=self.queue_timeout)
+        except BaseException as e:
+            # 시간 초과 / 요청 취소와 입장이 겹쳤으면 얻은 슬롯을 돌려주고, 아니면 대기를 취소
+            if acquire.done() and not acquire.cancelled() and acquire.exception() is None:
+                semaphore.release()
+            else:
+                acquire.cancel()
+
+            if isinstance(e, asyncio.TimeoutError):
+                metrics.rejected += 1
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server busy", headers={"Retry-After": "1"})
+            raise
+        finally:
+            metrics.waiting -= 1
+            metrics.wait_seconds_sum += time.perf_counter() - wait_started
+
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.in_flight -= 1
+            metrics.completed += 1
+            metrics.hash_seconds_sum += elapsed
+            metrics.hash_seconds_max = max(metrics.hash_seconds_max, elapsed)
+            semaphore.release()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+hash_pool = HashPool(
+    memory_budget_mb=settings.hash_memory_budget_mb,
+    memory_cost_kb=ARGON2_MEMORY_COST_KB,
+    max_workers=settings.hash_max_workers,
+    max_queue=settings.hash_max_queue,
+    queue_timeout=settings.hash_queue_timeout,
+)
+
+
+def _verify_hashed_text(plain_password: str, hashed_text: str):
     return pwd_context.verify(plain_password, hashed_text)
 
-def hash_text(plain_text: str):
-    """Hash the plain text."""
+def _hash_text(plain_text: str):
     return pwd_context.hash(plain_text)
+
+def _verify_and_update_hashed_text(plain_password: str, hashed_text: str):
+    # 검증과 재해시를 같은 워커에서 이어서 실행 (평문 비밀번호를 한 번만 넘김)
+    if not pwd_context.verify(plain_password, hashed_text):
+        return False, None
+
+    if pwd_context.needs_update(hashed_text):
+        return True, pwd_context.hash(plain_password)
+
+    return True, None
+
+async def verify_hashed_text(plain_password: str, hashed_text: str):
+    """Verify the hashed text with the plain password."""
+    return await hash_pool.run(_verify_hashed_text, plain_password, hashed_text)
+
+async def hash_text(plain_text: str):
+    """Hash the plain text."""
+    return await hash_pool.run(_hash_text, plain_text)
+
+async def verify_and_update_hashed_text(plain_password: str, hashed_text: str):
+    """
+    Verify the hashed text and re-hash it if it was made with outdated parameters.
+    Returns (valid, new_hash). new_hash is None unless the stored hash should be replaced.
+    """
+    return await hash_pool.run(_verify_and_update_hashed_text, plain_password, hashed_text)
+
+def _hash_once(memory_cost_kb: int, time_cost: int, parallelism: int):
+    handler = argon2.using(memory_cost=memory_cost_kb, rounds=time_cost, parallelism=parallelism)
+    started = time.perf_counter()
+    handler.hash("calibration")
+    return time.perf_counter() - started
+
+def measure_hash_seconds(memory_cost_kb: int, time_cost: int, parallelism: int, concurrency: int, executor: ProcessPoolExecutor):
+    """concurrency개의 해시를 동시에 실행했을 때 해시 하나에 걸린 평균 시간(초)"""
+    futures = [executor.submit(_hash_once, memory_cost_kb, time_cost, parallelism) for _ in range(concurrency)]
+    return sum(future.result() for future in futures) / concurrency
+
+def calibrate(target_seconds: float, concurrency: int, memory_budget_mb: int, parallelism: int, min_memory_cost_kb: int = 19456, max_time_cost: int = 10):
+    """
+    Pick Argon2 memory / time costs for this host.
+
+    concurrency개의 해시가 메모리 예산 안에 동시에 들어가도록 memory_cost를 정한 뒤,
+    동시에 실행했을 때 해시 하나가 target_seconds를 넘지 않는 가장 큰 time_cost를 고릅니다.
+    time_cost=1로도 목표를 넘으면 memory_cost를 절반씩 줄입니다. (min_memory_cost_kb까지)
+
+    :return: (memory_cost_kb, time_cost, 측정된 초)
+    """
+    memory_cost_kb = max(min_memory_cost_kb, memory_budget_mb * 1024 // concurrency)
+
+    with ProcessPoolExecutor(max_workers=concurrency) as executor:
+        executor.submit(_hash_once, min_memory_cost_kb, 1, parallelism).result() # 워커 준비
+
+        while True:
+            seconds = measure_hash_seconds(memory_cost_kb, 1, parallelism, concurrency, executor)
+            if seconds <= target_seconds or memory_cost_kb <= min_memory_cost_kb:
+                break
+            memory_cost_kb = max(min_memory_cost_kb, memory_cost_kb // 2)
+
+        # 반복 횟수에 거의 비례하므로 예측값으로 고른 뒤 측정으로 확인
+        time_cost = max(1, min(max_time_cost, int(target_seconds / seconds)))
+        while True:
+            measured = measure_hash_seconds(memory_cost_kb, time_cost, parallelism, concurrency, executor)
+            if measured <= target_seconds or time_cost == 1:
+                return memory_cost_kb, time_cost, measured
+            time_cost -= 1
+
+def get_metrics():
+    return hash_pool.metrics.snapshot()
@@ -2,88 +2,235 @@ from jose import jwt, JWTError
 from datetime import datetime, timedelta, timezone
 from core.config import get_settings
 from fastapi import HTTPException, Depends
-from typing import List
-from sqlalchemy.orm import Session
+from fastapi.security import OAuth2PasswordBearer
+from typing import List, Optional
+from collections import OrderedDict
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.session import get_db
+from db.session import get_async_db
 from db.crud.user import user_read
 
-from enum import Enum
+from db.schemas.user_schema import Permission
 
-class Permission(Enum):
-    ADMIN = "*"
-    MODERATOR = "mod"
-    USER = "-"
+import hashlib
+import heapq
+import time
 
-async def create_token(subject: str , user_id: int, expires_delta: timedelta = None):
+# OAuth2 Password Bearer
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login", auto_error=False)
+
+ACCESS_TOKEN_EXPIRES = timedelta(hours=4)
+REFRESH_TOKEN_EXPIRES = timedelta(days=7)
+
+async def create_token(subject: str , user_id: int, expires_delta: timedelta = None, permissions: List[Permission] = None):
     current_utc_time = datetime.now(timezone.utc)
     expire = current_utc_time + expires_delta if expires_delta else current_utc_time + timedelta(minutes=1)
-    payload = { "sub": subject, "uid": user_id, "perm": ['-'], "iat": current_utc_time, "exp": expire }
+    perm = [permission.value for permission in permissions] if permissions else [Permission.USER.value]
+    payload = { "sub": subject, "uid": user_id, "perm": perm, "iat": current_utc_time, "exp": expire }
 
     settings = get_settings()
     encoded_jwt = jwt.encode(payload, settings.access_secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
-async def create_access_token(subject: str, user_id: int):
-    encoded_jwt = await create_token(subject, user_id, timedelta(hours=4))
+async def create_access_token(subject: str, user_id: int, permissions: List[Permission] = None):
+    encoded_jwt = await create_token(subject, user_id, ACCESS_TOKEN_EXPIRES, permissions)
     return encoded_jwt
 
-async def create_refresh_token(subject: str, user_id: int):
-    encoded_jwt = await create_token(subject, user_id, timedelta(days=7))
+async def create_refresh_token(subject: str, user_id: int, permissions: List[Permission] = None):
+    encoded_jwt = await create_token(subject, user_id, REFRESH_TOKEN_EXPIRES, permissions)
     return encoded_jwt
 
-async def is_token_vaildate(token: str):
+class VerifiedTokenCache():
+    """
+        서명 검증이 끝난 토큰의 claims를 토큰 다이제스트(SHA-256) 기준으로 보관합니다.
+
+        같은 토큰은 프로세스당 한 번만 jwt.decode 하며, 항목은 토큰의 exp 시각이 지나면 제거됩니다.
+        max_entries를 넘으면 가장 오래 쓰이지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # digest -> (claims, exp)
+        self._expiry = []             # (exp, digest) 최소 힙
+
+    @staticmethod
+    def digest(token: str):
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str):
+        key = self.digest(token)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        claims, exp = entry
+        if exp <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return claims
+
+    def set(self, token: str, claims: dict):
+        key = self.digest(token)
+        exp = claims["exp"]
+
+        self._purge_expired()
+
+        self._entries[key] = (claims, exp)
+        self._entries.move_to_end(key)
+        heapq.heappush(self._expiry, (exp, key))
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _purge_expired(self):
+        now = time.time()
+        while self._expiry and self._expiry[0][0] <= now:
+            exp, key = heapq.heappop(self._expiry)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == exp:
+                del self._entries[key]
+
+        # LRU로 제거된 항목이 힙에 쌓이지 않도록 정리
+        if len(self._expiry) > 2 * self.max_entries:
+            self._expiry = [(exp, key) for key, (_, exp) in self._entries.items()]
+            heapq.heapify(self._expiry)
+
+    def clear(self):
+        self._entries.clear()
+        self._expiry = []
+
+
+token_cache = VerifiedTokenCache(max_entries=get_settings().token_cache_max_entries)
+
+
+def decode_token(token: str):
+    """
+        토큰을 검증하고 claims를 반환합니다. 검증 결과는 토큰이 만료될 때까지 캐시됩니다.
+        유효하지 않거나 만료된 토큰이면 401 예외를 발생시킵니다.
+    """
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+
     settings = get_settings()
-    
+
     try:
         payload = jwt.decode(
             token,
             settings.access_secret_key,
             algorithms=[settings.algorithm]
         )
-        exp = payload.get('exp')
-
-        if exp is None or datetime.fromtimestamp(exp, timezone.utc) < datetime.now(timezone.utc):
-            raise HTTPException(status_code=401, detail="Token has expired")
-        return payload
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    exp = payload.get('exp')
+
+    if exp is None or datetime.fromtimestamp(exp, timezone.utc) < datetime.now(timezone.utc):
+        raise HTTPException(status_code=401, detail="Token has expired")
+
+    token_cache.set(token, payload)
+    return payload
+
+
+async def is_token_vaildate(token: str):
+    return decode_token(token)
+
 
 async def get_token_body(token: str):
-    if await is_token_vaildate(token):
-        settings = get_settings()
-        try:
-            payload = jwt.decode(
-                token,
-                settings.access_secret_key,
-                algorithms=[settings.algorithm]
-            )
-            
-            return payload
-        except JWTError:
-            raise HTTPException(status_code=401, detail="Invalid token")
+    return decode_token(token)
 
 
 async def get_user_id_from_token(token: str):
-    if await is_token_vaildate(token):
-        settings = get_settings()
-        try:
-            payload = jwt.decode(
-                token,
-                settings.access_secret_key,
-                algorithms=[settings.algorithm]
-            )
-            
-            return int(payload.get('uid'))
-        except JWTError:
-            raise HTTPException(status_code=401, detail="Invalid token")
-
-
-async def token_has_permission(db: Session, token: str, perm: List[Permission] = []):
+    return int(decode_token(token).get('uid'))
+
+
+async def get_token_claims(access_token: str = Depends(oauth2_scheme)):
+    """
+        현재 요청의 토큰 claims를 반환하는 FastAPI 의존성입니다.
+        FastAPI가 요청 단위로 의존성 결과를 재사용하므로, 한 요청에서 토큰은 한 번만 해석됩니다.
     """
-        토큰의 sub에서 사용자 ID를 추출 후 DB에서 가져와 권한을 확인합니다.
-        :param token: 검사 할 
+    return decode_token(access_token)
+
+
+async def get_optional_token_claims(access_token: Optional[str] = Depends(optional_oauth2_scheme)):
+    """토큰이 없으면 None을 반환하는 get_token_claims 입니다. (비로그인 허용 엔드포인트용)"""
+    if not access_token:
+        return None
+    return decode_token(access_token)
+
+
+class PermissionCache():
+    """
+        사용자 ID별 권한 목록을 TTL 동안 보관합니다.
+
+        권한 검사마다 users 테이블을 조회하지 않도록 하며, 역할이 바뀌면 invalidate()로 즉시 제거합니다.
+        다른 프로세스(워커, 관리 명령어)에서 바뀐 역할은 최대 ttl 초 뒤에 반영됩니다.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # user_id -> (permissions, expires_at)
+
+    def get(self, user_id: int):
+        entry = self._entries.get(user_id)
+
+        if entry is None:
+            return None
+
+        permissions, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+
+        self._entries.move_to_end(user_id)
+        return permissions
+
+    def set(self, user_id: int, permissions: List[Permission]):
+        self._entries[user_id] = (permissions, time.monotonic() + self.ttl)
+        self._entries.move_to_end(user_id)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+permission_cache = PermissionCache(ttl=get_settings().permission_cache_ttl)
+
+
+async def get_user_permissions(db: AsyncSession, claims: dict):
+    """
+        claims의 사용자 권한 목록을 반환합니다.
+
+        TrustTokenPermissions가 켜져 있으면 서명된 perm claim을 그대로 사용하고,
+        아니면 PermissionCache를 거쳐 DB의 역할을 조회합니다.
+    """
+    if get_settings().trust_token_permissions and "perm" in claims:
+        return [Permission(perm) for perm in claims["perm"]]
+
+    user_id = int(claims.get('uid'))
+
+    permission = permission_cache.get(user_id)
+    if permission is None:
+        permission = await user_read.get_user_permission(db=db, user_id=user_id) or []
+        permission_cache.set(user_id, permission)
+
+    return permission
+
+
+async def token_has_permission(db: AsyncSession, claims: dict, perm: List[Permission] = []):
+    """
+        토큰 claims의 사용자 권한을 확인합니다. (get_user_permissions 참고)
+        :param claims: get_token_claims로 얻은 검사 할 토큰의 claims
         :param perm: 체크할 권한의 배열입니다.
 
         기본적으로 Administrator (*)와 Moderator (mod)는 권한 검사에서 통과됩니다. 
@@ -91,16 +238,14 @@ async def token_has_permission(db: Session, token: str, perm: List[Permission] =
         :return: **boolean 값**
         ###
     """
-    user_id = await get_user_id_from_token(token=token)
-
-    permission = await user_read.get_user_permission(db=db, user_id=user_id)
+    permission = await get_user_permissions(db=db, claims=claims)
 
     if Permission.ADMIN in permission or Permission.MODERATOR in permission:
         return True
 
     else:
         # 권한 체크
-        for required_perm in permi:
+        for required_perm in perm:
             if required_perm in permission:
                 return True # 권한이 포함되어 있으면 그대로 리턴
         # 여기까지 왔다면 권한이 없음
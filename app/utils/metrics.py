@@ -0,0 +1,205 @@
+from bisect import bisect_left
+from contextvars import ContextVar
+from time import perf_counter
+from sqlalchemy import event
+
+
+# 요청 지연시간 히스토그램 버킷 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class QueryStats():
+    """요청 하나에서 실행된 SQL 문장 수와 DB 시간입니다."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+class RouteStats():
+    __slots__ = ("buckets", "count", "seconds_sum", "db_queries", "db_seconds")
+
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * (bucket_count + 1) # 마지막 칸은 +Inf
+        self.count = 0
+        self.seconds_sum = 0.0
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+# 현재 요청의 QueryStats (요청 밖에서 실행된 쿼리는 None)
+current_query_stats: ContextVar = ContextVar("current_query_stats", default=None)
+
+
+def _escape(value: str):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class RequestMetrics():
+    """
+        라우트별 요청 수 / 상태 코드 / 지연시간 히스토그램과 SQL 쿼리 수 / DB 시간을 모아
+        Prometheus 텍스트 형식으로 내보냅니다.
+
+        라벨은 실제 경로가 아닌 라우트 템플릿(/psychs/psych/{id})을 사용하므로 시계열 수가 늘어나지 않습니다.
+        기록은 딕셔너리 조회와 정수 덧셈뿐이며, 문자열 조립은 /metrics 요청 시에만 합니다.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+
+        self._routes = {}       # (method, route) -> RouteStats
+        self._statuses = {}     # (method, route, status) -> count
+        self._collectors = []   # (prefix, fn) - fn()은 {이름: 숫자} 를 반환
+
+        self.db_queries = 0     # 요청 밖(백그라운드 작업)을 포함한 전체
+        self.db_seconds = 0.0
+
+    def observe(self, method: str, route: str, status: int, seconds: float, queries: QueryStats = None):
+        key = (method, route)
+        stats = self._routes.get(key)
+        if stats is None:
+            stats = self._routes[key] = RouteStats(len(self.buckets))
+
+        stats.buckets[bisect_left(self.buckets, seconds)] += 1
+        stats.count += 1
+        stats.seconds_sum += seconds
+        if queries is not None:
+            stats.db_queries += queries.count
+            stats.db_seconds += queries.seconds
+
+        status_key = (method, route, status)
+        self._statuses[status_key] = self._statuses.get(status_key, 0) + 1
+
+    def observe_query(self, seconds: float):
+        self.db_queries += 1
+        self.db_seconds += seconds
+
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+
+    def register_collector(self, prefix: str, fn):
+        """/metrics 요청 시 fn()이 반환한 값들을 `{prefix}_{이름}` 게이지로 함께 내보냅니다."""
+        self._collectors.append((prefix, fn))
+
+    def render(self):
+        lines = []
+
+        lines.append("# HELP http_requests_total Total HTTP requests by route and status code.")
+        lines.append("# TYPE http_requests_total counter")
+        for (method, route, status), count in self._statuses.items():
+            lines.append(f'http_requests_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {count}')
+
+        lines.append("# HELP http_request_duration_seconds HTTP request latency by route.")
+        lines.append("# TYPE http_request_duration_seconds histogram")
+        for (method, route), stats in self._routes.items():
+            labels = f'method="{method}",route="{_escape(route)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, stats.buckets):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.seconds_sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+        lines.append("# HELP http_request_db_queries_total SQL statements executed while serving requests, by route.")
+        lines.append("# TYPE http_request_db_queries_total counter")
+        for (method, route), stats in self._routes.items():
+            lines.append(f'http_request_db_queries_total{{method="{method}",route="{_escape(route)}"}} {stats.db_queries}')
+
+        lines.append("# HELP http_request_db_seconds_total Time spent executing SQL while serving requests, by route.")
+        lines.append("# TYPE http_request_db_seconds_total counter")
+        for (method, route), stats in self._routes.items():
+            lines.append(f'http_request_db_seconds_total{{method="{method}",route="{_escape(route)}"}} {stats.db_seconds}')
+
+        lines.append("# HELP db_queries_total SQL statements executed, including background tasks.")
+        lines.append("# TYPE db_queries_total counter")
+        lines.append(f"db_queries_total {self.db_queries}")
+        lines.append("# HELP db_query_seconds_total Time spent executing SQL, including background tasks.")
+        lines.append("# TYPE db_query_seconds_total counter")
+        lines.append(f"db_query_seconds_total {self.db_seconds}")
+
+        for prefix, fn in self._collectors:
+            for name, value in fn().items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                lines.append(f"# TYPE {prefix}_{name} gauge")
+                lines.append(f"{prefix}_{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware():
+    """
+        요청마다 지연시간과 상태 코드를 기록하는 ASGI 미들웨어입니다.
+        BaseHTTPMiddleware를 쓰지 않고 send만 감싸므로 요청당 오버헤드는 몇 마이크로초 수준입니다.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+        self._templates = {}  # id(route) -> 라우터 prefix를 포함한 경로 템플릿
+
+    def _route_template(self, scope):
+        route = scope.get("route")
+        if route is None:
+            return "unmatched"
+
+        template = self._templates.get(id(route))
+        if template is None:
+            # include_router로 포함된 라우트의 path에는 prefix가 빠져 있으므로,
+            # 실제 경로에서 라우트 부분을 잘라 prefix를 구한 뒤 라우트마다 한 번만 계산해 둡니다.
+            path = scope["path"]
+            try:
+                suffix = route.path_format.format(**scope.get("path_params", {}))
+            except (AttributeError, KeyError, IndexError):
+                suffix = None
+            if suffix and path.endswith(suffix):
+                template = path[:len(path) - len(suffix)] + route.path
+            else:
+                template = getattr(route, "path", None) or "unmatched"
+            self._templates[id(route)] = template
+
+        return template
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        queries = QueryStats()
+        token = current_query_stats.set(queries)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = perf_counter() - started
+            current_query_stats.reset(token)
+
+            self.metrics.observe(scope["method"], self._route_template(scope), status_code, elapsed, queries)
+
+
+def instrument_engine(engine, metrics: RequestMetrics):
+    """동기 엔진(비동기 엔진은 .sync_engine)에 쿼리 수 / 시간 측정 이벤트를 등록합니다."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        metrics.observe_query(perf_counter() - context._metrics_started)
+
+
+request_metrics = RequestMetrics()
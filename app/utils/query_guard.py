@@ -0,0 +1,183 @@
+"""
+N+1 쿼리 감지기 (개발 / 테스트용)
+
+요청마다 실행된 SQL 문장을 세고, 파라미터만 다른 같은 문장이 반복되면 N+1 패턴으로 판단합니다.
+QueryGuardMode 환경 변수로 켭니다.
+    off    감지하지 않음 (기본값)
+    log    요청이 끝난 뒤 위반 내용을 출력
+    raise  위반이 발생한 쿼리에서 바로 QueryBudgetExceeded 예외 발생
+
+pytest에서는 query_budget 픽스처로 엔드포인트별 쿼리 예산을 검사할 수 있습니다.
+conftest.py에 `pytest_plugins = ["utils.query_guard"]` 를 추가한 뒤:
+
+    def test_articles_queries(client, query_budget):
+        with query_budget(max_statements=3):
+            client.get("/psychs/articles")
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from core.config import get_settings
+
+import greenlet
+import re
+import sys
+import traceback
+
+# pytest가 이미 로드된 경우(pytest_plugins로 불러온 경우)에만 픽스처를 정의합니다.
+# 앱 시작 시 pytest를 import하면 워커마다 시작 시간이 늘어나므로 직접 import하지 않습니다.
+pytest = sys.modules.get("pytest")
+
+
+# IN 목록처럼 파라미터 개수만 다른 문장을 같은 문장으로 취급
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def normalize_statement(statement: str):
+    return _PARAMETER_LIST.sub("(?)", " ".join(statement.split()))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryLog():
+    """한 요청(또는 한 테스트 블록)에서 실행된 SQL 문장 기록입니다."""
+
+    def __init__(self, repeat_threshold: int = 3, max_statements: int = None, raise_immediately: bool = False):
+        self.repeat_threshold = repeat_threshold
+        self.max_statements = max_statements
+        self.raise_immediately = raise_immediately
+
+        self.statements = 0
+        self.counts = {}        # 정규화된 문장 -> 실행 횟수
+        self.violations = []
+
+    def record(self, statement: str, executemany: bool):
+        self.statements += 1
+
+        if self.max_statements is not None and self.statements == self.max_statements + 1:
+            self._violate(f"more than {self.max_statements} statements")
+
+        # executemany는 한 번의 배치이므로 반복으로 보지 않음
+        if executemany:
+            return
+
+        key = normalize_statement(statement)
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+
+        if count == self.repeat_threshold:
+            self._violate(f"statement repeated {count} times with different parameters: {key}")
+
+    def _violate(self, message: str):
+        # 비동기 세션의 쿼리는 SQLAlchemy가 띄운 greenlet 안에서 실행되므로 호출한 코드는 부모 greenlet 스택에 있음
+        stack = traceback.extract_stack()[:-2]
+        parent = greenlet.getcurrent().parent
+        if parent is not None and parent.gr_frame is not None:
+            stack = traceback.extract_stack(parent.gr_frame) + stack
+
+        # 애플리케이션 코드 중 쿼리를 실행한 가장 안쪽 위치
+        location = next(
+            (f"{frame.filename}:{frame.lineno} in {frame.name}"
+             for frame in reversed(stack)
+             if "site-packages" not in frame.filename and frame.filename != __file__),
+            "unknown"
+        )
+        message = f"{message} (at {location})"
+        self.violations.append(message)
+
+        if self.raise_immediately:
+            raise QueryBudgetExceeded(message)
+
+    def report(self):
+        return f"{self.statements} statements, {len(self.violations)} violations:\n" + "\n".join(f"  - {v}" for v in self.violations)
+
+
+current_query_log: ContextVar = ContextVar("current_query_log", default=None)
+
+
+class QueryGuard():
+    def __init__(self, mode: str = "off", repeat_threshold: int = 3, max_statements: int = None):
+        self.mode = mode
+        self.repeat_threshold = repeat_threshold
+        self.max_statements = max_statements
+
+    @property
+    def enabled(self):
+        return self.mode in ("log", "raise")
+
+    def install(self, engine):
+        """
+            동기 엔진(비동기 엔진은 .sync_engine)에 이벤트를 등록합니다.
+            기록 중인 QueryLog가 없으면 ContextVar 조회 한 번으로 끝납니다.
+        """
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            log = current_query_log.get()
+            if log is not None:
+                log.record(statement, executemany)
+
+    @contextmanager
+    def track(self, repeat_threshold: int = None, max_statements: int = None, raise_immediately: bool = False):
+        """블록 안에서 실행된 SQL을 하나의 QueryLog에 기록합니다."""
+
+        log = QueryLog(
+            repeat_threshold=repeat_threshold or self.repeat_threshold,
+            max_statements=max_statements if max_statements is not None else self.max_statements,
+            raise_immediately=raise_immediately
+        )
+        token = current_query_log.set(log)
+        try:
+            yield log
+        finally:
+            current_query_log.reset(token)
+
+
+class QueryGuardMiddleware():
+    """요청마다 QueryLog를 열고, log 모드에서는 위반이 있으면 요청이 끝난 뒤 출력합니다."""
+
+    def __init__(self, app, guard: QueryGuard):
+        self.app = app
+        self.guard = guard
+
+    async def __call__(self, scope, receive, send):
+        # 테스트의 query_budget 블록 안이라면 그 기록을 그대로 사용
+        if scope["type"] != "http" or current_query_log.get() is not None:
+            await self.app(scope, receive, send)
+            return
+
+        with self.guard.track(raise_immediately=self.guard.mode == "raise") as log:
+            await self.app(scope, receive, send)
+
+        if log.violations:
+            print(f"[query_guard] {scope['method']} {scope['path']}: {log.report()}")
+
+
+settings = get_settings()
+
+query_guard = QueryGuard(
+    mode=settings.query_guard_mode,
+    repeat_threshold=settings.query_guard_repeat_threshold,
+    max_statements=settings.query_guard_max_statements
+)
+
+
+if pytest is not None:
+    @pytest.fixture
+    def query_budget():
+        """
+            with query_budget(max_statements=..., repeat_threshold=...): 블록 안의 쿼리 수를 검사합니다.
+            블록이 끝날 때 위반이 있으면 실패합니다.
+        """
+
+        @contextmanager
+        def budget(max_statements: int = None, repeat_threshold: int = None):
+            with query_guard.track(repeat_threshold=repeat_threshold, max_statements=max_statements) as log:
+                yield log
+
+            if log.violations:
+                raise QueryBudgetExceeded(log.report())
+
+        return budget
@@ -0,0 +1,215 @@
+"""
+토큰 버킷 요청 제한 (로그인 / 회원가입)
+
+키(클라이언트 IP, 계정)마다 capacity개의 토큰을 두고 period 초마다 capacity개의 속도로 다시 채웁니다.
+요청마다 토큰 하나를 쓰며, 토큰이 없으면 다음 토큰이 생길 때까지의 시간을 Retry-After로 알려 429를 반환합니다.
+
+저장소는 RateLimitBackend 환경 변수로 고릅니다.
+    memory  워커 프로세스 메모리 (기본값)
+    sqlite  앱 데이터베이스의 rate_limit_buckets 테이블 (여러 워커가 제한을 공유)
+    off     제한하지 않음
+
+제한 값은 "개수/초" 형식입니다. (예: RateLimitLoginIp=20/60 -> IP당 60초에 20번)
+"""
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy import text
+from collections import OrderedDict
+from core.config import get_settings
+from db.session import AsyncSessionLocal
+from db.models import user_model
+from db.schemas import user_schema
+
+import math
+import time
+
+
+class RateLimit():
+    __slots__ = ("capacity", "rate")
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period # 초당 채워지는 토큰 수
+
+    @classmethod
+    def parse(cls, value: str):
+        """"개수/초" 문자열을 RateLimit으로 바꿉니다. 개수가 0이면 None (제한 없음)"""
+        capacity, period = value.split("/")
+        return cls(int(capacity), float(period)) if int(capacity) > 0 else None
+
+
+class MemoryRateLimitStore():
+    """
+        버킷을 프로세스 메모리에 둡니다. 키마다 [남은 토큰, 갱신 시각, 가득 차는 시각] 하나만 저장합니다.
+
+        마지막으로 쓰인 순서를 유지하므로 앞쪽 버킷부터 보며 이미 가득 찼을 시각이 지난 것(다시 만들어도 같은 상태)을 제거합니다.
+        요청마다 제거는 평균 O(1)이며, 키가 max_keys를 넘으면 가장 오래 쓰이지 않은 것부터 제거합니다.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self.evictions = 0
+
+        self._buckets = OrderedDict() # key -> [tokens, updated_at, full_at]
+
+    async def take(self, key: str, limit: RateLimit, now: float):
+        """토큰 하나를 씁니다. :return: 허용되면 0, 아니면 다음 토큰까지 남은 초"""
+
+        self._evict_idle(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = limit.capacity
+        else:
+            tokens = min(limit.capacity, bucket[0] + (now - bucket[1]) * limit.rate)
+
+        if tokens < 1:
+            if bucket is not None:
+                bucket[0], bucket[1] = tokens, now
+                self._buckets.move_to_end(key)
+            return (1 - tokens) / limit.rate
+
+        tokens -= 1
+        full_at = now + (limit.capacity - tokens) / limit.rate
+
+        if bucket is None:
+            self._buckets[key] = [tokens, now, full_at]
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+        else:
+            bucket[0], bucket[1], bucket[2] = tokens, now, full_at
+            self._buckets.move_to_end(key)
+
+        return 0
+
+    def _evict_idle(self, now: float):
+        # 한 번에 몇 개만 확인해 요청마다 비용을 일정하게 유지
+        for _ in range(4):
+            if not self._buckets:
+                return
+            key, bucket = next(iter(self._buckets.items()))
+            if bucket[2] > now:
+                return
+            del self._buckets[key]
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SqliteRateLimitStore():
+    """
+        버킷을 rate_limit_buckets 테이블에 두어 같은 데이터베이스를 쓰는 모든 워커가 제한을 공유합니다.
+        토큰 계산과 차감을 UPSERT 한 문장으로 하므로 워커 사이에 경합이 없습니다.
+        가득 찬 시각(full_at)이 지난 행은 purge_interval 초마다 삭제합니다.
+    """
+
+    TAKE = text(
+        f"INSERT INTO {user_model.RateLimitBucket.__tablename__} (key, tokens, updated_at, full_at) "
+        "VALUES (:key, :capacity - 1, :now, :now + 1 / :rate) "
+        "ON CONFLICT(key) DO UPDATE SET "
+        "tokens = min(:capacity, tokens + (:now - updated_at) * :rate) - 1, "
+        "updated_at = :now, "
+        "full_at = :now + (:capacity - (min(:capacity, tokens + (:now - updated_at) * :rate) - 1)) / :rate "
+        "WHERE min(:capacity, tokens + (:now - updated_at) * :rate) >= 1 "
+        "RETURNING tokens"
+    )
+    PEEK = text(f"SELECT tokens, updated_at FROM {user_model.RateLimitBucket.__tablename__} WHERE key = :key")
+    PURGE = text(f"DELETE FROM {user_model.RateLimitBucket.__tablename__} WHERE full_at <= :now")
+
+    def __init__(self, purge_interval: float = 60.0):
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+
+    async def take(self, key: str, limit: RateLimit, now: float):
+        params = {"key": key, "capacity": limit.capacity, "rate": limit.rate, "now": now}
+
+        async with AsyncSessionLocal() as db:
+            if now >= self._next_purge:
+                self._next_purge = now + self.purge_interval
+                await db.execute(self.PURGE, {"now": now})
+
+            taken = (await db.execute(self.TAKE, params)).first()
+            await db.commit()
+
+            if taken is not None:
+                return 0
+
+            bucket = (await db.execute(self.PEEK, params)).first()
+
+        tokens = min(limit.capacity, bucket.tokens + (now - bucket.updated_at) * limit.rate)
+        return max((1 - tokens) / limit.rate, 0.001)
+
+    def __len__(self):
+        return 0
+
+
+class RateLimiter():
+    def __init__(self, store, limits: dict):
+        """
+            :param store: take(key, limit, now) 를 제공하는 저장소. None이면 제한하지 않음
+            :param limits: 이름(login_ip 등) -> RateLimit 또는 None
+        """
+        self.store = store
+        self.limits = limits
+        self.rejected = 0
+
+    async def check(self, name: str, key: str):
+        """제한을 넘었으면 Retry-After 헤더와 함께 429 예외를 발생시킵니다."""
+
+        limit = self.limits.get(name)
+        if self.store is None or limit is None or not key:
+            return
+
+        retry_after = await self.store.take(f"{name}:{key}", limit, time.time())
+
+        if retry_after > 0:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+    def get_metrics(self):
+        return {"rejected": self.rejected, "keys": len(self.store) if self.store is not None else 0}
+
+
+def client_ip(request: Request):
+    # serve.py는 WebForwardedAllowIps(기본 127.0.0.1)에 해당하는 프록시의 X-Forwarded-For만 반영합니다.
+    # 다른 주소의 프록시 뒤에서 이 값을 설정하지 않으면 모든 요청이 프록시 주소 하나의 버킷을 함께 씁니다.
+    return request.client.host if request.client else None
+
+
+def create_store(backend: str):
+    if backend == "off":
+        return None
+    if backend == "sqlite":
+        return SqliteRateLimitStore()
+    return MemoryRateLimitStore(max_keys=settings.rate_limit_max_keys)
+
+
+settings = get_settings()
+
+rate_limiter = RateLimiter(
+    store=create_store(settings.rate_limit_backend),
+    limits={
+        "login_ip": RateLimit.parse(settings.rate_limit_login_ip),
+        "login_account": RateLimit.parse(settings.rate_limit_login_account),
+        "register_ip": RateLimit.parse(settings.rate_limit_register_ip),
+        "register_account": RateLimit.parse(settings.rate_limit_register_account),
+    }
+)
+
+
+async def limit_login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
+    """로그인 요청 제한 의존성. 비밀번호 검증(Argon2) 전에 IP, 계정 순으로 확인합니다."""
+    await rate_limiter.check("login_ip", client_ip(request))
+    await rate_limiter.check("login_account", form_data.username.lower())
+
+
+async def limit_register(request: Request, user: user_schema.UserCreate):
+    """회원가입 요청 제한 의존성. 비밀번호 해시(Argon2) 전에 IP, 이메일 순으로 확인합니다."""
+    await rate_limiter.check("register_ip", client_ip(request))
+    await rate_limiter.check("register_account", user.email.lower())
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from core.config import get_settings
+
+
+class ResponseCacheMetrics():
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def snapshot(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+class ResponseCache():
+    """
+        게시 후 거의 바뀌지 않는 게시글 응답(본문, 질문 트리)을 위한 LRU 캐시입니다.
+
+        키는 (namespace, article_id, content_version) 이므로 게시글이 수정되어 버전이 올라가면
+        이전 항목은 자연히 조회되지 않습니다. 같은 프로세스에서 수정한 경우 invalidate()로 즉시 제거합니다.
+        용량은 항목 수가 아닌 바이트로 제한하며, 항목 크기는 응답 JSON 직렬화 길이로 계산합니다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.metrics = ResponseCacheMetrics()
+
+        self._entries = OrderedDict() # key -> (value, size)
+
+    def get(self, namespace: str, article_id: int, version: int):
+        key = (namespace, article_id, version)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.metrics.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.metrics.hits += 1
+        return entry[0]
+
+    def set(self, namespace: str, article_id: int, version: int, value):
+        """
+            pydantic 모델 또는 직렬화된 JSON(bytes)을 캐시에 저장합니다.
+            한도를 넘으면 가장 오래 쓰이지 않은 항목부터 제거합니다.
+        """
+        key = (namespace, article_id, version)
+        size = len(value) if isinstance(value, bytes) else len(value.model_dump_json())
+
+        if size > self.max_bytes:
+            return
+
+        self._remove(key)
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+            self.metrics.evictions += 1
+
+    def invalidate(self, article_id: int):
+        """게시글의 모든 버전, 모든 namespace의 항목을 제거합니다."""
+        keys = [key for key in self._entries if key[1] == article_id]
+        for key in keys:
+            self._remove(key)
+        self.metrics.invalidations += len(keys)
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+
+    def get_metrics(self):
+        return {
+            **self.metrics.snapshot(),
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+settings = get_settings()
+
+response_cache = ResponseCache(max_bytes=settings.response_cache_max_bytes)
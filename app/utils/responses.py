@@ -0,0 +1,21 @@
+from fastapi.responses import Response
+
+import orjson
+
+
+class ORJSONResponse(Response):
+    """
+        orjson으로 직렬화하는 JSON 응답입니다.
+
+        핸들러가 Response를 직접 반환하면 FastAPI는 response_model 검증과 직렬화를 건너뛰므로,
+        행을 바로 dict로 옮긴 목록 응답을 한 번만 변환합니다. (response_model은 문서화용으로 유지)
+        이미 직렬화된 bytes(캐시된 응답)는 그대로 보냅니다.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        # OPT_UTC_Z: UTC 시각을 pydantic과 같은 "Z" 형식으로 출력
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
@@ -0,0 +1,153 @@
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate, chain
+from core.config import get_settings
+
+
+class InvalidSubmission(ValueError):
+    pass
+
+
+class ScoreTable():
+    """
+        게시글 하나의 채점표입니다. 답변별 점수와 결과 구간을 메모리에 들고 있어 채점에 DB 조회가 필요 없습니다.
+
+        결과 구간은 min_score 오름차순으로 정렬해 두고, 총점이 속한 구간을 이진 탐색으로 찾습니다.
+        총점이 가장 낮은 min_score보다 작으면 첫 번째 결과로 처리합니다.
+    """
+
+    __slots__ = ("version", "question_by_answer", "score_by_answer", "question_count", "thresholds", "results")
+
+    def __init__(self, version: int, answer_rows, result_rows):
+        """
+            :param answer_rows: (id, question_id, score) 행
+            :param result_rows: (id, title, description, min_score) 행. min_score 오름차순이어야 합니다.
+        """
+
+        self.version = version
+        self.question_by_answer = {row.id: row.question_id for row in answer_rows}
+        self.score_by_answer = {row.id: row.score for row in answer_rows}
+        self.question_count = len(set(self.question_by_answer.values())) # 답변이 있는 질문 수
+
+        # 구간이 지정되지 않은 결과는 채점에 사용하지 않음
+        result_rows = [row for row in result_rows if row.min_score is not None]
+        self.thresholds = [row.min_score for row in result_rows]
+        self.results = [
+            {"id": row.id, "title": row.title, "description": row.description}
+            for row in result_rows
+        ]
+
+    def score(self, answer_ids):
+        """
+            제출된 답변들의 총점을 계산합니다.
+            create_submission과 같은 규칙(중복 제거, 게시글의 답변인지, 질문당 하나)에 더해 score_many처럼 모든 질문에 답했는지 검증하며,
+            위반 시 InvalidSubmission을 발생시킵니다.
+        """
+
+        answer_ids = list(dict.fromkeys(answer_ids))
+
+        if not answer_ids:
+            raise InvalidSubmission("No answers submitted")
+
+        try:
+            question_ids = {self.question_by_answer[answer_id] for answer_id in answer_ids}
+        except KeyError:
+            raise InvalidSubmission("Invalid answer")
+
+        if len(question_ids) != len(answer_ids):
+            raise InvalidSubmission("Only one answer per question")
+
+        if len(question_ids) != self.question_count:
+            raise InvalidSubmission("Every question must be answered once")
+
+        return sum(map(self.score_by_answer.__getitem__, answer_ids))
+
+    def result_for(self, total: int):
+        """총점이 속한 결과를 반환합니다. 결과가 없으면 None"""
+
+        if not self.results:
+            return None
+
+        return self.results[max(bisect_right(self.thresholds, total) - 1, 0)]
+
+    def score_many(self, submissions):
+        """
+            여러 제출을 한 번에 채점합니다. 제출마다 모든 질문에 답변이 하나씩 있어야 하며, 아니면 InvalidSubmission을 발생시킵니다.
+
+            모든 제출의 길이가 질문 수(n)로 같으므로 답변 ID를 한 줄로 펼쳐 점수 누적합을 한 번 구하고,
+            i번째 제출의 총점은 누적합[(i + 1) * n] - 누적합[i * n] 으로 구합니다.
+            :return: 제출 순서대로 (총점, 결과) 리스트
+        """
+
+        count = self.question_count
+        if not count:
+            raise InvalidSubmission("No questions to answer")
+
+        for index, answer_ids in enumerate(submissions):
+            if len(answer_ids) != count:
+                raise InvalidSubmission(f"Submission {index}: every question must be answered once")
+
+        answer_ids = list(chain.from_iterable(submissions))
+        offsets = range(0, len(answer_ids) + 1, count)
+
+        try:
+            questions = list(map(self.question_by_answer.__getitem__, answer_ids))
+        except KeyError:
+            raise InvalidSubmission("Invalid answer")
+
+        for index, (start, end) in enumerate(zip(offsets, offsets[1:])):
+            if len(set(questions[start:end])) != count:
+                raise InvalidSubmission(f"Submission {index}: every question must be answered once")
+
+        prefix = list(accumulate(map(self.score_by_answer.__getitem__, answer_ids), initial=0))
+        totals = [prefix[end] - prefix[start] for start, end in zip(offsets, offsets[1:])]
+
+        return [(total, self.result_for(total)) for total in totals]
+
+
+class ScoreTableCache():
+    """
+        게시글별 ScoreTable LRU 캐시입니다.
+        항목마다 만들 때의 content_version을 기억하므로, 질문이나 결과가 바뀌어 버전이 올라가면 다음 조회 때 새로 만들어집니다.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._tables = OrderedDict() # article_id -> ScoreTable
+
+    def get(self, article_id: int, version: int):
+        table = self._tables.get(article_id)
+
+        if table is None or table.version != version:
+            self.misses += 1
+            return None
+
+        self._tables.move_to_end(article_id)
+        self.hits += 1
+        return table
+
+    def set(self, article_id: int, table: ScoreTable):
+        self._tables[article_id] = table
+        self._tables.move_to_end(article_id)
+
+        while len(self._tables) > self.max_entries:
+            self._tables.popitem(last=False)
+
+    def clear(self):
+        self._tables.clear()
+
+    def get_metrics(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._tables),
+            "max_entries": self.max_entries,
+        }
+
+
+settings = get_settings()
+
+score_tables = ScoreTableCache(max_entries=settings.score_table_cache_size)
@@ -0,0 +1,72 @@
+from core.config import get_settings
+from db.session import AsyncSessionLocal
+from db.crud.user import user_delete
+
+import asyncio
+import traceback
+
+
+class TokenSweeper():
+    """
+        만료된 jwt_tokens 행을 주기적으로 정리하는 백그라운드 작업입니다.
+
+        batch_size개씩 삭제하고 매번 커밋한 뒤 이벤트 루프에 양보하므로,
+        SQLite 쓰기 잠금을 오래 잡지 않습니다.
+    """
+
+    def __init__(self, interval: float = 600.0, batch_size: int = 500):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.total_deleted = 0
+
+        self._task = None
+
+    async def sweep(self, include_legacy: bool = False):
+        """만료된 행이 남지 않을 때까지 배치 단위로 삭제합니다. :return: 삭제된 행 수"""
+        deleted = 0
+
+        while True:
+            async with AsyncSessionLocal() as db:
+                rows = await user_delete.delete_expired_jwt(db=db, batch_size=self.batch_size, include_legacy=include_legacy)
+
+            deleted += rows
+            if rows < self.batch_size:
+                break
+
+            # 다른 요청이 쓰기 잠금을 얻을 수 있도록 양보
+            await asyncio.sleep(0)
+
+        self.total_deleted += deleted
+        return deleted
+
+    def get_metrics(self):
+        return {"deleted_total": self.total_deleted}
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                print(traceback.format_exc())
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+settings = get_settings()
+
+token_sweeper = TokenSweeper(
+    interval=settings.token_sweep_interval,
+    batch_size=settings.token_sweep_batch_size,
+)
@@ -0,0 +1,155 @@
+"""
+토너먼트(이상형 월드컵) 대진표와 Elo 레이팅 계산
+
+대진표는 서버에 저장하지 않고 서명된 토큰으로 주고받습니다.
+라운드마다 클라이언트가 토큰과 승자 목록을 보내면 검증 후 다음 라운드의 토큰을 발급하므로
+어느 워커가 요청을 받아도 같은 대진을 이어갈 수 있습니다.
+"""
+from core.config import get_settings
+
+import base64
+import hashlib
+import hmac
+import json
+import random
+import secrets
+import time
+
+
+class InvalidBracket(ValueError):
+    pass
+
+
+def _signing_key():
+    # 액세스 토큰과 섞이지 않도록 같은 비밀 키에서 대진표 전용 키를 파생
+    return hmac.new(get_settings().access_secret_key.encode(), b"tournament-bracket", hashlib.sha256).digest()
+
+
+def _b64encode(data: bytes):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str):
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+class Bracket():
+    """
+        진행 중인 대진표 하나입니다.
+
+        remaining: 현재 라운드에 남은 후보 ID (앞에서부터 두 개씩 한 경기)
+        matches:   지금까지 끝난 경기의 (승자, 패자) 목록
+    """
+
+    __slots__ = ("article_id", "version", "bracket_id", "remaining", "matches", "expires_at")
+
+    def __init__(self, article_id: int, version: int, bracket_id: str, remaining: list, matches: list, expires_at: int):
+        self.article_id = article_id
+        self.version = version
+        self.bracket_id = bracket_id
+        self.remaining = remaining
+        self.matches = matches
+        self.expires_at = expires_at
+
+    @classmethod
+    def start(cls, article_id: int, version: int, candidate_ids: list, size: int):
+        """
+            후보 중 size개(2의 거듭제곱으로 내림, 후보 수 이하)를 무작위로 뽑아 대진표를 만듭니다.
+            후보가 2개 미만이면 InvalidBracket을 발생시킵니다.
+        """
+
+        size = min(size, len(candidate_ids))
+        if size < 2:
+            raise InvalidBracket("Not enough candidates")
+
+        size = 1 << (size.bit_length() - 1)
+        seeded = random.sample(candidate_ids, size)
+
+        return cls(article_id, version, secrets.token_hex(16), seeded, [], int(time.time()) + get_settings().tournament_bracket_ttl)
+
+    @property
+    def finished(self):
+        return len(self.remaining) == 1
+
+    @property
+    def champion(self):
+        return self.remaining[0] if self.finished else None
+
+    def pairs(self):
+        return [self.remaining[i:i + 2] for i in range(0, len(self.remaining), 2)]
+
+    def advance(self, winners: list):
+        """현재 라운드의 경기마다 승자를 하나씩, 경기 순서대로 받아 다음 라운드로 진행합니다."""
+
+        if self.finished:
+            raise InvalidBracket("Bracket already finished")
+
+        pairs = self.pairs()
+        if len(winners) != len(pairs):
+            raise InvalidBracket("One winner per match")
+
+        for (first, second), winner in zip(pairs, winners):
+            if winner == first:
+                self.matches.append((first, second))
+            elif winner == second:
+                self.matches.append((second, first))
+            else:
+                raise InvalidBracket("Winner is not in the match")
+
+        self.remaining = list(winners)
+
+    def encode(self):
+        payload = json.dumps({
+            "a": self.article_id,
+            "v": self.version,
+            "b": self.bracket_id,
+            "r": self.remaining,
+            "m": self.matches,
+            "e": self.expires_at,
+        }, separators=(",", ":")).encode()
+
+        signature = hmac.new(_signing_key(), payload, hashlib.sha256).digest()
+        return f"{_b64encode(payload)}.{_b64encode(signature)}"
+
+    @classmethod
+    def decode(cls, token: str):
+        """서명과 만료 시각을 확인합니다. 유효하지 않으면 InvalidBracket을 발생시킵니다."""
+
+        try:
+            encoded_payload, encoded_signature = token.split(".")
+            payload = _b64decode(encoded_payload)
+            signature = _b64decode(encoded_signature)
+        except ValueError:
+            raise InvalidBracket("Invalid bracket")
+
+        if not hmac.compare_digest(signature, hmac.new(_signing_key(), payload, hashlib.sha256).digest()):
+            raise InvalidBracket("Invalid bracket")
+
+        data = json.loads(payload)
+        if data["e"] < time.time():
+            raise InvalidBracket("Bracket has expired")
+
+        return cls(data["a"], data["v"], data["b"], data["r"], [tuple(match) for match in data["m"]], data["e"])
+
+
+def elo_deltas(matches: list, ratings: dict, k: float):
+    """
+        대진표 하나의 경기 결과를 순서대로 적용했을 때 후보별 레이팅 변화량을 계산합니다.
+
+        저장된 값을 덮어쓰지 않고 변화량만 더하므로(rating = rating + delta)
+        동시에 끝난 다른 대진표의 갱신을 잃어버리지 않습니다.
+
+        :param matches: (승자, 패자) 목록
+        :param ratings: 후보 ID -> 현재 레이팅 (경기에 나온 모든 후보)
+        :return: 후보 ID -> 레이팅 변화량
+    """
+
+    current = dict(ratings)
+
+    for winner, loser in matches:
+        expected = 1 / (1 + 10 ** ((current[loser] - current[winner]) / 400))
+        change = k * (1 - expected)
+        current[winner] += change
+        current[loser] -= change
+
+    return {candidate_id: current[candidate_id] - rating for candidate_id, rating in ratings.items()}
@@ -0,0 +1,253 @@
+from sqlalchemy import select
+from core.config import get_settings
+from db.session import AsyncSessionLocal
+from db.models import psych_model
+from db.schemas import psychs_schma
+from db.crud.psychs import psychs_read
+from db.crud.user.user_loader import UserSummaryLoader
+from datetime import timezone
+
+import asyncio
+import heapq
+import orjson
+import time
+import traceback
+
+
+class TrendingTracker():
+    """
+        조회 / 완료 이벤트로 게시글별 시간 감쇠 점수를 누적하고, 점수 상위 K개를 유지합니다.
+
+        점수는 forward decay로 계산합니다. 시각 t의 이벤트는 weight * 2^((t - epoch) / half_life) 를 더하므로
+        모든 점수가 같은 비율로 감쇠한다고 보면 순서가 같아, 저장된 점수를 주기적으로 줄일 필요가 없습니다.
+        (값이 너무 커지면 rebase()가 전체를 한 번 축소합니다.)
+
+        점수는 증가만 하므로 상위 K개 밖으로 밀려난 게시글은 자신의 이벤트로만 다시 들어올 수 있습니다.
+        따라서 이벤트마다 K개의 최소 힙과 비교만 하면 되고 (O(log K)), 전체를 다시 정렬하지 않습니다.
+    """
+
+    REBASE_EXPONENT = 64 # 2^64배를 넘으면 축소
+
+    def __init__(self, size: int = 100, half_life: float = 6 * 3600, max_tracked: int = 100000):
+        self.size = size
+        self.half_life = half_life
+        self.max_tracked = max_tracked
+
+        self.epoch = time.time()
+        self.version = 0        # 상위 K개가 바뀔 때마다 증가
+
+        self._scores = {}       # article_id -> 누적 점수
+        self._top = {}          # article_id -> 상위 K개 안에서의 점수
+        self._heap = []         # (점수, article_id) 최소 힙. 갱신된 항목의 이전 값이 남아 있을 수 있음
+
+    def record(self, article_id: int, weight: float, at: float = None):
+        exponent = ((at if at is not None else time.time()) - self.epoch) / self.half_life
+        if exponent > self.REBASE_EXPONENT:
+            self.rebase(at)
+            exponent = ((at if at is not None else time.time()) - self.epoch) / self.half_life
+
+        score = self._scores.get(article_id, 0.0) + weight * 2.0 ** exponent
+        self._scores[article_id] = score
+
+        if article_id in self._top:
+            self._top[article_id] = score
+            heapq.heappush(self._heap, (score, article_id))
+        elif len(self._top) < self.size:
+            self._top[article_id] = score
+            heapq.heappush(self._heap, (score, article_id))
+        else:
+            minimum, minimum_id = self._peek_min()
+            if score <= minimum:
+                return
+            heapq.heappop(self._heap)
+            del self._top[minimum_id]
+            self._top[article_id] = score
+            heapq.heappush(self._heap, (score, article_id))
+
+        self.version += 1
+
+        # 갱신으로 남은 이전 값이 쌓이면 힙을 다시 만듦
+        if len(self._heap) > 4 * self.size:
+            self._heap = [(score, article_id) for article_id, score in self._top.items()]
+            heapq.heapify(self._heap)
+
+    def _peek_min(self):
+        while True:
+            score, article_id = self._heap[0]
+            if self._top.get(article_id) == score:
+                return score, article_id
+            heapq.heappop(self._heap)
+
+    def rebase(self, now: float = None):
+        """epoch를 현재로 옮기고 모든 점수를 같은 비율로 줄입니다. 순위는 바뀌지 않습니다."""
+
+        now = now if now is not None else time.time()
+        factor = 2.0 ** (-(now - self.epoch) / self.half_life)
+        self.epoch = now
+
+        self._scores = {article_id: score * factor for article_id, score in self._scores.items()}
+        self._top = {article_id: score * factor for article_id, score in self._top.items()}
+        self._heap = [(score, article_id) for article_id, score in self._top.items()]
+        heapq.heapify(self._heap)
+
+    def prune(self):
+        """추적 중인 게시글이 max_tracked를 넘으면 점수가 낮은 것부터 잊습니다. (상위 K개는 유지)"""
+
+        if len(self._scores) <= self.max_tracked:
+            return 0
+
+        keep = heapq.nlargest(self.max_tracked, self._scores.items(), key=lambda item: item[1])
+        removed = len(self._scores) - len(keep)
+        self._scores = dict(keep)
+        self._scores.update(self._top)
+        return removed
+
+    def top(self):
+        """상위 K개의 게시글 ID를 점수 내림차순으로 반환합니다."""
+        return [article_id for article_id, _ in sorted(self._top.items(), key=lambda item: item[1], reverse=True)]
+
+    def __len__(self):
+        return len(self._scores)
+
+
+class TrendingFeed():
+    """
+        /psychs/trending 응답을 메모리에 미리 만들어 둡니다.
+
+        요청 경로는 이벤트 기록(딕셔너리 / 힙 연산)과 직렬화된 응답 반환뿐이며 DB를 조회하지 않습니다.
+        refresh_interval 초마다 상위 K개가 바뀌었으면 게시글 / 작성자를 한 번에 조회해 응답을 다시 만듭니다.
+
+        워커마다 자신이 처리한 요청의 이벤트만 보므로, 여러 워커에서는 각 워커의 표본으로 계산한 순위입니다.
+    """
+
+    def __init__(self, tracker: TrendingTracker, refresh_interval: float = 10.0, view_weight: float = 1.0,
+                 completion_weight: float = 5.0, seed_limit: int = 10000):
+        self.tracker = tracker
+        self.refresh_interval = refresh_interval
+        self.view_weight = view_weight
+        self.completion_weight = completion_weight
+        self.seed_limit = seed_limit
+
+        self.refreshes = 0
+
+        self._posts = []                # 공개 게시글 응답 dict (순위순)
+        self._responses = {}            # limit -> 직렬화된 응답
+        self._built_version = None
+        self._task = None
+
+    def record_view(self, article_id: int):
+        self.tracker.record(article_id, self.view_weight)
+
+    def record_completion(self, article_id: int, at: float = None):
+        self.tracker.record(article_id, self.completion_weight, at)
+
+    def response(self, limit: int):
+        """직렬화된 응답(bytes)을 반환합니다. limit은 1..K 로 제한됩니다."""
+
+        limit = min(max(limit, 1), self.tracker.size)
+        response = self._responses.get(limit)
+
+        if response is None:
+            response = self._responses[limit] = orjson.dumps(
+                {"posts": self._posts[:limit], "next_cursor": None},
+                option=orjson.OPT_UTC_Z
+            )
+
+        return response
+
+    async def seed(self):
+        """
+            최근 제출 기록으로 점수를 채웁니다. 재시작 직후에도 목록이 비어 있지 않도록 앱 시작 시 한 번 호출합니다.
+            제출 ID 역순으로 seed_limit개만 읽습니다.
+        """
+
+        submissions = psych_model.PsychArticleSubmission.__table__
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(submissions.c.article_id, submissions.c.created_at)
+                .order_by(submissions.c.id.desc())
+                .limit(self.seed_limit)
+            )
+            rows = result.all()
+
+        for row in rows:
+            self.record_completion(row.article_id, at=row.created_at.replace(tzinfo=timezone.utc).timestamp())
+
+        await self.refresh()
+
+        return len(rows)
+
+    async def refresh(self):
+        """상위 K개가 바뀌었으면 응답을 다시 만듭니다. (쿼리 2개)"""
+
+        version = self.tracker.version
+        if version == self._built_version:
+            return False
+
+        self.tracker.prune()
+        article_ids = self.tracker.top()
+
+        articles = psych_model.PsychArticle.__table__
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(articles)
+                .where(articles.c.id.in_(article_ids), articles.c.visibility == psychs_schma.PsychVisibility.PUBLIC)
+            )
+            rank = {article_id: index for index, article_id in enumerate(article_ids)}
+            rows = sorted(result.all(), key=lambda row: rank[row.id])
+            posts = await psychs_read.build_article_responses(rows, UserSummaryLoader(db))
+
+        self._posts = posts
+        self._responses = {}
+        self._built_version = version
+        self.refreshes += 1
+
+        return True
+
+    def get_metrics(self):
+        return {
+            "tracked": len(self.tracker),
+            "posts": len(self._posts),
+            "refreshes": self.refreshes,
+        }
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception:
+                print(traceback.format_exc())
+
+    async def start(self):
+        if self._task is None:
+            try:
+                await self.seed()
+            except Exception:
+                print(traceback.format_exc())
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+settings = get_settings()
+
+trending_feed = TrendingFeed(
+    TrendingTracker(
+        size=settings.trending_size,
+        half_life=settings.trending_half_life,
+        max_tracked=settings.trending_max_tracked,
+    ),
+    refresh_interval=settings.trending_refresh_interval,
+    view_weight=settings.trending_view_weight,
+    completion_weight=settings.trending_completion_weight,
+)
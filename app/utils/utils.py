@@ -1,6 +1,58 @@
 import re
+import base64
+from datetime import datetime
 
 def is_valid_email(email: str):
     email_pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
     return re.match(email_pattern, email) is not None
 
+
+def encode_cursor(created_at: datetime, id: int):
+    """(created_at, id) 쌍을 불투명한 페이지네이션 커서 문자열로 인코딩합니다."""
+    raw = f"{created_at.isoformat()}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """커서 문자열을 (created_at, id) 쌍으로 디코딩합니다. 형식이 잘못되면 ValueError를 발생시킵니다."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_search_cursor(offset: int, id: int):
+    """(순위 offset, 마지막 결과 id) 쌍을 검색 결과 페이지네이션 커서 문자열로 인코딩합니다."""
+    raw = f"{offset}|{id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_search_cursor(cursor: str):
+    """검색 커서 문자열을 (offset, id) 쌍으로 디코딩합니다. 형식이 잘못되면 ValueError를 발생시킵니다."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        offset, id = raw.split("|")
+        offset = int(offset)
+        if offset < 0:
+            raise ValueError("Negative offset")
+        return offset, int(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def iter_lines(stream, max_line_bytes: int = 1024 * 1024):
+    """바이트 청크 스트림을 줄 단위로 나눠 돌려줍니다. 한 줄이 max_line_bytes를 넘으면 ValueError를 발생시킵니다."""
+    buffer = b""
+
+    async for chunk in stream:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            yield line
+
+        if len(buffer) > max_line_bytes:
+            raise ValueError("Line too long")
+
+    if buffer:
+        yield buffer
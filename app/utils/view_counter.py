@@ -0,0 +1,127 @@
+from sqlalchemy import update, bindparam
+from core.config import get_settings
+from db.session import AsyncSessionLocal
+from db.models import psych_model
+
+import asyncio
+import traceback
+
+
+class ViewCountBuffer():
+    """
+        게시글 조회수를 메모리에 모았다가 한 번의 배치 UPDATE로 반영합니다. (write-behind)
+
+        조회 요청마다 쓰기 트랜잭션을 열지 않도록 게시글별 증가분을 합쳐 두고,
+        flush_interval 초마다 또는 대기 중인 증가분이 flush_threshold 에 도달하면 DB에 기록합니다.
+        앱 종료 시 stop()이 남은 증가분을 모두 기록합니다.
+
+        기록 중인 증가분은 커밋될 때까지 _in_flight에 두어 pending()에 계속 포함되며,
+        기록이 실패하거나 취소(CancelledError)되면 _pending으로 되돌립니다.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, flush_threshold: int = 1000):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+
+        self._pending = {}        # article_id -> 아직 기록되지 않은 증가분
+        self._pending_total = 0
+        self._in_flight = {}      # article_id -> 기록 중인 증가분
+        self._lock = None
+        self._task = None
+        self._threshold_flush = None
+
+    def increment(self, article_id: int, delta: int = 1):
+        self._pending[article_id] = self._pending.get(article_id, 0) + delta
+        self._pending_total += delta
+
+        if self._pending_total >= self.flush_threshold and self._threshold_flush is None:
+            self._threshold_flush = asyncio.ensure_future(self._flush_on_threshold())
+
+    def pending(self, article_id: int):
+        """아직 DB에 기록되지 않은 조회수 증가분(기록 중인 것 포함)을 반환합니다."""
+        return self._pending.get(article_id, 0) + self._in_flight.get(article_id, 0)
+
+    def get_metrics(self):
+        return {"pending": self._pending_total, "pending_articles": len(self._pending)}
+
+    async def flush(self):
+        """대기 중인 증가분을 게시글별로 합쳐 한 번의 executemany UPDATE로 기록합니다."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if not self._pending:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            self._pending_total = 0
+            self._in_flight = pending
+            committed = False
+
+            table = psych_model.PsychArticle.__table__
+            statement = (
+                update(table)
+                .where(table.c.id == bindparam("article_id"))
+                .values(view_count=table.c.view_count + bindparam("delta"))
+            )
+
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(statement, [
+                        {"article_id": article_id, "delta": delta}
+                        for article_id, delta in pending.items()
+                    ])
+                    await db.commit()
+                    committed = True
+                    self._in_flight = {}
+            finally:
+                # 기록에 실패하거나 취소되면 증가분을 되돌려 다음 flush 때 다시 시도
+                if not committed:
+                    self._in_flight = {}
+                    for article_id, delta in pending.items():
+                        self._pending[article_id] = self._pending.get(article_id, 0) + delta
+                        self._pending_total += delta
+
+            return len(pending)
+
+    async def _flush_on_threshold(self):
+        try:
+            await self.flush()
+        except Exception:
+            print(traceback.format_exc())
+        finally:
+            self._threshold_flush = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                print(traceback.format_exc())
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._threshold_flush is not None:
+            await self._threshold_flush
+
+        await self.flush()
+
+
+settings = get_settings()
+
+view_counter = ViewCountBuffer(
+    flush_interval=settings.view_count_flush_interval,
+    flush_threshold=settings.view_count_flush_threshold,
+)